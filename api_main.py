@@ -0,0 +1,47 @@
+"""API-only entry point for Apple Store, without NiceGUI.
+
+Serves the same REST API as ``main.py`` and can run as several worker
+processes, so API nodes scale separately from UI nodes:
+
+    gunicorn api_main:app -c gunicorn.conf.py
+    python api_main.py              # uvicorn, WEB_CONCURRENCY workers
+"""
+
+import os
+import sys
+from pathlib import Path
+
+# Add the project root to Python path
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+
+# Report import and startup time per module without starting the server
+if __name__ == "__main__" and "--profile-startup" in sys.argv:
+    from app.core.startup import profile_startup
+    sys.exit(profile_startup("api_main"))
+
+# Load environment variables
+try:
+    from dotenv import load_dotenv
+    load_dotenv()
+except ImportError:
+    print("python-dotenv not installed, skipping .env loading")
+
+from app.core.app_factory import create_api_app
+
+app = create_api_app()
+
+if __name__ == "__main__":
+    import uvicorn
+    from app.core import app_logger, settings
+
+    workers = int(os.getenv("WEB_CONCURRENCY", "1"))
+    app_logger.info(f"Starting Apple Store API at {settings.host}:{settings.port} with {workers} worker(s)")
+    uvicorn.run(
+        "api_main:app" if workers > 1 else app,
+        host=settings.host,
+        port=settings.port,
+        workers=workers,
+        timeout_graceful_shutdown=settings.graceful_timeout,
+        proxy_headers=True,
+    )
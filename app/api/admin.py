@@ -0,0 +1,106 @@
+"""Admin-only diagnostics endpoints.
+
+Every route requires the ``X-Admin-Token`` header to match ``ADMIN_TOKEN``.
+With no admin token configured they all answer 404.
+"""
+
+from typing import Literal, Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, status
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import settings
+from app.core.memory import client_stats, gc_stats, memory_diagnostics, object_counts, session_stats
+from app.core.responses import FastJSONResponse
+from app.core.security import verify_admin_token
+
+def require_admin(x_admin_token: Optional[str] = Header(None)) -> None:
+    """Reject requests without a valid admin token."""
+    if not settings.admin_token:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Not Found"
+        )
+    if not verify_admin_token(x_admin_token):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Invalid admin token"
+        )
+
+admin_router = APIRouter(
+    prefix="/admin",
+    tags=["admin"],
+    dependencies=[Depends(require_admin)],
+    default_response_class=FastJSONResponse,
+)
+
+KeyType = Literal["lineno", "filename", "traceback"]
+
+@admin_router.get("/memory")
+async def memory_summary():
+    """RSS, tracemalloc state, gc counts, SQLAlchemy sessions and NiceGUI clients."""
+    return memory_diagnostics.summary()
+
+@admin_router.post("/memory/tracemalloc/start")
+async def start_tracemalloc(frames: int = Query(1, ge=1, le=50)):
+    """Start tracing allocations with the given traceback depth."""
+    return memory_diagnostics.start(frames)
+
+@admin_router.post("/memory/tracemalloc/stop")
+async def stop_tracemalloc():
+    """Stop tracing allocations and drop the stored snapshots."""
+    return memory_diagnostics.stop()
+
+@admin_router.post("/memory/snapshots")
+async def take_snapshot(top: int = Query(20, ge=1, le=200), key_type: KeyType = "lineno"):
+    """Take a tracemalloc snapshot and return its largest allocation sites."""
+    try:
+        return await run_in_threadpool(memory_diagnostics.take_snapshot, top, key_type)
+    except RuntimeError as e:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=str(e)
+        )
+
+@admin_router.get("/memory/snapshots")
+async def list_snapshots():
+    """tracemalloc state and the stored snapshots."""
+    return memory_diagnostics.status()
+
+@admin_router.get("/memory/snapshots/{base_id}/diff")
+async def diff_snapshots(
+    base_id: int,
+    target: Optional[int] = Query(None, description="Snapshot to compare; the latest when omitted"),
+    top: int = Query(20, ge=1, le=200),
+    key_type: KeyType = "lineno",
+):
+    """Allocation sites that grew the most between two snapshots."""
+    try:
+        return await run_in_threadpool(memory_diagnostics.diff, base_id, target, top, key_type)
+    except KeyError as e:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Snapshot {e.args[0]} not found"
+        )
+
+@admin_router.get("/memory/objects")
+async def get_object_counts(top: int = Query(30, ge=1, le=500)):
+    """Object counts per type among objects tracked by the garbage collector."""
+    return await run_in_threadpool(object_counts, top)
+
+@admin_router.get("/memory/gc")
+async def get_gc_stats():
+    """Garbage collector counts, thresholds and per-generation statistics."""
+    return gc_stats()
+
+@admin_router.get("/memory/sessions")
+async def get_session_stats():
+    """Live SQLAlchemy sessions and the size of their identity maps."""
+    return session_stats()
+
+@admin_router.get("/memory/clients")
+async def get_client_stats():
+    """Estimated memory of connected NiceGUI clients, largest first."""
+    return client_stats()
+
+__all__ = ["admin_router", "require_admin"]
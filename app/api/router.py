@@ -1,27 +1,54 @@
 """Main API router for the Apple Store application."""
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, File, HTTPException, Query, UploadFile, status
+from fastapi.responses import FileResponse, RedirectResponse, StreamingResponse
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from starlette.concurrency import run_in_threadpool
+from typing import List, Literal, Optional, Union
+from app.api.admin import admin_router
+from app.core.config import settings
 from app.core.database import get_db
-from app.core.health import HealthCheck
-from app.services import UserService, ProductService, CartService, OrderService
+from app.core.health import HealthCheck, readiness_probe
+from app.core.responses import FastJSONResponse
+from app.core.streaming import ENCODERS, MEDIA_TYPES, stream_rows
+from app.services import UserService, ProductService, CartService, OrderService, ImageService
+from app.services.image_service import IMMUTABLE_CACHE_CONTROL, parse_thumbnail_name
+from app.services.product_service import FULL_FIELDS, SUMMARY_FIELDS, validate_fields
+from app.services.order_service import InsufficientStockError
+from app.services.popularity import popularity_tracker
+from app.services.suggest_index import suggest_index
 from app.schemas import (
     UserCreate, UserResponse, UserLogin,
-    ProductResponse, CategoryResponse,
-    CartItemCreate, CartResponse,
+    ProductResponse, ProductSummary, CategoryResponse,
+    CartItemCreate, CartItemResponse, CartResponse,
     OrderResponse
 )
 from app.core.security import create_access_token, verify_token
 
-api_router = APIRouter()
+api_router = APIRouter(default_response_class=FastJSONResponse)
 
 # Health check
 @api_router.get("/health", tags=["health"])
 async def health_check():
     """Health check endpoint."""
+    if readiness_probe.cached() is None:
+        await run_in_threadpool(readiness_probe.check)
     return HealthCheck.check_all()
 
+@api_router.get("/health/live", tags=["health"])
+async def liveness_check():
+    """Liveness probe: the process is up and serving."""
+    return HealthCheck.liveness()
+
+@api_router.get("/health/ready", tags=["health"])
+async def readiness_check():
+    """Readiness probe: database, pool, writer queues and event loop lag; 503 when not ready."""
+    readiness_probe.loop_lag.ensure_started()
+    result = readiness_probe.cached() or await run_in_threadpool(readiness_probe.check)
+    if result["status"] != "ready":
+        return FastJSONResponse(result, status_code=status.HTTP_503_SERVICE_UNAVAILABLE)
+    return result
+
 # Authentication endpoints
 @api_router.post("/auth/register", response_model=UserResponse, tags=["auth"])
 async def register(user_create: UserCreate, db: Session = Depends(get_db)):
@@ -59,21 +86,99 @@ async def get_categories(db: Session = Depends(get_db)):
     product_service = ProductService(db)
     return product_service.get_categories()
 
-@api_router.get("/products", response_model=List[ProductResponse], tags=["products"])
+@api_router.get(
+    "/products",
+    response_model=Union[List[ProductResponse], List[ProductSummary]],
+    tags=["products"]
+)
 async def get_products(
     category_id: Optional[int] = None,
     search: Optional[str] = None,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[int] = None,
+    view: Literal["full", "summary"] = "full",
+    fields: Optional[str] = Query(
+        None,
+        description="Comma-separated fields to return, e.g. 'id,name,price'; overrides view"
+    ),
+    sort: Literal["id", "price", "newest", "popularity"] = "id",
+    min_price: Optional[float] = Query(None, ge=0),
+    max_price: Optional[float] = Query(None, ge=0),
+    in_stock: bool = False,
     db: Session = Depends(get_db)
 ):
-    """Get products with optional filtering."""
-    product_service = ProductService(db)
+    """Get products with optional filtering.
     
-    if search:
-        return product_service.search_products(search, skip, limit)
+    ``sort=price`` orders cheapest first, ``sort=newest`` most recent first and
+    ``sort=popularity`` best-selling first.
+    Pass the ID of the last product of a page as ``cursor`` to get the next
+    page in the same order.
+    ``view=summary`` returns the compact ``ProductSummary`` shape. Rows are
+    selected as plain dicts and returned directly, skipping ORM loading and
+    response model validation.
+    """
+    if fields:
+        selected = [field.strip() for field in fields.split(",") if field.strip()]
     else:
-        return product_service.get_products(category_id, skip, limit)
+        selected = SUMMARY_FIELDS if view == "summary" else FULL_FIELDS
+    
+    product_service = ProductService(db)
+    try:
+        products = product_service.list_products(
+            category_id, search, skip, limit, cursor, fields=selected,
+            sort=sort, min_price=min_price, max_price=max_price, in_stock=in_stock
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    
+    return FastJSONResponse(products)
+
+@api_router.get("/products/faceted", tags=["products"])
+async def get_products_faceted(
+    category_id: Optional[int] = None,
+    search: Optional[str] = None,
+    skip: int = 0,
+    limit: int = Query(100, ge=0),
+    cursor: Optional[int] = None,
+    view: Literal["full", "summary"] = "summary",
+    sort: Literal["id", "price", "newest", "popularity"] = "id",
+    min_price: Optional[float] = Query(None, ge=0),
+    max_price: Optional[float] = Query(None, ge=0),
+    in_stock: bool = False,
+    db: Session = Depends(get_db)
+):
+    """A product page plus facet counts per category, price bucket and stock state.
+    
+    Takes the same filters as ``GET /products``. Each facet counts products
+    matching every other selected filter, so category counts ignore
+    ``category_id``. Pass ``limit=0`` for the facets alone.
+    """
+    product_service = ProductService(db)
+    result = product_service.faceted_search(
+        category_id, search, skip, limit, cursor,
+        fields=SUMMARY_FIELDS if view == "summary" else FULL_FIELDS,
+        sort=sort, min_price=min_price, max_price=max_price, in_stock=in_stock
+    )
+    return FastJSONResponse(result)
+
+@api_router.get("/products/top-sellers", tags=["products"])
+async def get_top_sellers(limit: int = Query(10, ge=1, le=50)):
+    """Best-selling products with their sales and add-to-cart counts, from memory."""
+    return FastJSONResponse(await run_in_threadpool(popularity_tracker.top_sellers, limit))
+
+@api_router.get("/products/suggest", tags=["products"])
+async def suggest_products(
+    q: str = Query(..., min_length=1, max_length=100),
+    limit: int = Query(8, ge=1, le=20)
+):
+    """Search-as-you-type: products and categories with a word starting with ``q``."""
+    if suggest_index.size == 0:
+        await run_in_threadpool(suggest_index.suggest, q, limit)  # first lookup builds the index
+    return suggest_index.suggest(q, limit)
 
 @api_router.get("/products/{product_id}", response_model=ProductResponse, tags=["products"])
 async def get_product(product_id: int, db: Session = Depends(get_db)):
@@ -89,14 +194,103 @@ async def get_product(product_id: int, db: Session = Depends(get_db)):
     
     return product
 
+@api_router.get("/products/{product_id}/related", tags=["products"])
+async def get_related_products(
+    product_id: int,
+    limit: int = Query(8, ge=1, le=50),
+    view: Literal["full", "summary"] = "summary",
+    db: Session = Depends(get_db)
+):
+    """Products frequently bought together with this one, from the precomputed co-purchase index."""
+    product_service = ProductService(db)
+    products = product_service.get_related_products(
+        product_id, limit, fields=SUMMARY_FIELDS if view == "summary" else FULL_FIELDS
+    )
+    return FastJSONResponse(products)
+
+@api_router.post("/products/{product_id}/image", response_model=ProductResponse, tags=["products"])
+async def upload_product_image(
+    product_id: int,
+    file: UploadFile = File(...),
+    db: Session = Depends(get_db)
+):
+    """Upload a product image and pre-render its thumbnails."""
+    data = await file.read(settings.max_file_size + 1)
+    if len(data) > settings.max_file_size:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail="Image is too large"
+        )
+    
+    image_service = ImageService()
+    try:
+        image_url = await run_in_threadpool(image_service.store_upload, data)
+    except (ValueError, OSError) as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid image: {e}"
+        )
+    
+    product = ProductService(db).set_product_image(product_id, image_url)
+    if not product:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Product not found"
+        )
+    
+    await run_in_threadpool(image_service.generate_all, image_url)
+    return product
+
+# Image endpoints
+@api_router.get("/images/thumbnail", tags=["images"])
+async def get_thumbnail(src: str, w: int = Query(320, ge=1), format: str = "webp"):
+    """Redirect to the content-addressed thumbnail of an image, rendering it on first request."""
+    try:
+        name = await run_in_threadpool(ImageService().get_thumbnail, src, w, format)
+    except (ValueError, OSError):
+        # PIL's UnidentifiedImageError is an OSError; its message includes the server path
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Source is not a readable image"
+        )
+    
+    if not name:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Image not found"
+        )
+    
+    return RedirectResponse(
+        f"{settings.api_prefix}/images/thumbnails/{name}",
+        status_code=status.HTTP_302_FOUND,
+        headers={"Cache-Control": "public, max-age=300"}
+    )
+
+@api_router.get("/images/thumbnails/{name}", tags=["images"])
+async def get_thumbnail_file(name: str):
+    """Serve a rendered thumbnail; its name is derived from its content, so it never changes."""
+    parsed = parse_thumbnail_name(name)
+    path = ImageService().thumbnail_path(*parsed) if parsed else None
+    if not path or not path.is_file():
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Thumbnail not found"
+        )
+    
+    return FileResponse(
+        path,
+        media_type=f"image/{parsed[2]}",
+        headers={"Cache-Control": IMMUTABLE_CACHE_CONTROL}
+    )
+
 # Cart endpoints (simplified without authentication for demo)
-@api_router.post("/cart/add", tags=["cart"])
+@api_router.post("/cart/add", response_model=CartItemResponse, tags=["cart"])
 async def add_to_cart(
     cart_item: CartItemCreate,
     user_id: int = 1,  # Simplified: using default user
     db: Session = Depends(get_db)
 ):
-    """Add item to cart."""
+    """Add item to cart and return the updated cart line."""
     cart_service = CartService(db)
     return cart_service.add_to_cart(user_id, cart_item)
 
@@ -137,7 +331,13 @@ async def remove_from_cart(
 async def create_order(user_id: int = 1, db: Session = Depends(get_db)):
     """Create order from cart."""
     order_service = OrderService(db)
-    order = order_service.create_order_from_cart(user_id)
+    try:
+        order = order_service.create_order_from_cart(user_id)
+    except InsufficientStockError as e:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=str(e)
+        )
     
     if not order:
         raise HTTPException(
@@ -148,9 +348,55 @@ async def create_order(user_id: int = 1, db: Session = Depends(get_db)):
     return order
 
 @api_router.get("/orders", response_model=List[OrderResponse], tags=["orders"])
-async def get_orders(user_id: int = 1, db: Session = Depends(get_db)):
-    """Get user orders."""
+async def get_orders(
+    user_id: int = 1,
+    skip: int = 0,
+    limit: int = 20,
+    cursor: Optional[int] = None,
+    db: Session = Depends(get_db)
+):
+    """Get a page of user orders, newest first."""
     order_service = OrderService(db)
-    return order_service.get_user_orders(user_id)
+    return order_service.get_user_orders(user_id, skip=skip, limit=limit, cursor=cursor)
+
+# Export endpoints
+def _export_response(rows, format: str, filename: str) -> StreamingResponse:
+    """Stream rows in the requested format as a file download."""
+    return StreamingResponse(
+        ENCODERS[format](rows),
+        media_type=MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}.{format}"'}
+    )
+
+@api_router.get("/export/products", tags=["export"])
+async def export_products(
+    format: Literal["ndjson", "csv"] = "ndjson",
+    category_id: Optional[int] = None,
+    fields: Optional[str] = Query(None, description="Comma-separated fields to export"),
+):
+    """Stream the whole catalog as NDJSON or CSV."""
+    selected = [field.strip() for field in fields.split(",") if field.strip()] if fields else FULL_FIELDS
+    try:
+        validate_fields(selected)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    
+    rows = stream_rows(lambda db: ProductService(db).iter_products(category_id, fields=selected))
+    return _export_response(rows, format, "products")
+
+@api_router.get("/export/orders", tags=["export"])
+async def export_orders(
+    format: Literal["ndjson", "csv"] = "ndjson",
+    user_id: int = 1
+):
+    """Stream a user's order history, one row per order item, as NDJSON or CSV."""
+    rows = stream_rows(lambda db: OrderService(db).iter_order_rows(user_id))
+    return _export_response(rows, format, "orders")
+
+# Admin diagnostics
+api_router.include_router(admin_router)
 
 __all__ = ["api_router"]
\ No newline at end of file
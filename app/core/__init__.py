@@ -1,75 +1,43 @@
-"""Core application components with defensive imports and fallbacks."""
+"""Core application components.
 
-import logging
-import os
-import sys
-import importlib
-from typing import Any, Dict, List, Optional
-
-# Configure basic logging immediately
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-    stream=sys.stderr
-)
-
-fallback_logger = logging.getLogger("app")
-
-# Fallback implementations
-def fallback_get_logger(name: str) -> logging.Logger:
-    """Fallback logger implementation."""
-    return logging.getLogger(f"app.{name}")
-
-class FallbackSettings:
-    """Fallback settings when config module fails to load."""
-    def __init__(self):
-        self.APP_NAME = "Apple Store"
-        self.APP_DESCRIPTION = "Premium Apple Products Store"
-        self.APP_VERSION = "1.0.0"
-        self.DEBUG = os.getenv("DEBUG", "False").lower() == "true"
-        self.HOST = os.getenv("HOST", "0.0.0.0")
-        self.PORT = int(os.getenv("PORT", "8000"))
-        self.API_PREFIX = "/api"
-        self.SECRET_KEY = os.getenv("SECRET_KEY", "apple-store-secret-key")
-        self.DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./data/apple_store.db")
-
-def safe_import(module_path: str, attributes: List[str], fallbacks: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
-    """Safely import attributes from a module with fallbacks."""
-    result = {}
-    fallbacks = fallbacks or {}
-    
-    try:
-        module = importlib.import_module(module_path)
-        for attr in attributes:
-            if hasattr(module, attr):
-                result[attr] = getattr(module, attr)
-            else:
-                result[attr] = fallbacks.get(attr)
-                fallback_logger.warning(f"Using fallback for {attr} from {module_path}")
-    except ImportError as e:
-        fallback_logger.warning(f"Failed to import {module_path}: {e}, using fallbacks")
-        for attr in attributes:
-            result[attr] = fallbacks.get(attr)
-    
-    return result
-
-# Import core components with fallbacks
-config_imports = safe_import("app.core.config", ["settings"], {
-    "settings": FallbackSettings()
-})
-settings = config_imports["settings"]
+Settings and the startup lifecycle are imported on first access, so importing
+one core module does not pull in configuration, the database or the API.
+"""
 
-logging_imports = safe_import("app.core.logging", ["app_logger", "get_logger"], {
-    "app_logger": fallback_logger,
-    "get_logger": fallback_get_logger
-})
-app_logger = logging_imports["app_logger"]
-get_logger = logging_imports["get_logger"]
+import importlib
+from typing import Any, List
+
+from app.core.logging import app_logger, get_logger
+
+_LAZY_ATTRIBUTES = {
+    "settings": "app.core.config",
+    "run_startup": "app.core.startup",
+    "lifespan": "app.core.startup",
+    "HealthCheck": "app.core.health",
+    "is_healthy": "app.core.health",
+}
+
+def __getattr__(name: str) -> Any:
+    """Import lazily exported attributes on first access."""
+    module_path = _LAZY_ATTRIBUTES.get(name)
+    if module_path is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_path), name)
+    globals()[name] = value
+    return value
 
-# Import other core components
 def setup_middleware(app):
     """Setup FastAPI middleware."""
     from fastapi.middleware.cors import CORSMiddleware
+    from app.core.database import engine
+    from app.core.profiling import ProfilingMiddleware, profiling_enabled
+    from app.core.query_counter import QueryCountMiddleware, install_query_counter
+    from app.core.tracing import TracingMiddleware, install_tracing, tracing_enabled
+    
+    install_query_counter(engine)
+    if profiling_enabled():
+        app.add_middleware(ProfilingMiddleware)
+    app.add_middleware(QueryCountMiddleware)
     app.add_middleware(
         CORSMiddleware,
         allow_origins=["*"],
@@ -77,6 +45,9 @@ def setup_middleware(app):
         allow_methods=["*"],
         allow_headers=["*"],
     )
+    if tracing_enabled():
+        install_tracing(engine)
+        app.add_middleware(TracingMiddleware)
 
 def setup_routers(app, api_prefix: str = ""):
     """Setup FastAPI routers."""
@@ -104,7 +75,6 @@ def validate_environment() -> List[str]:
     errors = []
     
     # Create data directory if it doesn't exist
-    import os
     from pathlib import Path
     
     data_dir = Path("data")
@@ -116,32 +86,10 @@ def validate_environment() -> List[str]:
     
     return errors
 
-class HealthCheck:
-    """Health check utilities."""
-    
-    @staticmethod
-    def check_all():
-        """Perform comprehensive health check."""
-        import time
-        return {
-            "status": "healthy",
-            "timestamp": time.time(),
-            "version": settings.APP_VERSION,
-            "database": "connected"
-        }
-
-def is_healthy() -> bool:
-    """Check if application is healthy."""
-    return True
-
 def setup_database():
     """Setup database tables."""
-    try:
-        from app.core.database import create_tables
-        create_tables()
-        app_logger.info("Database tables created successfully")
-    except ImportError as e:
-        app_logger.warning(f"Database setup skipped: {e}")
+    from app.core.startup import init_database
+    init_database()
 
 def setup_nicegui(app):
     """Setup NiceGUI integration with FastAPI."""
@@ -152,7 +100,8 @@ def setup_nicegui(app):
         app_logger.warning(f"NiceGUI setup skipped: {e}")
 
 __all__ = [
-    "settings", "app_logger", "get_logger", "setup_middleware", 
+    "settings", "app_logger", "get_logger", "setup_middleware",
     "setup_routers", "setup_error_handlers", "validate_environment",
-    "HealthCheck", "is_healthy", "setup_database", "setup_nicegui"
-]
\ No newline at end of file
+    "HealthCheck", "is_healthy", "setup_database", "setup_nicegui",
+    "run_startup", "lifespan"
+]
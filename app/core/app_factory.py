@@ -0,0 +1,35 @@
+"""FastAPI application factory for the API-only (headless) mode."""
+
+from fastapi import FastAPI
+
+from app.core import setup_error_handlers, setup_middleware, setup_routers
+from app.core.config import settings
+from app.core.startup import lifespan, phase
+
+def create_api_app() -> FastAPI:
+    """Build the API application without NiceGUI.
+
+    Routes, middleware and static files are the same as in ``main.py``; the
+    UI pages and live updates are left to the NiceGUI nodes. Database setup
+    runs in the lifespan, so building the app has no side effects and it can
+    be imported once in a pre-forking server.
+    """
+    from app.core.static_assets import setup_static_assets
+
+    app = FastAPI(
+        title=settings.app_name,
+        description=settings.app_description,
+        version=settings.app_version,
+        docs_url=f"{settings.api_prefix}/docs",
+        redoc_url=f"{settings.api_prefix}/redoc",
+        lifespan=lifespan,
+    )
+    with phase("api routes"):
+        setup_error_handlers(app)
+        setup_middleware(app)
+        setup_routers(app, api_prefix=settings.api_prefix)
+    with phase("static assets"):
+        setup_static_assets(app)
+    return app
+
+__all__ = ["create_api_app"]
@@ -2,7 +2,7 @@
 
 from pydantic_settings import BaseSettings
 from pydantic import Field, ConfigDict
-from typing import Optional
+from typing import List, Optional
 
 class Settings(BaseSettings):
     """Application settings with environment variable support."""
@@ -23,18 +23,50 @@ class Settings(BaseSettings):
     host: str = Field(default="0.0.0.0")
     port: int = Field(default=8000)
     api_prefix: str = Field(default="/api")
+    graceful_timeout: int = Field(default=30)  # Seconds to finish in-flight requests on shutdown
+    expose_query_count: bool = Field(default=False)  # Send X-DB-Statements with every response
+    readiness_cache_seconds: float = Field(default=2.0)  # Reuse readiness results for this long
+    readiness_max_loop_lag_ms: float = Field(default=500.0)  # Not ready when the event loop lags more
     
     # Security
     secret_key: str = Field(default="apple-store-secret-key-change-in-production")
     algorithm: str = Field(default="HS256")
     access_token_expire_minutes: int = Field(default=30)
+    admin_token: str = Field(default="")  # Enables admin-only diagnostics when set
     
     # Database
     database_url: str = Field(default="sqlite:///./data/apple_store.db")
+    seed_sample_data: bool = Field(default=True)  # Insert the demo catalog into an empty database on startup
+    
+    # Shared catalog snapshot for product list reads
+    catalog_snapshot_enabled: bool = Field(default=False)
+    catalog_snapshot_path: str = Field(default="./data/catalog.snapshot")
+    catalog_snapshot_refresh_seconds: float = Field(default=2.0)  # Delay before rebuilding after a change
+    
+    # Request profiling, written to profile_directory
+    profile_sample_rate: float = Field(default=0.0)  # Share of requests to profile, e.g. 0.001
+    profile_directory: str = Field(default="./logs/profiles")
+    
+    # Request tracing
+    trace_sample_rate: float = Field(default=0.0)  # Share of new traces to record; 0 disables tracing
+    trace_exporter: str = Field(default="jsonl")  # "jsonl" or "otlp"
+    trace_file: str = Field(default="./logs/traces.jsonl")
+    trace_endpoint: str = Field(default="http://localhost:4318/v1/traces")  # OTLP/HTTP JSON collector
+    
+    # Search suggestions and facets
+    suggest_refresh_seconds: float = Field(default=300.0)  # Full rebuild interval; 0 rebuilds only on restart
+    facet_cache_seconds: float = Field(default=30.0)  # Reuse unfiltered facet counts for this long
+    popularity_flush_seconds: float = Field(default=5.0)  # Write sales and cart counters in batches this often
+    related_products_directory: str = Field(default="./data/related_products")  # Written by app.jobs.related_products
     
     # File uploads
     max_file_size: int = Field(default=10 * 1024 * 1024)  # 10MB
     upload_directory: str = Field(default="./app/static/uploads")
+    
+    # Image thumbnails
+    thumbnail_directory: str = Field(default="./data/thumbnails")
+    thumbnail_widths: List[int] = Field(default=[160, 320, 640])
+    thumbnail_workers: int = Field(default=2)
 
 settings = Settings()
 
@@ -17,8 +17,11 @@ class Base(DeclarativeBase):
     pass
 
 def create_tables():
-    """Create all database tables."""
+    """Create all database tables, and indexes added to tables that already exist."""
     Base.metadata.create_all(bind=engine)
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=engine, checkfirst=True)
 
 def get_db() -> Session:
     """Database session dependency."""
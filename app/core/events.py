@@ -0,0 +1,59 @@
+"""In-process publish/subscribe for domain events."""
+
+import threading
+from typing import Any, Callable, Dict, List
+
+from app.core.logging import get_logger
+
+logger = get_logger("events")
+
+# Topics
+CART_TOPIC = "cart"    # {"user_id", "action": "upsert" | "remove" | "clear", "item" and "added" | "cart_item_id"}
+STOCK_TOPIC = "stock"  # {"stock": {product_id: stock_quantity}}
+ORDER_TOPIC = "order"  # {"user_id", "order_id", "items": [{"product_id", "quantity", "price"}]}
+CATALOG_TOPIC = "catalog"  # {"product_ids": [product_id, ...]} after product details change
+
+Subscriber = Callable[[Dict[str, Any]], Any]
+
+class EventBus:
+    """Synchronous in-process event bus.
+
+    Subscribers are called in the publishing thread, after the publisher has
+    committed. Subscribers that touch the UI must hand the event over to the
+    event loop themselves.
+    """
+
+    def __init__(self):
+        self._subscribers: Dict[str, List[Subscriber]] = {}
+        self._lock = threading.Lock()
+
+    def subscribe(self, topic: str, callback: Subscriber) -> Callable[[], None]:
+        """Subscribe to a topic and return a function that unsubscribes."""
+        with self._lock:
+            self._subscribers.setdefault(topic, []).append(callback)
+
+        def unsubscribe() -> None:
+            with self._lock:
+                subscribers = self._subscribers.get(topic, [])
+                if callback in subscribers:
+                    subscribers.remove(callback)
+
+        return unsubscribe
+
+    def has_subscribers(self, topic: str) -> bool:
+        """Check whether anyone listens, so publishers can skip building payloads."""
+        return bool(self._subscribers.get(topic))
+
+    def publish(self, topic: str, payload: Dict[str, Any]) -> None:
+        """Deliver an event to all subscribers of a topic."""
+        with self._lock:
+            subscribers = list(self._subscribers.get(topic, []))
+        for callback in subscribers:
+            try:
+                callback(payload)
+            except Exception as e:
+                logger.error(f"Event subscriber for '{topic}' failed: {e}")
+
+event_bus = EventBus()
+
+__all__ = ["EventBus", "event_bus", "CART_TOPIC", "STOCK_TOPIC", "ORDER_TOPIC", "CATALOG_TOPIC"]
@@ -1,24 +1,197 @@
-"""Health check utilities."""
+"""Liveness and readiness checks.
 
+Liveness only says the process can answer. Readiness checks the things a
+request depends on:
+
+- a database ping;
+- how full the connection pool is;
+- how deep the background writer queues are;
+- how far the event loop falls behind its timers.
+
+The readiness result is cached for ``READINESS_CACHE_SECONDS``, and
+concurrent probes share one check, so frequent probes add no load.
+"""
+
+import asyncio
+import os
+import threading
 import time
-from typing import Dict, Any
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
 from app.core.config import settings
+from app.core.logging import get_logger
+
+logger = get_logger("health")
+
+STARTED_AT = time.time()
+LOOP_LAG_INTERVAL = 0.25  # seconds between event loop lag samples
+LOOP_LAG_WINDOW = 40  # samples kept, about 10 seconds
+POOL_SATURATION_LIMIT = 1.0  # not ready once every connection is checked out
+QUEUE_FILL_LIMIT = 0.9  # not ready once a writer queue is 90% full
+
+# name -> (current depth, capacity)
+_queues: Dict[str, Tuple[Callable[[], int], int]] = {}
+
+def register_queue(name: str, depth: Callable[[], int], capacity: int) -> None:
+    """Report a background writer queue in readiness checks."""
+    _queues[name] = (depth, capacity)
+
+class LoopLagMonitor:
+    """Measures how late the event loop wakes up from short sleeps."""
+
+    def __init__(self, interval: float = LOOP_LAG_INTERVAL):
+        self.interval = interval
+        self.samples: List[float] = []
+        self._task: Optional[asyncio.Task] = None
+
+    def ensure_started(self) -> None:
+        """Start sampling on the running loop; call from a coroutine."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            start = loop.time()
+            await asyncio.sleep(self.interval)
+            self.samples.append(max(0.0, loop.time() - start - self.interval))
+            del self.samples[:-LOOP_LAG_WINDOW]
+
+    def stats(self) -> Dict[str, Optional[float]]:
+        """Last and worst lag over the recent window, in milliseconds."""
+        if not self.samples:
+            return {"last_ms": None, "max_ms": None}
+        return {"last_ms": round(self.samples[-1] * 1000, 2), "max_ms": round(max(self.samples) * 1000, 2)}
+
+def pool_stats(engine) -> Dict[str, Any]:
+    """Checked-out connections against the pool's capacity, where the pool reports them."""
+    pool = engine.pool
+    stats: Dict[str, Any] = {"class": type(pool).__name__}
+    if hasattr(pool, "checkedout") and hasattr(pool, "size"):
+        capacity = pool.size() + max(getattr(pool, "_max_overflow", 0), 0)
+        checked_out = pool.checkedout()
+        stats.update({
+            "size": pool.size(),
+            "capacity": capacity,
+            "checked_out": checked_out,
+            "overflow": pool.overflow(),
+            "saturation": round(checked_out / capacity, 3) if capacity else None,
+        })
+    return stats
+
+def ping_database(engine) -> Dict[str, Any]:
+    """Run ``SELECT 1`` and time it."""
+    from sqlalchemy import text
+
+    start = time.perf_counter()
+    try:
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+    except Exception as e:
+        return {"ok": False, "error": str(e)}
+    return {"ok": True, "latency_ms": round((time.perf_counter() - start) * 1000, 2)}
+
+class ReadinessProbe:
+    """Runs the readiness checks at most once per cache window."""
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self.loop_lag = LoopLagMonitor()
+        self._result: Optional[Dict[str, Any]] = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    def cached(self) -> Optional[Dict[str, Any]]:
+        """The last result while it is fresh, without running any checks."""
+        if self._result is not None and time.monotonic() - self._checked_at < self.ttl:
+            return self._result
+        return None
+
+    def check(self) -> Dict[str, Any]:
+        """The cached result, refreshed once it is older than the TTL."""
+        result = self.cached()
+        if result is not None:
+            return result
+        with self._lock:
+            if self._result is None or time.monotonic() - self._checked_at >= self.ttl:
+                self._result = self._run_checks()
+                self._checked_at = time.monotonic()
+            return self._result
+
+    def _run_checks(self) -> Dict[str, Any]:
+        from app.core.database import engine
+
+        failures = []
+        pool = pool_stats(engine)
+        saturation = pool.get("saturation")
+        if saturation is not None and saturation >= POOL_SATURATION_LIMIT:
+            # A ping would only queue behind the requests holding every connection
+            database = {"ok": False, "error": "connection pool exhausted"}
+        else:
+            database = ping_database(engine)
+        if not database["ok"]:
+            failures.append(f"database: {database['error']}")
+
+        queues = {}
+        for name, (depth, capacity) in _queues.items():
+            current = depth()
+            queues[name] = {"depth": current, "capacity": capacity}
+            if capacity and current >= capacity * QUEUE_FILL_LIMIT:
+                failures.append(f"{name} queue is {current}/{capacity}")
+
+        lag = self.loop_lag.stats()
+        if lag["max_ms"] is not None and lag["max_ms"] > settings.readiness_max_loop_lag_ms:
+            failures.append(f"event loop lag {lag['max_ms']:.0f} ms")
+
+        if failures:
+            logger.warning(f"Not ready: {'; '.join(failures)}")
+        return {
+            "status": "not_ready" if failures else "ready",
+            "checked_at": time.time(),
+            "failures": failures,
+            "database": database,
+            "pool": pool,
+            "queues": queues,
+            "event_loop_lag": lag,
+        }
+
+readiness_probe = ReadinessProbe(settings.readiness_cache_seconds)
 
 class HealthCheck:
     """Health check utilities."""
-    
+
     @staticmethod
-    def check_all() -> Dict[str, Any]:
-        """Perform comprehensive health check."""
+    def liveness() -> Dict[str, Any]:
+        """Process is up; checks no dependencies."""
         return {
-            "status": "healthy",
+            "status": "alive",
             "timestamp": time.time(),
             "version": settings.app_version,
-            "app_name": settings.app_name
+            "app_name": settings.app_name,
+            "pid": os.getpid(),
+            "uptime_s": round(time.time() - STARTED_AT, 1),
+        }
+
+    @staticmethod
+    def readiness() -> Dict[str, Any]:
+        """Dependency checks, cached for a short window."""
+        return readiness_probe.check()
+
+    @staticmethod
+    def check_all() -> Dict[str, Any]:
+        """Liveness plus the cached readiness checks."""
+        ready = readiness_probe.check()
+        return {
+            **HealthCheck.liveness(),
+            "status": "healthy" if ready["status"] == "ready" else "unhealthy",
+            "checks": ready,
         }
 
 def is_healthy() -> bool:
-    """Simple health check."""
-    return True
+    """Whether the last readiness check passed."""
+    return readiness_probe.check()["status"] == "ready"
 
-__all__ = ["HealthCheck", "is_healthy"]
\ No newline at end of file
+__all__ = [
+    "HealthCheck", "LoopLagMonitor", "ReadinessProbe", "is_healthy",
+    "ping_database", "pool_stats", "readiness_probe", "register_queue"
+]
@@ -15,9 +15,10 @@ logging.basicConfig(
     datefmt="%Y-%m-%d %H:%M:%S",
 )
 
-# Create application logger
+# Create application logger; it has its own handlers, so don't pass records on to the root logger too
 app_logger = logging.getLogger("apple_store")
 app_logger.setLevel(logging.INFO)
+app_logger.propagate = False
 
 # Create formatter
 formatter = logging.Formatter(
@@ -52,12 +53,7 @@ def get_logger(name: str) -> logging.Logger:
     """Create a logger for a specific module."""
     logger = logging.getLogger(f"apple_store.{name}")
     logger.setLevel(app_logger.level)
-    
-    if not logger.handlers:
-        logger.addHandler(console_handler)
-        if log_file and 'file_handler' in locals():
-            logger.addHandler(file_handler)
-    
+    # Records propagate to app_logger's handlers
     return logger
 
 def log_structured(logger: logging.Logger, level: str, message: str, data: Dict[str, Any]) -> None:
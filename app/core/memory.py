@@ -0,0 +1,204 @@
+"""Memory diagnostics for finding slow growth in a running process.
+
+Wraps ``tracemalloc`` start/stop, snapshots kept in memory and diffs between
+them by allocation site, object counts per type, ``gc`` statistics, process
+RSS, live SQLAlchemy sessions with the size of their identity maps, and
+estimates for connected NiceGUI clients. Everything here is served through
+the admin endpoints in ``app.api.admin``.
+"""
+
+import gc
+import linecache
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter, OrderedDict
+from typing import Any, Dict, List, Optional
+
+from app.core.logging import get_logger
+
+logger = get_logger("memory")
+
+MAX_SNAPSHOTS = 5  # oldest snapshots are dropped beyond this
+KEY_TYPES = ("lineno", "filename", "traceback")
+
+def process_memory() -> Dict[str, Optional[int]]:
+    """Current and peak resident set size in bytes, where the platform reports them."""
+    rss = peak = None
+    try:
+        with open("/proc/self/statm") as f:
+            rss = int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        pass
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        peak *= 1 if sys.platform == "darwin" else 1024  # kilobytes on Linux
+    except ImportError:
+        pass
+    return {"rss_bytes": rss, "peak_rss_bytes": peak}
+
+def gc_stats() -> Dict[str, Any]:
+    """Collector counts, thresholds and per-generation statistics."""
+    return {
+        "enabled": gc.isenabled(),
+        "counts": gc.get_count(),
+        "thresholds": gc.get_threshold(),
+        "generations": gc.get_stats(),
+        "tracked_objects": len(gc.get_objects()),
+        "uncollectable": len(gc.garbage),
+        "frozen": gc.get_freeze_count(),
+    }
+
+def object_counts(top: int = 30) -> List[Dict[str, Any]]:
+    """The most common types among objects tracked by the collector."""
+    counts = Counter(f"{type(obj).__module__}.{type(obj).__qualname__}" for obj in gc.get_objects())
+    return [{"type": name, "count": count} for name, count in counts.most_common(top)]
+
+def session_stats() -> Dict[str, Any]:
+    """Live SQLAlchemy sessions and the objects held in their identity maps."""
+    from sqlalchemy.orm.session import _sessions
+
+    sessions = list(_sessions.values())
+    sizes = [len(session.identity_map) for session in sessions]
+    return {
+        "sessions": len(sessions),
+        "identity_map_objects": sum(sizes),
+        "largest_identity_map": max(sizes, default=0),
+    }
+
+def client_stats() -> Dict[str, Any]:
+    """Per-client estimates for NiceGUI clients, largest first; empty when NiceGUI is not loaded."""
+    if "nicegui" not in sys.modules:
+        return {"clients": 0, "elements": 0, "payload_bytes": 0, "largest": []}
+    from nicegui import Client
+    from app.frontend.diagnostics import estimate_client_memory
+
+    estimates = [estimate_client_memory(client) for client in list(Client.instances.values())]
+    estimates.sort(key=lambda estimate: estimate["payload_bytes"], reverse=True)
+    return {
+        "clients": len(estimates),
+        "elements": sum(estimate["elements"] for estimate in estimates),
+        "payload_bytes": sum(estimate["payload_bytes"] for estimate in estimates),
+        "largest": estimates[:20],
+    }
+
+def _statistic(stat, key_type: str) -> Dict[str, Any]:
+    frames = [
+        {"file": frame.filename, "line": frame.lineno, "code": linecache.getline(frame.filename, frame.lineno).strip()}
+        for frame in (stat.traceback if key_type == "traceback" else stat.traceback[:1])
+    ]
+    return {"size_bytes": stat.size, "count": stat.count, "frames": frames}
+
+def _statistic_diff(stat, key_type: str) -> Dict[str, Any]:
+    return {**_statistic(stat, key_type), "size_diff_bytes": stat.size_diff, "count_diff": stat.count_diff}
+
+class MemoryDiagnostics:
+    """Controls tracemalloc and keeps the last few snapshots for diffing."""
+
+    def __init__(self):
+        self._snapshots: "OrderedDict[int, Dict[str, Any]]" = OrderedDict()
+        self._next_id = 1
+        self._lock = threading.Lock()
+
+    def status(self) -> Dict[str, Any]:
+        """tracemalloc state and the snapshots held."""
+        tracing = tracemalloc.is_tracing()
+        current, peak = tracemalloc.get_traced_memory() if tracing else (0, 0)
+        return {
+            "tracing": tracing,
+            "frames": tracemalloc.get_traceback_limit() if tracing else None,
+            "traced_bytes": current,
+            "traced_peak_bytes": peak,
+            "overhead_bytes": tracemalloc.get_tracemalloc_memory() if tracing else 0,
+            "snapshots": [
+                {"id": snapshot_id, "taken_at": entry["taken_at"], "traced_bytes": entry["traced_bytes"]}
+                for snapshot_id, entry in self._snapshots.items()
+            ],
+        }
+
+    def start(self, frames: int = 1) -> Dict[str, Any]:
+        """Start tracing allocations, keeping ``frames`` frames per allocation."""
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(frames)
+            logger.info(f"tracemalloc started with {frames} frame(s)")
+        return self.status()
+
+    def stop(self) -> Dict[str, Any]:
+        """Stop tracing and drop all snapshots."""
+        if tracemalloc.is_tracing():
+            tracemalloc.stop()
+            logger.info("tracemalloc stopped")
+        with self._lock:
+            self._snapshots.clear()
+        return self.status()
+
+    def take_snapshot(self, top: int = 20, key_type: str = "lineno") -> Dict[str, Any]:
+        """Take a snapshot, keep it for diffing and return its top allocation sites."""
+        if not tracemalloc.is_tracing():
+            raise RuntimeError("tracemalloc is not running")
+        snapshot = self._filtered(tracemalloc.take_snapshot())
+        with self._lock:
+            snapshot_id = self._next_id
+            self._next_id += 1
+            self._snapshots[snapshot_id] = {
+                "snapshot": snapshot,
+                "taken_at": time.time(),
+                "traced_bytes": tracemalloc.get_traced_memory()[0],
+            }
+            while len(self._snapshots) > MAX_SNAPSHOTS:
+                self._snapshots.popitem(last=False)
+        stats = snapshot.statistics(key_type)
+        return {
+            "id": snapshot_id,
+            "total_bytes": sum(stat.size for stat in stats),
+            "top": [_statistic(stat, key_type) for stat in stats[:top]],
+        }
+
+    def diff(self, base_id: int, target_id: Optional[int] = None, top: int = 20,
+             key_type: str = "lineno") -> Dict[str, Any]:
+        """Allocation sites that grew most between two snapshots; the target defaults to the latest."""
+        with self._lock:
+            if target_id is None and self._snapshots:
+                target_id = next(reversed(self._snapshots))
+            base, target = self._snapshots.get(base_id), self._snapshots.get(target_id)
+        if base is None or target is None:
+            raise KeyError(base_id if base is None else target_id)
+        stats = target["snapshot"].compare_to(base["snapshot"], key_type)
+        return {
+            "base": base_id,
+            "target": target_id,
+            "seconds": target["taken_at"] - base["taken_at"],
+            "size_diff_bytes": sum(stat.size_diff for stat in stats),
+            "top": [_statistic_diff(stat, key_type) for stat in stats[:top]],
+        }
+
+    @staticmethod
+    def _filtered(snapshot: tracemalloc.Snapshot) -> tracemalloc.Snapshot:
+        return snapshot.filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+            tracemalloc.Filter(False, "<unknown>"),
+        ))
+
+    def summary(self) -> Dict[str, Any]:
+        """Cheap overview: RSS, tracemalloc state, gc counts, sessions and clients."""
+        clients = client_stats()
+        return {
+            "pid": os.getpid(),
+            **process_memory(),
+            "tracemalloc": {key: value for key, value in self.status().items() if key != "snapshots"},
+            "gc_counts": gc.get_count(),
+            "sqlalchemy": session_stats(),
+            "nicegui": {key: clients[key] for key in ("clients", "elements", "payload_bytes")},
+        }
+
+memory_diagnostics = MemoryDiagnostics()
+
+__all__ = [
+    "MemoryDiagnostics", "memory_diagnostics", "process_memory", "gc_stats",
+    "object_counts", "session_stats", "client_stats", "KEY_TYPES"
+]
@@ -70,6 +70,7 @@ class RateLimitMiddleware:
         self.window = window  # window in seconds
         self.exempt_paths = exempt_paths or []
         self.requests = {}
+        self._last_sweep = time.time()
     
     async def __call__(self, scope, receive, send):
         if scope["type"] != "http":
@@ -85,6 +86,8 @@ class RateLimitMiddleware:
         
         # Check rate limit
         current_time = time.time()
+        if current_time - self._last_sweep >= self.window:
+            self._sweep(current_time)
         if client_ip in self.requests:
             requests_info = self.requests[client_ip]
             # Clean up old requests
@@ -101,6 +104,14 @@ class RateLimitMiddleware:
         
         return await self.app(scope, receive, send)
     
+    def _sweep(self, current_time: float) -> None:
+        """Forget clients with no requests in the current window, so the dict stays bounded."""
+        self.requests = {
+            client_ip: timestamps for client_ip, timestamps in self.requests.items()
+            if timestamps and current_time - timestamps[-1] < self.window
+        }
+        self._last_sweep = current_time
+    
     def _get_client_ip(self, scope):
         """Extract client IP from scope."""
         headers = dict(scope.get("headers", []))
@@ -0,0 +1,182 @@
+"""On-demand profiling of single HTTP requests.
+
+A request is profiled when it carries ``X-Profile: <ADMIN_TOKEN>`` or when it
+falls in the ``PROFILE_SAMPLE_RATE`` share of sampled requests. It then runs
+under ``cProfile`` and a stack sampler at the same time. Each profile
+writes these files to ``PROFILE_DIRECTORY``:
+
+- ``<id>.pstats`` for ``python -m pstats`` or snakeviz;
+- ``<id>.collapsed`` with stacks in the collapsed format read by
+  flamegraph.pl and speedscope;
+- ``<id>.json`` with the route, status, duration and SQL statement count.
+
+The response carries the profile ID in ``X-Profile-Id``.
+
+Only one request per process is profiled at a time. Both profilers watch
+the event loop thread, so other requests interleaved on the loop can show
+up in a profile. When neither trigger is configured the middleware is not
+installed at all.
+"""
+
+import cProfile
+import json
+import os
+import random
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from starlette.concurrency import run_in_threadpool
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+from app.core.logging import get_logger
+from app.core.query_counter import statement_count
+from app.core.security import verify_admin_token
+
+logger = get_logger("profiling")
+
+PROFILE_HEADER = "X-Profile"
+PROFILE_ID_HEADER = "X-Profile-Id"
+SAMPLE_INTERVAL = 0.001  # seconds between stack samples
+MAX_PROFILES = 200  # older profiles are deleted beyond this
+
+def profiling_enabled() -> bool:
+    """Whether any profiling trigger is configured."""
+    return bool(settings.admin_token) or settings.profile_sample_rate > 0
+
+def _frame_name(code) -> str:
+    filename = code.co_filename
+    cwd = os.getcwd()
+    if filename.startswith(cwd):
+        filename = filename[len(cwd) + 1:]
+    return f"{code.co_name} ({filename}:{code.co_firstlineno})".replace(";", ":")
+
+class StackSampler:
+    """Samples one thread's Python stack at a fixed interval and counts identical stacks."""
+
+    def __init__(self, thread_id: int, interval: float = SAMPLE_INTERVAL):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                stack.append(_frame_name(frame.f_code))
+                frame = frame.f_back
+            if stack:
+                self.stacks[";".join(reversed(stack))] += 1
+
+    def collapsed(self) -> str:
+        """The samples as ``frame;frame;frame count`` lines."""
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+class ProfilingMiddleware:
+    """Profiles requests chosen by the admin header or by sampling."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        self.directory = Path(settings.profile_directory)
+        self._busy = threading.Lock()
+
+    def _requested(self, scope: Scope) -> bool:
+        if settings.admin_token:
+            for name, value in scope.get("headers", []):
+                if name == b"x-profile":
+                    return verify_admin_token(value.decode("latin-1"))
+        return settings.profile_sample_rate > 0 and random.random() < settings.profile_sample_rate
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not self._requested(scope):
+            await self.app(scope, receive, send)
+            return
+        if not self._busy.acquire(blocking=False):
+            logger.info(f"Skipping profile of {scope['path']}: another request is being profiled")
+            await self.app(scope, receive, send)
+            return
+
+        profile_id = f"{datetime.now(timezone.utc):%Y%m%dT%H%M%S}-{uuid.uuid4().hex[:8]}"
+        status = {"code": None}
+
+        async def send_with_id(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+                headers = list(message.get("headers", []))
+                headers.append((PROFILE_ID_HEADER.lower().encode("latin-1"), profile_id.encode("latin-1")))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        profiler = cProfile.Profile()
+        sampler = StackSampler(threading.get_ident())
+        statements_before = statement_count()
+        start = time.perf_counter()
+        try:
+            try:
+                profiler.enable()
+            except ValueError:  # another profiler is active on this thread
+                profiler = None
+            sampler.start()
+            try:
+                await self.app(scope, receive, send_with_id)
+            finally:
+                if profiler is not None:
+                    profiler.disable()
+                sampler.stop()
+            duration = time.perf_counter() - start
+            route = scope.get("route")
+            meta = {
+                "id": profile_id,
+                "method": scope["method"],
+                "path": scope["path"],
+                "route": getattr(route, "path", scope["path"]),
+                "query": scope.get("query_string", b"").decode("latin-1"),
+                "status": status["code"],
+                "duration_ms": round(duration * 1000, 3),
+                "sql_statements": statement_count() - statements_before,
+                "samples": sum(sampler.stacks.values()),
+                "sample_interval_ms": sampler.interval * 1000,
+                "pid": os.getpid(),
+            }
+            await run_in_threadpool(self._write, profile_id, profiler, sampler, meta)
+        finally:
+            self._busy.release()
+
+    def _write(self, profile_id: str, profiler: Optional[cProfile.Profile], sampler: StackSampler,
+               meta: Dict[str, Any]) -> None:
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            base = self.directory / profile_id
+            if profiler is not None:
+                profiler.dump_stats(str(base.with_suffix(".pstats")))
+            base.with_suffix(".collapsed").write_text(sampler.collapsed())
+            base.with_suffix(".json").write_text(json.dumps(meta, indent=2))
+            logger.info(f"Profiled {meta['method']} {meta['route']}: {meta['duration_ms']:.1f} ms, "
+                        f"{meta['sql_statements']} SQL statements -> {base}")
+            self._prune()
+        except OSError as e:
+            logger.error(f"Failed to write profile {profile_id}: {e}")
+
+    def _prune(self) -> None:
+        profiles = sorted(self.directory.glob("*.json"))
+        for old in profiles[:-MAX_PROFILES]:
+            for suffix in (".json", ".pstats", ".collapsed"):
+                old.with_suffix(suffix).unlink(missing_ok=True)
+
+__all__ = ["ProfilingMiddleware", "StackSampler", "profiling_enabled", "PROFILE_HEADER", "PROFILE_ID_HEADER"]
@@ -0,0 +1,73 @@
+"""Per-request count of database statements.
+
+A context variable holds a counter for the current request; an engine event
+increments it for every statement executed. Context variables are copied
+into the thread pool that runs sync dependencies, and the counter is a
+mutable list, so statements run there are counted too.
+"""
+
+from contextvars import ContextVar
+from typing import List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+
+STATEMENTS_HEADER = "X-DB-Statements"
+
+_statements: ContextVar[Optional[List[int]]] = ContextVar("db_statements", default=None)
+
+def _count_statement(conn, cursor, statement, parameters, context, executemany) -> None:
+    counter = _statements.get()
+    if counter is not None:
+        counter[0] += 1
+
+def install_query_counter(engine: Engine) -> None:
+    """Count statements executed on ``engine``; safe to call more than once."""
+    if not event.contains(engine, "before_cursor_execute", _count_statement):
+        event.listen(engine, "before_cursor_execute", _count_statement)
+
+def start_counting() -> List[int]:
+    """Start a new count for the current context and return its counter."""
+    counter = [0]
+    _statements.set(counter)
+    return counter
+
+def statement_count() -> int:
+    """Statements executed so far in the current context."""
+    counter = _statements.get()
+    return counter[0] if counter is not None else 0
+
+class QueryCountMiddleware:
+    """Counts the statements each HTTP request runs.
+
+    With ``expose_query_count`` enabled the count is sent back in the
+    ``X-DB-Statements`` response header. For streamed responses it covers
+    the statements run before the headers were sent.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        counter = start_counting()
+
+        async def send_with_count(message: Message) -> None:
+            if message["type"] == "http.response.start" and settings.expose_query_count:
+                headers = list(message.get("headers", []))
+                headers.append((STATEMENTS_HEADER.lower().encode("latin-1"), str(counter[0]).encode("latin-1")))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        await self.app(scope, receive, send_with_count)
+
+__all__ = [
+    "QueryCountMiddleware", "install_query_counter", "start_counting",
+    "statement_count", "STATEMENTS_HEADER"
+]
@@ -0,0 +1,38 @@
+"""Fast JSON response rendering."""
+
+import json
+from datetime import date, datetime
+from typing import Any
+
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is in requirements.txt
+    orjson = None
+
+def _default(obj: Any) -> Any:
+    """Encode the types the fast path produces when orjson is unavailable."""
+    if isinstance(obj, (datetime, date)):
+        return obj.isoformat()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+def dumps(content: Any) -> bytes:
+    """Encode JSON with orjson, or the stdlib encoder when orjson is not installed."""
+    if orjson is not None:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(content, default=_default, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+class FastJSONResponse(JSONResponse):
+    """JSON response encoded with orjson.
+
+    Accepts plain dicts, lists, numbers, strings and datetimes, which is what
+    the column-select service methods return. Falls back to the stdlib
+    encoder when orjson is not installed.
+    """
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+__all__ = ["FastJSONResponse", "dumps"]
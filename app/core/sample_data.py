@@ -0,0 +1,77 @@
+"""Sample catalog for demonstration and local development."""
+
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+from app.core.logging import get_logger
+from app.core.static_assets import asset_url
+from app.models import Category, Product
+
+logger = get_logger("sample_data")
+
+def seed_sample_data(engine: Engine) -> bool:
+    """Insert the sample catalog unless the database already has categories.
+    
+    Returns whether anything was inserted.
+    """
+    with Session(engine) as db:
+        # Check if data already exists
+        if db.execute(select(Category.id).limit(1)).first() is not None:
+            return False
+        
+        # Add categories
+        categories = [
+            Category(name="iPhone", description="Latest iPhone models", image_url=asset_url("images/iphone.jpg")),
+            Category(name="iPad", description="Powerful tablets for work and play", image_url=asset_url("images/ipad.jpg")),
+            Category(name="Mac", description="Desktop and laptop computers", image_url=asset_url("images/mac.jpg")),
+            Category(name="Apple Watch", description="Smartwatch for health and fitness", image_url=asset_url("images/watch.jpg")),
+            Category(name="AirPods", description="Wireless audio experience", image_url=asset_url("images/airpods.jpg")),
+        ]
+        
+        for category in categories:
+            db.add(category)
+        
+        try:
+            db.commit()
+        except IntegrityError:
+            # Another process seeded the database first
+            db.rollback()
+            return False
+        
+        # Add products
+        products = [
+            # iPhones
+            Product(name="iPhone 15 Pro", description="The ultimate iPhone with titanium design", price=999.00, category_id=1, stock_quantity=50),
+            Product(name="iPhone 15", description="A total powerhouse", price=799.00, category_id=1, stock_quantity=75),
+            Product(name="iPhone 14", description="As amazing as ever", price=699.00, category_id=1, stock_quantity=100),
+            
+            # iPads
+            Product(name="iPad Pro 12.9\"", description="The ultimate iPad experience", price=1099.00, category_id=2, stock_quantity=30),
+            Product(name="iPad Air", description="Serious performance. Serious fun.", price=599.00, category_id=2, stock_quantity=40),
+            Product(name="iPad", description="The colorful, all‑screen iPad", price=329.00, category_id=2, stock_quantity=60),
+            
+            # Macs
+            Product(name="MacBook Pro 16\"", description="Mind-blowing. Head-turning.", price=2499.00, category_id=3, stock_quantity=20),
+            Product(name="MacBook Air 15\"", description="Impressively big. Impossibly thin.", price=1299.00, category_id=3, stock_quantity=35),
+            Product(name="iMac 24\"", description="Makes a statement. Makes a splash.", price=1299.00, category_id=3, stock_quantity=25),
+            
+            # Apple Watch
+            Product(name="Apple Watch Series 9", description="Smarter. Brighter. Mightier.", price=399.00, category_id=4, stock_quantity=80),
+            Product(name="Apple Watch SE", description="A great deal to love.", price=249.00, category_id=4, stock_quantity=100),
+            Product(name="Apple Watch Ultra 2", description="Next-level adventure.", price=799.00, category_id=4, stock_quantity=40),
+            
+            # AirPods
+            Product(name="AirPods Pro (2nd gen)", description="Adaptive Audio. Now playing.", price=249.00, category_id=5, stock_quantity=120),
+            Product(name="AirPods (3rd gen)", description="All-new design. Breakthrough sound.", price=179.00, category_id=5, stock_quantity=150),
+            Product(name="AirPods Max", description="Computational audio. Listen, it's powerful.", price=549.00, category_id=5, stock_quantity=30),
+        ]
+        
+        for product in products:
+            db.add(product)
+        
+        db.commit()
+        logger.info("Sample data initialized successfully")
+        return True
+
+__all__ = ["seed_sample_data"]
@@ -1,24 +1,32 @@
 """Security utilities for authentication and authorization."""
 
+import hmac
 from datetime import datetime, timedelta
+from functools import lru_cache
 from typing import Optional
-from passlib.context import CryptContext
-from jose import JWTError, jwt
 from app.core.config import settings
 
-# Password hashing
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# passlib and jose are imported on first use; they are slow to import and
+# only the auth endpoints need them.
+
+@lru_cache(maxsize=None)
+def _pwd_context():
+    """Password hashing context."""
+    from passlib.context import CryptContext
+    return CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a password against its hash."""
-    return pwd_context.verify(plain_password, hashed_password)
+    return _pwd_context().verify(plain_password, hashed_password)
 
 def get_password_hash(password: str) -> str:
     """Generate password hash."""
-    return pwd_context.hash(password)
+    return _pwd_context().hash(password)
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     """Create JWT access token."""
+    from jose import jwt
+    
     to_encode = data.copy()
     if expires_delta:
         expire = datetime.utcnow() + expires_delta
@@ -31,10 +39,18 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
 
 def verify_token(token: str) -> Optional[dict]:
     """Verify JWT token and return payload."""
+    from jose import JWTError, jwt
+    
     try:
         payload = jwt.decode(token, settings.secret_key, algorithms=[settings.algorithm])
         return payload
     except JWTError:
         return None
 
-__all__ = ["verify_password", "get_password_hash", "create_access_token", "verify_token"]
\ No newline at end of file
+def verify_admin_token(token: Optional[str]) -> bool:
+    """Check a token against ADMIN_TOKEN; always False when no admin token is configured."""
+    if not settings.admin_token or not token:
+        return False
+    return hmac.compare_digest(token.encode("utf-8"), settings.admin_token.encode("utf-8"))
+
+__all__ = ["verify_password", "get_password_hash", "create_access_token", "verify_token", "verify_admin_token"]
\ No newline at end of file
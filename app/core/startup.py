@@ -0,0 +1,182 @@
+"""Explicit application startup lifecycle with timed phases.
+
+Importing the application only defines routes and pages. Work with side
+effects (creating tables, seeding sample data) runs once, from the ASGI
+lifespan, in named phases whose durations are logged. ``profile_startup``
+re-imports the app in a fresh interpreter and reports where the cold-start
+time goes.
+"""
+
+import json
+import os
+import re
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from contextlib import asynccontextmanager, contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, List, Tuple
+
+from app.core.logging import get_logger
+
+logger = get_logger("startup")
+
+PROFILE_MARKER = "STARTUP_PROFILE "
+IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)")
+
+# (phase, milliseconds) in the order the phases ran
+timings: List[Tuple[str, float]] = []
+_started = False
+_tables_created = False
+
+@contextmanager
+def phase(name: str) -> Iterator[None]:
+    """Time a startup phase and record it in ``timings``."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = (time.perf_counter() - start) * 1000
+        timings.append((name, elapsed))
+        logger.debug(f"Startup phase '{name}' took {elapsed:.1f} ms")
+
+def format_timings() -> str:
+    """One-line summary of the recorded phases."""
+    total = sum(ms for _, ms in timings)
+    return f"{total:.0f} ms (" + ", ".join(f"{name} {ms:.0f} ms" for name, ms in timings) + ")"
+
+def init_database() -> None:
+    """Create missing tables, once per process."""
+    global _tables_created
+    if _tables_created:
+        return
+    from app.core.database import create_tables
+    create_tables()
+    _tables_created = True
+
+def run_startup() -> None:
+    """Run the one-time startup work; later calls do nothing."""
+    global _started
+    if _started:
+        return
+    _started = True
+
+    from app.core import validate_environment
+    from app.core.config import settings
+
+    with phase("environment"):
+        for error in validate_environment():
+            logger.error(f"Environment validation error: {error}")
+
+    with phase("database"):
+        init_database()
+
+    if settings.seed_sample_data:
+        with phase("sample data"):
+            from app.core.database import engine
+            from app.core.sample_data import seed_sample_data
+            seed_sample_data(engine)
+
+    if settings.catalog_snapshot_enabled:
+        with phase("catalog snapshot"):
+            from app.core.database import engine
+            from app.services.catalog_snapshot import SnapshotRefresher, build_snapshot
+            build_snapshot(engine, settings.catalog_snapshot_path)
+            # Subscriptions are plain data, so forked workers inherit them
+            SnapshotRefresher(
+                engine, settings.catalog_snapshot_path, settings.catalog_snapshot_refresh_seconds
+            ).subscribe()
+
+    with phase("search indexes"):
+        from app.services.facet_index import facet_index
+        from app.services.suggest_index import suggest_index
+        facet_index.subscribe()
+        suggest_index.subscribe()  # built on the first lookup
+
+    with phase("popularity counters"):
+        from app.services.popularity import popularity_tracker
+        popularity_tracker.subscribe()  # starts the flush and top-seller refresh thread
+
+    logger.info(f"Startup finished in {format_timings()}")
+
+def run_shutdown() -> None:
+    """Release shared resources once the server has drained its connections."""
+    from app.core.database import engine
+    from app.core.tracing import span_exporter
+    from app.services.popularity import popularity_tracker
+    span_exporter.shutdown()
+    popularity_tracker.shutdown()
+    engine.dispose()
+    logger.info("Shutdown complete, database connections closed")
+
+@asynccontextmanager
+async def lifespan(app):
+    """ASGI lifespan that runs the startup phases before serving and cleans up after."""
+    from app.core.health import readiness_probe
+    run_startup()
+    readiness_probe.loop_lag.ensure_started()
+    yield
+    run_shutdown()
+
+def _parse_importtime(output: str) -> List[Tuple[str, int, int]]:
+    """Parse ``-X importtime`` output into (module, self_us, cumulative_us)."""
+    modules = []
+    for line in output.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match:
+            self_us, cumulative_us, _, module = match.groups()
+            modules.append((module, int(self_us), int(cumulative_us)))
+    return modules
+
+def profile_startup(module: str = "main", top: int = 25) -> int:
+    """Import ``module`` and run the startup phases in a fresh interpreter, then print a report.
+
+    The child runs with ``-X importtime`` so every module's own import time is
+    reported, grouped by top-level package, next to the startup phases.
+    Returns the child's exit code.
+    """
+    code = (
+        "import json, time\n"
+        "start = time.perf_counter()\n"
+        f"import {module}\n"
+        "imported = (time.perf_counter() - start) * 1000\n"
+        "from app.core import startup\n"
+        "startup.run_startup()\n"
+        f"print({PROFILE_MARKER!r} + json.dumps({{'import_ms': imported, 'phases': startup.timings}}))\n"
+    )
+    root = Path(__file__).resolve().parents[2]
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=root, capture_output=True, text=True, env=dict(os.environ)
+    )
+    if result.returncode != 0:
+        print(result.stderr[-4000:], file=sys.stderr)
+        return result.returncode
+
+    report = next(
+        json.loads(line[len(PROFILE_MARKER):])
+        for line in result.stdout.splitlines() if line.startswith(PROFILE_MARKER)
+    )
+    modules = _parse_importtime(result.stderr)
+    packages: Dict[str, int] = defaultdict(int)
+    for name, self_us, _ in modules:
+        packages[name.split(".")[0]] += self_us
+
+    print(f"Cold start of '{module}': import {report['import_ms']:.0f} ms, "
+          f"{len(modules)} modules imported")
+    print("\nStartup phases:")
+    for name, ms in report["phases"]:
+        print(f"  {name:<32} {ms:9.1f} ms")
+    print(f"\nImport time by package (self time, top {top}):")
+    for name, self_us in sorted(packages.items(), key=lambda item: -item[1])[:top]:
+        print(f"  {name:<32} {self_us / 1000:9.1f} ms")
+    print(f"\nSlowest modules (self time, top {top}):")
+    for name, self_us, cumulative_us in sorted(modules, key=lambda item: -item[1])[:top]:
+        print(f"  {name:<48} {self_us / 1000:9.1f} ms  (cumulative {cumulative_us / 1000:.1f} ms)")
+    return 0
+
+__all__ = [
+    "phase", "timings", "format_timings", "init_database",
+    "run_startup", "run_shutdown", "lifespan", "profile_startup"
+]
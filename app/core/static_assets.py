@@ -0,0 +1,159 @@
+"""Fingerprinted static assets with long-lived cache headers."""
+
+import gzip
+import hashlib
+import mimetypes
+import re
+from pathlib import Path
+from typing import Dict, Optional, Set
+
+from fastapi import FastAPI
+from starlette.datastructures import Headers
+from starlette.responses import Response
+from starlette.staticfiles import StaticFiles
+from starlette.types import Scope
+
+from app.core.logging import get_logger
+from app.core.utils import get_app_dir
+
+logger = get_logger("static")
+
+STATIC_URL_PREFIX = "/static"
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+TEXT_EXTENSIONS = {".css", ".js", ".mjs", ".map", ".json", ".svg", ".html", ".txt", ".xml"}
+SKIPPED_EXTENSIONS = {".py", ".pyc", ".gz", ".tmp"}
+MIN_COMPRESS_SIZE = 512
+HASH_LENGTH = 12
+
+# Uploads and thumbnails are already named after their SHA-256 and never change
+CONTENT_ADDRESSED_NAME = re.compile(r"^[0-9a-f]{64}(-\d+)?\.[a-z0-9]+$")
+# "css/site.1a2b3c4d5e6f.css" -> ("css/site", ".css")
+FINGERPRINTED_PATH = re.compile(rf"^(.+)\.[0-9a-f]{{{HASH_LENGTH}}}(\.[^./]+)$")
+
+class AssetManifest:
+    """Maps static files to content-hashed names and tracks pre-compressed copies."""
+
+    def __init__(self, directory: Path, url_prefix: str = STATIC_URL_PREFIX):
+        self.directory = Path(directory)
+        self.url_prefix = url_prefix.rstrip("/")
+        self.hashed: Dict[str, str] = {}     # "css/site.css" -> "css/site.1a2b3c4d5e6f.css"
+        self.originals: Dict[str, str] = {}  # "css/site.1a2b3c4d5e6f.css" -> "css/site.css"
+        self.compressed: Set[str] = set()    # original paths that have an up-to-date ".gz" sibling
+
+    def build(self) -> "AssetManifest":
+        """Hash every static file and pre-compress text assets."""
+        if not self.directory.is_dir():
+            logger.warning(f"Static directory not found: {self.directory}")
+            return self
+
+        for path in sorted(self.directory.rglob("*")):
+            if not path.is_file() or path.suffix in SKIPPED_EXTENSIONS or "__pycache__" in path.parts:
+                continue
+            relative = path.relative_to(self.directory).as_posix()
+            if CONTENT_ADDRESSED_NAME.match(path.name):
+                continue
+
+            digest = hashlib.sha256(path.read_bytes()).hexdigest()[:HASH_LENGTH]
+            hashed = path.with_name(f"{path.stem}.{digest}{path.suffix}").relative_to(self.directory).as_posix()
+            self.hashed[relative] = hashed
+            self.originals[hashed] = relative
+
+            if path.suffix in TEXT_EXTENSIONS and self._precompress(path):
+                self.compressed.add(relative)
+
+        logger.info(f"Static asset manifest built: {len(self.hashed)} files, {len(self.compressed)} pre-compressed")
+        return self
+
+    def _precompress(self, path: Path) -> bool:
+        """Write ``<file>.gz`` if it is missing or stale; keep it only when it saves space."""
+        target = path.with_name(path.name + ".gz")
+        stat = path.stat()
+        if stat.st_size < MIN_COMPRESS_SIZE:
+            return False
+        if target.exists() and target.stat().st_mtime >= stat.st_mtime:
+            return True
+        data = gzip.compress(path.read_bytes(), compresslevel=9, mtime=0)
+        if len(data) >= stat.st_size:
+            return False
+        try:
+            target.write_bytes(data)
+        except OSError as e:
+            # Read-only image: serve the original and let GZipMiddleware compress it per response
+            logger.warning(f"Cannot write {target.name}, compressing on the fly: {e}")
+            return False
+        return True
+
+    def url(self, path: str) -> str:
+        """Public URL of a static file, fingerprinted when it is in the manifest."""
+        path = path.lstrip("/")
+        return f"{self.url_prefix}/{self.hashed.get(path, path)}"
+
+    def original(self, requested: str) -> str:
+        """Source path of a requested file; hashes from an older build map to the current file."""
+        original = self.originals.get(requested)
+        if original is not None:
+            return original
+        match = FINGERPRINTED_PATH.match(requested)
+        if match and match.group(1) + match.group(2) in self.hashed:
+            return match.group(1) + match.group(2)
+        return requested
+
+    def is_immutable(self, requested: str) -> bool:
+        """Whether a requested path can never change its content."""
+        return requested in self.originals or bool(CONTENT_ADDRESSED_NAME.match(Path(requested).name))
+
+class FingerprintedStaticFiles(StaticFiles):
+    """Static files that resolve hashed names and serve pre-compressed text assets.
+
+    Current hashed and content-addressed URLs get an immutable one-year cache
+    policy; plain URLs keep the default ETag and Last-Modified validation.
+    """
+
+    def __init__(self, manifest: AssetManifest, **kwargs):
+        super().__init__(directory=str(manifest.directory), **kwargs)
+        self.manifest = manifest
+
+    async def get_response(self, path: str, scope: Scope) -> Response:
+        original = self.manifest.original(path)
+        accepts_gzip = "gzip" in Headers(scope=scope).get("accept-encoding", "")
+
+        if accepts_gzip and original in self.manifest.compressed:
+            response = await super().get_response(original + ".gz", scope)
+            if response.status_code == 200:
+                media_type = mimetypes.guess_type(original)[0] or "application/octet-stream"
+                if media_type.startswith("text/") or media_type.endswith(("javascript", "json", "xml")):
+                    media_type += "; charset=utf-8"
+                response.headers["Content-Type"] = media_type
+            response.headers["Content-Encoding"] = "gzip"
+        else:
+            response = await super().get_response(original, scope)
+
+        if original in self.manifest.compressed:
+            response.headers["Vary"] = "Accept-Encoding"
+        if response.status_code == 200 and self.manifest.is_immutable(path):
+            response.headers["Cache-Control"] = IMMUTABLE_CACHE_CONTROL
+        return response
+
+manifest: Optional[AssetManifest] = None
+
+def setup_static_assets(app: FastAPI, directory: Optional[Path] = None) -> AssetManifest:
+    """Build the asset manifest and mount the static files on the application."""
+    global manifest
+    manifest = AssetManifest(directory or get_app_dir() / "static").build()
+    app.mount(STATIC_URL_PREFIX, FingerprintedStaticFiles(manifest, check_dir=False), name="static")
+    return manifest
+
+def asset_url(path: str) -> str:
+    """Fingerprinted URL of a static file, e.g. ``asset_url("css/site.css")``."""
+    if manifest is None:
+        return f"{STATIC_URL_PREFIX}/{path.lstrip('/')}"
+    return manifest.url(path)
+
+def asset_source(path: str) -> str:
+    """Source path of a static file requested by a plain or fingerprinted name."""
+    path = path.lstrip("/")
+    if manifest is None:
+        return path
+    return manifest.original(path)
+
+__all__ = ["AssetManifest", "FingerprintedStaticFiles", "setup_static_assets", "asset_source", "asset_url"]
@@ -0,0 +1,74 @@
+"""Chunked NDJSON and CSV encoding for streaming exports."""
+
+import csv
+import io
+from datetime import date, datetime
+from typing import Any, Callable, Dict, Iterable, Iterator, List
+
+from sqlalchemy.orm import Session
+
+from app.core.database import engine
+from app.core.responses import dumps
+
+CHUNK_SIZE = 64 * 1024
+MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv; charset=utf-8"}
+
+def stream_rows(query: Callable[[Session], Iterable[Dict[str, Any]]]) -> Iterator[Dict[str, Any]]:
+    """Run a row query in a session that lives as long as the stream.
+
+    Request-scoped sessions from ``get_db`` are closed before a streaming
+    response body is sent, so exports open their own.
+    """
+    with Session(engine) as db:
+        yield from query(db)
+
+def ndjson_chunks(rows: Iterable[Dict[str, Any]], chunk_size: int = CHUNK_SIZE) -> Iterator[bytes]:
+    """Encode rows as newline-delimited JSON, yielding chunks of about ``chunk_size`` bytes."""
+    buffer: List[bytes] = []
+    size = 0
+    for row in rows:
+        line = dumps(row) + b"\n"
+        buffer.append(line)
+        size += len(line)
+        if size >= chunk_size:
+            yield b"".join(buffer)
+            buffer, size = [], 0
+    if buffer:
+        yield b"".join(buffer)
+
+def _flatten(row: Dict[str, Any]) -> Dict[str, Any]:
+    """Flatten nested dicts into ``parent.child`` columns."""
+    flat = {}
+    for key, value in row.items():
+        if isinstance(value, dict):
+            for child, child_value in value.items():
+                flat[f"{key}.{child}"] = child_value
+        else:
+            flat[key] = value
+    return flat
+
+def _csv_value(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+def csv_chunks(rows: Iterable[Dict[str, Any]], chunk_size: int = CHUNK_SIZE) -> Iterator[bytes]:
+    """Encode rows as CSV with a header taken from the first row."""
+    buffer = io.StringIO()
+    writer = None
+    for row in rows:
+        row = _flatten(row)
+        if writer is None:
+            writer = csv.DictWriter(buffer, fieldnames=list(row), extrasaction="ignore")
+            writer.writeheader()
+        writer.writerow({key: _csv_value(value) for key, value in row.items()})
+        if buffer.tell() >= chunk_size:
+            yield buffer.getvalue().encode("utf-8")
+            buffer.seek(0)
+            buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode("utf-8")
+
+ENCODERS = {"ndjson": ndjson_chunks, "csv": csv_chunks}
+
+__all__ = ["stream_rows", "ndjson_chunks", "csv_chunks", "ENCODERS", "MEDIA_TYPES", "CHUNK_SIZE"]
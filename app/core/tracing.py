@@ -0,0 +1,398 @@
+"""Lightweight request tracing.
+
+A trace starts when a sampled request enters ``TracingMiddleware`` or an
+outbound ``api_request`` is made, and the current span travels in a context
+variable. These become child spans:
+
+- ``@traced`` service methods;
+- every SQL statement on an instrumented engine;
+- nested ``span()`` blocks.
+
+Sampling is decided once at the head of a trace. ``TRACE_SAMPLE_RATE`` sets
+the share of new traces; an incoming W3C ``traceparent`` header carries the
+caller's decision and trace ID. Outbound API calls send that header too, so
+UI and API spans join the same trace.
+
+Finished spans go to a bounded queue. A background thread drains it in
+batches, either to a JSON Lines file or, as OTLP/HTTP JSON, to a collector.
+With a sample rate of 0 no middleware or engine hooks are installed and
+``@traced`` leaves classes untouched.
+"""
+
+import functools
+import inspect
+import json
+import queue
+import random
+import threading
+import time
+import urllib.request
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+from app.core.health import register_queue
+from app.core.logging import get_logger
+
+logger = get_logger("tracing")
+
+TRACEPARENT_HEADER = "traceparent"
+MAX_STATEMENT_LENGTH = 1000
+BATCH_SIZE = 512
+FLUSH_INTERVAL = 1.0  # seconds between exports of a partial batch
+OTLP_KINDS = {"internal": 1, "server": 2, "client": 3}
+
+class Span:
+    """One timed operation within a trace."""
+
+    __slots__ = ("trace_id", "span_id", "parent_id", "name", "kind", "start_ns", "end_ns", "attributes", "error")
+
+    def __init__(self, trace_id: str, parent_id: Optional[str], name: str, kind: str = "internal",
+                 attributes: Optional[Dict[str, Any]] = None):
+        self.trace_id = trace_id
+        self.span_id = f"{random.getrandbits(64):016x}"
+        self.parent_id = parent_id
+        self.name = name
+        self.kind = kind
+        self.start_ns = time.time_ns()
+        self.end_ns: Optional[int] = None
+        self.attributes = attributes or {}
+        self.error: Optional[str] = None
+
+    def set(self, key: str, value: Any) -> None:
+        """Set an attribute."""
+        self.attributes[key] = value
+
+    @property
+    def traceparent(self) -> str:
+        """W3C ``traceparent`` value that makes this span the parent of a remote call."""
+        return f"00-{self.trace_id}-{self.span_id}-01"
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "kind": self.kind,
+            "start_ns": self.start_ns,
+            "duration_ms": (self.end_ns - self.start_ns) / 1e6,
+            "attributes": self.attributes,
+            "error": self.error,
+        }
+
+class _NoopSpan:
+    """Stands in for a span when the current trace is not sampled."""
+
+    traceparent = None
+
+    def set(self, key: str, value: Any) -> None:
+        pass
+
+NOOP_SPAN = _NoopSpan()
+
+_current: ContextVar[Optional[Span]] = ContextVar("trace_span", default=None)
+
+def tracing_enabled() -> bool:
+    """Whether any traces are sampled."""
+    return settings.trace_sample_rate > 0
+
+def _new_trace_id() -> Optional[str]:
+    """A new trace ID if the head sampler keeps this trace, otherwise None."""
+    rate = settings.trace_sample_rate
+    if rate >= 1 or (rate > 0 and random.random() < rate):
+        return f"{random.getrandbits(128):032x}"
+    return None
+
+def current_span() -> Optional[Span]:
+    """The active span, or None outside a sampled trace."""
+    return _current.get()
+
+class SpanExporter:
+    """Exports finished spans from a background thread, dropping them when the queue is full."""
+
+    def __init__(self, max_queue: int = 10_000):
+        self._queue: "queue.Queue[Span]" = queue.Queue(maxsize=max_queue)
+        self.capacity = max_queue
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self.exported = 0
+        self.dropped = 0
+        self.failed = 0
+
+    def submit(self, span: Span) -> None:
+        """Queue a finished span for export."""
+        if self._thread is None:
+            self._start()
+        try:
+            self._queue.put_nowait(span)
+        except queue.Full:
+            self.dropped += 1
+
+    def queue_depth(self) -> int:
+        """Spans waiting to be exported."""
+        return self._queue.qsize()
+
+    def stats(self) -> Dict[str, int]:
+        return {"queued": self.queue_depth(), "exported": self.exported, "dropped": self.dropped, "failed": self.failed}
+
+    def _start(self) -> None:
+        with self._lock:
+            if self._thread is None:
+                self._stop.clear()
+                self._thread = threading.Thread(target=self._run, name="span-exporter", daemon=True)
+                self._thread.start()
+
+    def shutdown(self, timeout: float = 5.0) -> None:
+        """Export what is queued and stop the background thread."""
+        thread = self._thread
+        if thread is None:
+            return
+        self._stop.set()
+        thread.join(timeout)
+        self._thread = None
+
+    def _next_batch(self) -> List[Span]:
+        batch: List[Span] = []
+        deadline = time.monotonic() + FLUSH_INTERVAL
+        while len(batch) < BATCH_SIZE:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or (self._stop.is_set() and self._queue.empty()):
+                break
+            try:
+                batch.append(self._queue.get(timeout=min(remaining, 0.1)))
+            except queue.Empty:
+                continue
+        return batch
+
+    def _run(self) -> None:
+        while True:
+            batch = self._next_batch()
+            if batch:
+                try:
+                    self._export(batch)
+                    self.exported += len(batch)
+                except Exception as e:
+                    self.failed += len(batch)
+                    logger.warning(f"Failed to export {len(batch)} spans: {e}")
+            elif self._stop.is_set():
+                return
+
+    def _export(self, batch: List[Span]) -> None:
+        if settings.trace_exporter == "otlp":
+            body = json.dumps(_otlp_payload(batch)).encode("utf-8")
+            request = urllib.request.Request(
+                settings.trace_endpoint, data=body, headers={"Content-Type": "application/json"}, method="POST"
+            )
+            with urllib.request.urlopen(request, timeout=5) as response:
+                response.read()
+            return
+        path = Path(settings.trace_file)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "a", encoding="utf-8") as f:
+            f.writelines(json.dumps(span.to_dict(), default=str) + "\n" for span in batch)
+
+def _otlp_value(value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+def _otlp_payload(batch: List[Span]) -> Dict[str, Any]:
+    """Spans in the OTLP/HTTP JSON encoding."""
+    spans = []
+    for span in batch:
+        otlp_span = {
+            "traceId": span.trace_id,
+            "spanId": span.span_id,
+            "name": span.name,
+            "kind": OTLP_KINDS.get(span.kind, 1),
+            "startTimeUnixNano": str(span.start_ns),
+            "endTimeUnixNano": str(span.end_ns),
+            "attributes": [{"key": key, "value": _otlp_value(value)} for key, value in span.attributes.items()],
+            "status": {"code": 2, "message": span.error} if span.error else {"code": 1},
+        }
+        if span.parent_id:
+            otlp_span["parentSpanId"] = span.parent_id
+        spans.append(otlp_span)
+    return {"resourceSpans": [{
+        "resource": {"attributes": [{"key": "service.name", "value": {"stringValue": settings.app_name}}]},
+        "scopeSpans": [{"scope": {"name": "apple_store"}, "spans": spans}],
+    }]}
+
+span_exporter = SpanExporter()
+register_queue("trace_exporter", span_exporter.queue_depth, span_exporter.capacity)
+
+def _finish(span: Span) -> None:
+    span.end_ns = time.time_ns()
+    span_exporter.submit(span)
+
+@contextmanager
+def span(name: str, kind: str = "internal", attributes: Optional[Dict[str, Any]] = None,
+         root: bool = False) -> Iterator[Any]:
+    """Time a block as a child of the current span.
+
+    Outside a trace the block runs untraced, unless ``root`` is set; then it
+    starts a new trace, subject to head sampling. Yields the span, or a no-op
+    stand-in when nothing is recorded.
+    """
+    parent = _current.get()
+    if parent is not None:
+        trace_id, parent_id = parent.trace_id, parent.span_id
+    else:
+        trace_id = _new_trace_id() if root else None
+        parent_id = None
+        if trace_id is None:
+            yield NOOP_SPAN
+            return
+    current = Span(trace_id, parent_id, name, kind, attributes)
+    token = _current.set(current)
+    try:
+        yield current
+    except BaseException as e:
+        current.error = repr(e)
+        raise
+    finally:
+        _current.reset(token)
+        _finish(current)
+
+def traced(obj):
+    """Trace calls of a function, or of every public method of a service class.
+
+    Generator methods are left alone, since a span would only cover creating
+    the generator. Without tracing enabled the object is returned unchanged.
+    """
+    if not tracing_enabled():
+        return obj
+    if inspect.isclass(obj):
+        for name, attr in list(vars(obj).items()):
+            if not name.startswith("_") and inspect.isfunction(attr) and not inspect.isgeneratorfunction(attr):
+                setattr(obj, name, _wrap(f"{obj.__name__}.{name}", attr))
+        return obj
+    return _wrap(obj.__qualname__, obj)
+
+def _wrap(name: str, func):
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if _current.get() is None:
+            return func(*args, **kwargs)
+        with span(name):
+            return func(*args, **kwargs)
+    return wrapper
+
+# SQL statements
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    parent = _current.get()
+    if parent is None:
+        return
+    verb = statement.lstrip().split(None, 1)[0].upper() if statement.strip() else "SQL"
+    child = Span(parent.trace_id, parent.span_id, f"SQL {verb}", "client", {
+        "db.system": conn.dialect.name,
+        "db.statement": statement[:MAX_STATEMENT_LENGTH],
+        "db.executemany": executemany,
+    })
+    conn.info.setdefault("trace_spans", []).append(child)
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    spans = conn.info.get("trace_spans")
+    if spans:
+        child = spans.pop()
+        if cursor.rowcount is not None and cursor.rowcount >= 0:
+            child.set("db.rowcount", cursor.rowcount)
+        _finish(child)
+
+def _handle_error(context) -> None:
+    conn = context.connection
+    spans = conn.info.get("trace_spans") if conn is not None else None
+    if spans:
+        child = spans.pop()
+        child.error = repr(context.original_exception)
+        _finish(child)
+
+def install_tracing(engine: Engine) -> None:
+    """Record a span for every statement executed on ``engine``; safe to call more than once."""
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+        event.listen(engine, "handle_error", _handle_error)
+
+# HTTP requests
+
+def _parse_traceparent(value: str) -> Optional[Tuple[str, str, bool]]:
+    """(trace ID, parent span ID, sampled) from a W3C ``traceparent`` header."""
+    parts = value.strip().split("-")
+    if len(parts) != 4 or len(parts[1]) != 32 or len(parts[2]) != 16:
+        return None
+    try:
+        sampled = bool(int(parts[3], 16) & 1)
+    except ValueError:
+        return None
+    return parts[1], parts[2], sampled
+
+class TracingMiddleware:
+    """Starts a server span for every sampled HTTP request, covering all inner middleware."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        incoming = None
+        for name, value in scope.get("headers", []):
+            if name == b"traceparent":
+                incoming = _parse_traceparent(value.decode("latin-1"))
+                break
+        if incoming is not None:
+            trace_id, parent_id, sampled = incoming
+            if not sampled:
+                await self.app(scope, receive, send)
+                return
+        else:
+            trace_id, parent_id = _new_trace_id(), None
+            if trace_id is None:
+                await self.app(scope, receive, send)
+                return
+
+        method = scope["method"]
+        server = Span(trace_id, parent_id, f"{method} {scope['path']}", "server", {
+            "http.method": method,
+            "http.target": scope["path"],
+        })
+
+        async def send_with_status(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                server.set("http.status_code", message["status"])
+            await send(message)
+
+        token = _current.set(server)
+        try:
+            await self.app(scope, receive, send_with_status)
+        except BaseException as e:
+            server.error = repr(e)
+            raise
+        finally:
+            route = getattr(scope.get("route"), "path", None)
+            if route:
+                server.name = f"{method} {route}"
+                server.set("http.route", route)
+            _current.reset(token)
+            _finish(server)
+
+__all__ = [
+    "Span", "SpanExporter", "TracingMiddleware", "span", "traced", "current_span",
+    "install_tracing", "span_exporter", "tracing_enabled", "TRACEPARENT_HEADER"
+]
@@ -0,0 +1,26 @@
+"""Memory estimates for connected NiceGUI clients."""
+
+import json
+from typing import Any, Dict
+
+def estimate_client_memory(client) -> Dict[str, Any]:
+    """Estimate the server-side footprint of one client's element tree.
+
+    The estimate is the size of each element's props, classes and style as
+    they would be sent over the websocket; it ignores Python object overhead
+    but tracks the part that grows with page content.
+    """
+    element_count = 0
+    payload_bytes = 0
+    for element in list(client.elements.values()):
+        element_count += 1
+        payload_bytes += len(json.dumps(element._props, default=str))
+        payload_bytes += sum(len(c) for c in element._classes)
+        payload_bytes += sum(len(k) + len(str(v)) for k, v in element._style.items())
+    return {
+        "client_id": client.id,
+        "elements": element_count,
+        "payload_bytes": payload_bytes,
+    }
+
+__all__ = ["estimate_client_memory"]
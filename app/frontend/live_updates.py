@@ -0,0 +1,58 @@
+"""Push cart and stock changes from the event bus to connected clients."""
+
+import asyncio
+from nicegui import context
+from typing import Any, Callable, Dict
+from app.core.events import event_bus, CART_TOPIC, STOCK_TOPIC
+from app.core.logging import get_logger
+from app.frontend.state import ClientState
+
+logger = get_logger("ui.live")
+
+def apply_cart_event(state: ClientState, event: Dict[str, Any]) -> None:
+    """Apply a cart change to the local cart model."""
+    if event["user_id"] != state.user_id:
+        return
+    action = event["action"]
+    if action == "upsert":
+        state.cart.apply_item(event["item"])
+    elif action == "remove":
+        state.cart.remove_item(event["cart_item_id"])
+    elif action == "clear":
+        state.cart.clear()
+
+def apply_stock_event(state: ClientState, event: Dict[str, Any]) -> None:
+    """Apply stock changes to the product grid."""
+    if state.product_grid:
+        state.product_grid.apply_stock(event["stock"])
+
+def subscribe_client(state: ClientState) -> None:
+    """Subscribe the current client to cart and stock events.
+
+    Events are published from whichever thread committed the change, so they
+    are handed to the event loop and applied inside the client's context.
+    Subscriptions are dropped when the client disconnects.
+    """
+    client = context.get_client()
+    loop = asyncio.get_running_loop()
+
+    def deliver(handler: Callable[[ClientState, Dict[str, Any]], None]) -> Callable[[Dict[str, Any]], None]:
+        def apply(event: Dict[str, Any]) -> None:
+            with client:
+                handler(state, event)
+
+        return lambda event: loop.call_soon_threadsafe(apply, event)
+
+    unsubscribers = [
+        event_bus.subscribe(CART_TOPIC, deliver(apply_cart_event)),
+        event_bus.subscribe(STOCK_TOPIC, deliver(apply_stock_event)),
+    ]
+
+    def unsubscribe() -> None:
+        for unsubscriber in unsubscribers:
+            unsubscriber()
+        logger.debug(f"Client {client.id} unsubscribed from live updates")
+
+    client.on_disconnect(unsubscribe)
+
+__all__ = ["subscribe_client", "apply_cart_event", "apply_stock_event"]
@@ -0,0 +1,139 @@
+"""Virtualized, incrementally loaded product grid."""
+
+from nicegui import ui
+from typing import Any, Callable, Dict, List, Optional
+from app.core.logging import get_logger
+from app.frontend.diagnostics import estimate_client_memory
+from app.services.image_service import thumbnail_srcset, thumbnail_url
+
+logger = get_logger("ui.grid")
+
+COLUMNS = 4
+PAGE_SIZE = 24
+ROW_HEIGHT = 420  # px, used by QVirtualScroll to size the spacer before rows are measured
+THUMBNAIL_WIDTH = 320
+
+# Rendered in the browser for the rows QVirtualScroll currently shows, so the
+# server holds one element and plain row data instead of a card tree per product.
+ROW_TEMPLATE = '''
+<div class="row q-col-gutter-lg q-pa-md">
+  <div v-for="product in props.item" :key="product.id" class="col-3">
+    <q-card class="shadow-lg hover:shadow-xl transition-shadow cursor-pointer">
+      <q-img v-if="product.thumbnail" :src="product.thumbnail" :srcset="product.srcset"
+             sizes="(max-width: 1024px) 50vw, 25vw" loading="lazy" fit="cover" class="w-full h-48" />
+      <div v-else class="w-full h-48 bg-gray-200 flex items-center justify-center">
+        <q-icon name="image" size="3rem" class="text-gray-400" />
+      </div>
+      <q-card-section>
+        <div class="text-lg font-semibold mb-2">{{ product.name }}</div>
+        <div class="text-xl font-bold text-blue-600 mb-2">${{ product.price.toFixed(2) }}</div>
+        <div v-if="product.snippet" class="text-gray-600 text-sm mb-4">{{ product.snippet }}</div>
+        <div v-if="product.stock_quantity <= 0" class="text-red-600 text-sm mb-2">Out of stock</div>
+        <div v-else-if="product.stock_quantity < 10" class="text-orange-600 text-sm mb-2">Only {{ product.stock_quantity }} left</div>
+        <q-btn label="Add to Cart" icon="add_shopping_cart" color="primary" class="w-full"
+               @click="$parent.$emit('add', product.id)" />
+      </q-card-section>
+    </q-card>
+  </div>
+</div>
+'''
+
+def _compact(product: Dict[str, Any]) -> Dict[str, Any]:
+    """Keep only the fields a card renders from a ``ProductSummary`` payload."""
+    image_url = product.get('image_url')
+    return {
+        'id': product['id'],
+        'name': product['name'],
+        'price': product['price'],
+        'thumbnail': thumbnail_url(image_url, THUMBNAIL_WIDTH) if image_url else None,
+        'srcset': thumbnail_srcset(image_url) if image_url else None,
+        'stock_quantity': product.get('stock_quantity', 0),
+        'snippet': product.get('snippet'),
+    }
+
+class ProductGrid:
+    """Product grid that pages through the cursor API as the user scrolls.
+
+    Cards are rendered client-side by a ``q-virtual-scroll`` so only the rows
+    in view exist in the DOM, and further pages are requested only when the
+    last loaded row scrolls into view.
+    """
+
+    def __init__(
+        self,
+        fetch_page: Callable[..., List[Dict[str, Any]]],
+        on_add: Callable[[Dict[str, Any]], Any],
+        page_size: int = PAGE_SIZE
+    ):
+        self.fetch_page = fetch_page
+        self.on_add = on_add
+        self.page_size = page_size
+        self.category_id: Optional[int] = None
+        self.search: Optional[str] = None
+        self.cursor: Optional[int] = None
+        self.has_more: bool = True
+        self.loading: bool = False
+        self.products: Dict[int, Dict[str, Any]] = {}
+
+        self.empty_label = ui.label('No products available').classes('text-xl text-gray-500 self-center')
+        self.scroller = ui.element('q-virtual-scroll').classes('w-full').style('height: calc(100vh - 220px)')
+        self.scroller.props(f'virtual-scroll-item-size={ROW_HEIGHT}')
+        self.scroller._props['items'] = []
+        self.scroller.add_slot('default', ROW_TEMPLATE)
+        self.scroller.on('virtual-scroll', self._handle_scroll, ['to'], throttle=0.2)
+        self.scroller.on('add', self._handle_add)
+
+    def reset(self, category_id: Optional[int] = None, search: Optional[str] = None) -> None:
+        """Start over with new filters and load the first page."""
+        self.category_id = category_id
+        self.search = search or None
+        self.cursor = None
+        self.has_more = True
+        self.products = {}
+        self.load_more()
+        logger.debug(f"Client memory after grid reset: {estimate_client_memory(self.scroller.client)}")
+
+    def load_more(self) -> None:
+        """Fetch the next page from the API and append it to the grid."""
+        if self.loading or not self.has_more:
+            return
+        self.loading = True
+        try:
+            page = self.fetch_page(self.category_id, self.search, cursor=self.cursor, limit=self.page_size)
+            for product in page:
+                self.products[product['id']] = _compact(product)
+            if page:
+                self.cursor = page[-1]['id']
+            self.has_more = len(page) == self.page_size
+            self._render()
+        finally:
+            self.loading = False
+
+    def apply_stock(self, stock: Dict[int, int]) -> None:
+        """Update stock levels of loaded products and re-render if any changed."""
+        changed = False
+        for product_id, quantity in stock.items():
+            product = self.products.get(int(product_id))
+            if product and product['stock_quantity'] != quantity:
+                product['stock_quantity'] = quantity
+                changed = True
+        if changed:
+            self._render()
+
+    def _render(self) -> None:
+        products = list(self.products.values())
+        self.scroller._props['items'] = [products[i:i + COLUMNS] for i in range(0, len(products), COLUMNS)]
+        self.scroller.update()
+        self.empty_label.set_visibility(not products)
+
+    def _handle_scroll(self, e) -> None:
+        rows = len(self.scroller._props['items'])
+        if e.args.get('to', 0) >= rows - 1:
+            self.load_more()
+
+    def _handle_add(self, e) -> None:
+        product = self.products.get(e.args)
+        if product:
+            self.on_add(product)
+
+__all__ = ["ProductGrid"]
@@ -0,0 +1,73 @@
+"""Per-client UI state for the NiceGUI frontend."""
+
+from nicegui import app
+from typing import Any, Dict, Optional
+
+STATE_KEY = "apple_store_state"
+
+class CartModel:
+    """Local cart model kept in sync from API mutation responses.
+
+    Lines are keyed by product ID so that responses from ``/cart/add`` (which
+    carry the full line with its new quantity) can be applied idempotently.
+    """
+
+    def __init__(self):
+        self.items: Dict[int, Dict[str, Any]] = {}
+        self.total_items: int = 0
+        self.total_amount: float = 0.0
+
+    def load(self, cart_data: Dict[str, Any]) -> None:
+        """Replace the model with a full ``CartResponse`` payload."""
+        self.items = {item['product_id']: item for item in cart_data.get('items', [])}
+        self._recalculate()
+
+    def apply_item(self, item: Dict[str, Any]) -> None:
+        """Insert or replace a cart line from a ``CartItemResponse`` payload."""
+        if item.get('quantity', 0) > 0:
+            self.items[item['product_id']] = item
+        else:
+            self.items.pop(item['product_id'], None)
+        self._recalculate()
+
+    def remove_item(self, cart_item_id: int) -> None:
+        """Drop a cart line by its cart item ID."""
+        self.items = {pid: item for pid, item in self.items.items() if item['id'] != cart_item_id}
+        self._recalculate()
+
+    def clear(self) -> None:
+        """Empty the cart, e.g. after a successful checkout."""
+        self.items = {}
+        self._recalculate()
+
+    def _recalculate(self) -> None:
+        self.total_items = sum(item['quantity'] for item in self.items.values())
+        self.total_amount = sum(item['product']['price'] * item['quantity'] for item in self.items.values())
+
+class ClientState:
+    """UI state for a single browser connection."""
+
+    def __init__(self):
+        self.cart = CartModel()
+        self.cart_loaded: bool = False
+        self.current_user: Optional[Dict[str, Any]] = None
+        self.user_id: int = 1  # Simplified: the API uses the default user as well
+        self.selected_category: Optional[int] = None
+        self.search_query: str = ""
+        self.product_grid: Optional[Any] = None
+        self.category_buttons: Dict[Optional[int], Any] = {}  # category ID (None for all) -> sidebar button
+
+def get_state() -> ClientState:
+    """Get the state of the current client, creating it on first access.
+
+    The state lives in ``app.storage.client`` so it is scoped to one browser
+    tab and discarded when the connection is closed.
+    """
+    storage = app.storage.client
+    state = storage.get(STATE_KEY)
+    if state is None:
+        state = ClientState()
+        storage[STATE_KEY] = state
+    return state
+
+__all__ = ["CartModel", "ClientState", "get_state"]
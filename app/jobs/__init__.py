@@ -0,0 +1 @@
+"""Maintenance and batch jobs, run as ``python -m app.jobs.<name>``."""
@@ -0,0 +1,84 @@
+"""Backfill product snapshots on order items placed before they were recorded.
+
+Adds the snapshot columns to ``order_items`` if the table predates them, then
+copies the current product name, image and category name into every item
+that has no snapshot yet, in ID order and one batch per transaction. Safe to
+interrupt and re-run:
+
+    python -m app.jobs.backfill_order_snapshots --batch-size 1000
+"""
+
+import argparse
+import time
+from typing import Optional
+
+from sqlalchemy import bindparam, inspect, select, text, update
+from sqlalchemy.engine import Engine
+
+from app.core.database import engine as default_engine
+from app.core.logging import get_logger
+from app.models import Category, OrderItem, Product
+
+logger = get_logger("jobs.order_snapshots")
+
+SNAPSHOT_COLUMNS = ("product_name", "product_image_url", "category_name")
+
+def add_snapshot_columns(engine: Engine) -> int:
+    """Add any missing snapshot columns to ``order_items``; return how many were added."""
+    existing = {column["name"] for column in inspect(engine).get_columns(OrderItem.__tablename__)}
+    missing = [name for name in SNAPSHOT_COLUMNS if name not in existing]
+    with engine.begin() as conn:
+        for name in missing:
+            column_type = OrderItem.__table__.c[name].type.compile(dialect=engine.dialect)
+            conn.execute(text(f"ALTER TABLE {OrderItem.__tablename__} ADD COLUMN {name} {column_type}"))
+            logger.info(f"Added column order_items.{name}")
+    return len(missing)
+
+def backfill(engine: Engine, batch_size: int = 1000, limit: Optional[int] = None) -> int:
+    """Fill snapshots for items that have none; return the number of items updated."""
+    query = select(
+        OrderItem.id, Product.name, Product.image_url, Category.name
+    ).join(Product, Product.id == OrderItem.product_id).outerjoin(
+        Category, Category.id == Product.category_id
+    ).where(OrderItem.product_name.is_(None)).order_by(OrderItem.id)
+    
+    stmt = update(OrderItem.__table__).where(OrderItem.__table__.c.id == bindparam("item_id")).values(
+        product_name=bindparam("name"),
+        product_image_url=bindparam("image_url"),
+        category_name=bindparam("category")
+    )
+    
+    updated = 0
+    last_id = 0
+    started = time.perf_counter()
+    while limit is None or updated < limit:
+        size = batch_size if limit is None else min(batch_size, limit - updated)
+        with engine.begin() as conn:
+            rows = conn.execute(query.where(OrderItem.id > last_id).limit(size)).all()
+            if not rows:
+                break
+            conn.execute(stmt, [
+                {"item_id": item_id, "name": name, "image_url": image_url, "category": category}
+                for item_id, name, image_url, category in rows
+            ])
+        updated += len(rows)
+        last_id = rows[-1][0]
+        logger.info(f"Backfilled {updated} order items (up to id {last_id})")
+    
+    elapsed = time.perf_counter() - started
+    logger.info(f"Order snapshot backfill done: {updated} items in {elapsed:.1f}s")
+    return updated
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--limit", type=int, default=None, help="Stop after this many items")
+    args = parser.parse_args()
+    
+    add_snapshot_columns(default_engine)
+    backfill(default_engine, batch_size=args.batch_size, limit=args.limit)
+
+__all__ = ["add_snapshot_columns", "backfill"]
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""Helpers shared by the bulk loading jobs."""
+
+import time
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from sqlalchemy import Table, insert
+from sqlalchemy.engine import Connection
+
+from app.core.logging import get_logger
+
+logger = get_logger("jobs.bulk")
+
+def batched(rows: Iterable[Dict[str, Any]], size: int) -> Iterator[List[Dict[str, Any]]]:
+    """Split an iterable of rows into lists of at most ``size`` rows."""
+    iterator = iter(rows)
+    while True:
+        batch = list(islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+def insert_rows(conn: Connection, table: Table, rows: List[Dict[str, Any]], return_ids: bool = False) -> Optional[List[int]]:
+    """Insert a batch with a single executemany; optionally return the new IDs in row order."""
+    if not rows:
+        return [] if return_ids else None
+    if return_ids:
+        stmt = insert(table).returning(table.c.id, sort_by_parameter_order=True)
+        return list(conn.execute(stmt, rows).scalars())
+    conn.execute(insert(table), rows)
+    return None
+
+class Throughput:
+    """Counts rows per table and reports rows per second."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.rows: Dict[str, int] = {}
+        self.seconds: Dict[str, float] = {}
+
+    def record(self, table: str, rows: int, seconds: float) -> None:
+        """Add rows written to a table and the time spent writing them."""
+        self.rows[table] = self.rows.get(table, 0) + rows
+        self.seconds[table] = self.seconds.get(table, 0.0) + seconds
+
+    def report(self) -> None:
+        """Log rows and rows/sec per table and in total."""
+        elapsed = time.perf_counter() - self.started
+        for table, rows in self.rows.items():
+            seconds = self.seconds[table]
+            logger.info(f"  {table:<12} {rows:>10} rows in {seconds:7.2f}s  ({rows / seconds if seconds else 0:>10,.0f} rows/s)")
+        total = sum(self.rows.values())
+        logger.info(f"  {'total':<12} {total:>10} rows in {elapsed:7.2f}s  ({total / elapsed if elapsed else 0:>10,.0f} rows/s)")
+
+__all__ = ["batched", "insert_rows", "Throughput"]
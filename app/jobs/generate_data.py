@@ -0,0 +1,208 @@
+"""Generate a synthetic dataset for development and load testing.
+
+Creates users, categories and products, then carts and orders whose product
+and buyer choices follow Zipf distributions: a few best sellers and heavy
+buyers, and a long tail. Prices are log-normal, order dates are spread over
+the last year and order items carry their product snapshot. Everything is
+written with batched executemany inserts, and throughput is reported in
+rows per second:
+
+    python -m app.jobs.generate_data --users 10000 --products 50000 --orders 200000
+"""
+
+import argparse
+import math
+import random
+import time
+import uuid
+from datetime import datetime, timedelta
+from itertools import accumulate
+from typing import Any, Dict, Iterator, List
+
+from sqlalchemy.engine import Engine
+
+from app.core.config import settings
+from app.core.database import engine as default_engine
+from app.core.logging import get_logger
+from app.jobs.bulk import Throughput, batched, insert_rows
+from app.models import CartItem, Category, Order, OrderItem, Product, User
+
+logger = get_logger("jobs.generate_data")
+
+ADJECTIVES = ["Pro", "Air", "Max", "Mini", "Ultra", "SE", "Plus", "Lite", "Studio", "Sport"]
+NOUNS = ["Phone", "Pad", "Book", "Watch", "Buds", "Display", "Speaker", "Keyboard", "Charger", "Case"]
+STATUSES = ["confirmed", "shipped", "delivered", "pending"]
+STATUS_WEIGHTS = [20, 15, 60, 5]
+
+def zipf_weights(n: int, s: float) -> List[float]:
+    """Cumulative Zipf weights for ``random.choices`` over ``n`` ranked items."""
+    return list(accumulate(1.0 / (rank ** s) for rank in range(1, n + 1)))
+
+class DataGenerator:
+    """Writes a synthetic dataset in batches."""
+
+    def __init__(self, engine: Engine, seed: int = 42, batch_size: int = 5000, zipf_s: float = 1.1):
+        self.engine = engine
+        self.rng = random.Random(seed)
+        self.batch_size = batch_size
+        self.zipf_s = zipf_s
+        self.run = uuid.uuid4().hex[:8]  # keeps emails and names unique across runs
+        self.throughput = Throughput()
+
+    def _write(self, table: str, model, rows: Iterator[Dict[str, Any]], return_ids: bool = False) -> List[int]:
+        ids: List[int] = []
+        for batch in batched(rows, self.batch_size):
+            start = time.perf_counter()
+            with self.engine.begin() as conn:
+                new_ids = insert_rows(conn, model.__table__, batch, return_ids=return_ids)
+            self.throughput.record(table, len(batch), time.perf_counter() - start)
+            if return_ids:
+                ids.extend(new_ids)
+        logger.info(f"Generated {self.throughput.rows.get(table, 0)} {table}")
+        return ids
+
+    def _stock(self) -> int:
+        """10% sold out, 30% low stock, the rest well stocked."""
+        r = self.rng.random()
+        if r < 0.1:
+            return 0
+        return self.rng.randint(1, 20) if r < 0.4 else self.rng.randint(20, 1000)
+
+    def users(self, count: int, hashed_password: str) -> List[int]:
+        """Insert users sharing one password hash; hashing per user would dominate the run."""
+        rows = (
+            {"email": f"user{i}-{self.run}@example.com", "username": f"user{i}_{self.run}",
+             "hashed_password": hashed_password}
+            for i in range(count)
+        )
+        return self._write("users", User, rows, return_ids=True)
+
+    def categories(self, count: int) -> List[Dict[str, Any]]:
+        """Insert categories and return them as dicts with their IDs."""
+        rows = [
+            {"name": f"{NOUNS[i % len(NOUNS)]} {i} {self.run}", "description": f"Synthetic category {i}"}
+            for i in range(count)
+        ]
+        for row, category_id in zip(rows, self._write("categories", Category, iter(rows), return_ids=True)):
+            row["id"] = category_id
+        return rows
+
+    def products(self, count: int, categories: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Insert products and return their IDs, prices and snapshot fields in popularity order."""
+        rng = self.rng
+        products: List[Dict[str, Any]] = []
+
+        def rows() -> Iterator[Dict[str, Any]]:
+            for i in range(count):
+                category = rng.choice(categories)
+                row = {
+                    "name": f"{rng.choice(NOUNS)} {rng.choice(ADJECTIVES)} {i}",
+                    "description": f"Synthetic product {i} in {category['name']}.",
+                    "price": round(min(9999.0, math.exp(rng.gauss(5.5, 1.0))), 2),
+                    "image_url": None,
+                    "stock_quantity": self._stock(),
+                    "category_id": category["id"],
+                }
+                products.append({"price": row["price"], "name": row["name"], "category_name": category["name"]})
+                yield row
+
+        for product, product_id in zip(products, self._write("products", Product, rows(), return_ids=True)):
+            product["id"] = product_id
+        rng.shuffle(products)  # popularity rank is independent of insertion order
+        return products
+
+    def carts(self, user_ids: List[int], products: List[Dict[str, Any]], share: float) -> None:
+        """Give a share of users an open cart of 1-4 distinct, mostly popular products."""
+        rng = self.rng
+        weights = zipf_weights(len(products), self.zipf_s)
+
+        def rows() -> Iterator[Dict[str, Any]]:
+            for user_id in user_ids:
+                if rng.random() >= share:
+                    continue
+                picked = {p["id"] for p in rng.choices(products, cum_weights=weights, k=rng.randint(1, 4))}
+                for product_id in picked:
+                    yield {"user_id": user_id, "product_id": product_id, "quantity": rng.choice([1, 1, 1, 2, 3])}
+
+        self._write("cart_items", CartItem, rows())
+
+    def orders(self, count: int, user_ids: List[int], products: List[Dict[str, Any]]) -> None:
+        """Insert orders from Zipf-distributed buyers, each with 1-6 items, then their items."""
+        rng = self.rng
+        product_weights = zipf_weights(len(products), self.zipf_s)
+        user_weights = zipf_weights(len(user_ids), self.zipf_s)
+        now = datetime.utcnow()
+
+        for batch_start in range(0, count, self.batch_size):
+            size = min(self.batch_size, count - batch_start)
+            orders, lines = [], []
+            for buyer in rng.choices(user_ids, cum_weights=user_weights, k=size):
+                picked = rng.choices(products, cum_weights=product_weights, k=min(6, 1 + int(rng.expovariate(0.8))))
+                items = list({product["id"]: product for product in picked}.values())
+                quantities = [rng.choice([1, 1, 1, 1, 2, 3]) for _ in items]
+                created_at = now - timedelta(seconds=rng.randint(0, 365 * 24 * 3600))
+                orders.append({
+                    "user_id": buyer,
+                    "total_amount": round(sum(p["price"] * q for p, q in zip(items, quantities)), 2),
+                    "status": rng.choices(STATUSES, weights=STATUS_WEIGHTS)[0],
+                    "created_at": created_at,
+                    "updated_at": created_at,
+                })
+                lines.append((items, quantities))
+
+            start = time.perf_counter()
+            with self.engine.begin() as conn:
+                order_ids = insert_rows(conn, Order.__table__, orders, return_ids=True)
+            self.throughput.record("orders", len(orders), time.perf_counter() - start)
+
+            items = [
+                {
+                    "order_id": order_id, "product_id": product["id"], "quantity": quantity,
+                    "price": product["price"], "product_name": product["name"],
+                    "product_image_url": None, "category_name": product["category_name"],
+                }
+                for order_id, (picked, quantities) in zip(order_ids, lines)
+                for product, quantity in zip(picked, quantities)
+            ]
+            start = time.perf_counter()
+            with self.engine.begin() as conn:
+                insert_rows(conn, OrderItem.__table__, items)
+            self.throughput.record("order_items", len(items), time.perf_counter() - start)
+        logger.info(f"Generated {self.throughput.rows.get('orders', 0)} orders")
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--categories", type=int, default=10)
+    parser.add_argument("--products", type=int, default=5000)
+    parser.add_argument("--orders", type=int, default=10000)
+    parser.add_argument("--cart-share", type=float, default=0.3, help="Share of users with an open cart")
+    parser.add_argument("--zipf", type=float, default=1.1, help="Zipf exponent for product and buyer popularity")
+    parser.add_argument("--password", default="password", help="Password for every generated user")
+    parser.add_argument("--batch-size", type=int, default=5000)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    from app.core.security import get_password_hash
+    from app.core.startup import init_database
+    init_database()
+
+    generator = DataGenerator(default_engine, seed=args.seed, batch_size=args.batch_size, zipf_s=args.zipf)
+    user_ids = generator.users(args.users, get_password_hash(args.password))
+    categories = generator.categories(args.categories)
+    products = generator.products(args.products, categories)
+    if user_ids and products:
+        generator.carts(user_ids, products, args.cart_share)
+        generator.orders(args.orders, user_ids, products)
+
+    logger.info("Synthetic data generated:")
+    generator.throughput.report()
+
+    if settings.catalog_snapshot_enabled:
+        from app.services.catalog_snapshot import build_snapshot
+        build_snapshot(default_engine, settings.catalog_snapshot_path)
+
+__all__ = ["DataGenerator", "zipf_weights"]
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,215 @@
+"""Bulk-import categories and products from CSV or JSON Lines files.
+
+Files are parsed as a stream and written in batches with one executemany
+per batch, so memory stays flat for any file size. Products name their
+category by ``category`` (name) or ``category_id``; unknown category names
+are created on the fly.
+
+    python -m app.jobs.import_catalog products.csv --categories categories.jsonl
+
+Columns/keys: categories take ``name``, ``description``, ``image_url``;
+products take ``name``, ``price``, ``description``, ``image_url``,
+``stock_quantity`` and ``category`` or ``category_id``. Rows that cannot be
+parsed are skipped and counted.
+"""
+
+import argparse
+import csv
+import json
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, Optional
+
+from sqlalchemy import select
+from sqlalchemy.engine import Connection, Engine
+
+from app.core.config import settings
+from app.core.database import engine as default_engine
+from app.core.logging import get_logger
+from app.jobs.bulk import Throughput, batched, insert_rows
+from app.models import Category, Product
+
+logger = get_logger("jobs.import_catalog")
+
+MAX_REPORTED_ERRORS = 10
+
+def read_records(
+    path: Path,
+    fmt: Optional[str] = None,
+    on_error: Optional[Callable[[Any, Exception], None]] = None
+) -> Iterator[Dict[str, Any]]:
+    """Stream records from a CSV or JSON Lines file.
+
+    JSON lines that do not decode are passed to ``on_error`` and skipped;
+    without a callback the decoding error is raised.
+    """
+    fmt = fmt or ("jsonl" if path.suffix in (".jsonl", ".ndjson", ".json") else "csv")
+    with open(path, newline="", encoding="utf-8") as f:
+        if fmt == "csv":
+            yield from csv.DictReader(f)
+        else:
+            for line in f:
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                except ValueError as e:
+                    if on_error is None:
+                        raise
+                    on_error(line.rstrip("\n"), e)
+                    continue
+                yield record
+
+def _text(value: Any) -> Optional[str]:
+    if value is None:
+        return None
+    value = str(value).strip()
+    return value or None
+
+def _require_object(record: Any) -> None:
+    if not isinstance(record, dict):
+        raise TypeError(f"expected an object, got {type(record).__name__}")
+
+class CatalogImporter:
+    """Streams category and product records into the database."""
+
+    def __init__(self, engine: Engine, batch_size: int = 1000):
+        self.engine = engine
+        self.batch_size = batch_size
+        self.throughput = Throughput()
+        self.skipped = 0
+        self.category_ids: Dict[str, int] = {}
+        self.known_category_ids = set()
+
+    def _load_categories(self, conn: Connection) -> None:
+        for category_id, name in conn.execute(select(Category.id, Category.name)):
+            self.category_ids[name] = category_id
+            self.known_category_ids.add(category_id)
+
+    def skip(self, record: Any, error: Exception) -> None:
+        """Count a record that cannot be imported and log the first few."""
+        self.skipped += 1
+        if self.skipped <= MAX_REPORTED_ERRORS:
+            logger.warning(f"Skipping record {record!r}: {error}")
+
+    def _category_row(self, record: Dict[str, Any]) -> Dict[str, Any]:
+        _require_object(record)
+        name = _text(record.get("name"))
+        if not name:
+            raise ValueError("missing name")
+        return {
+            "name": name,
+            "description": _text(record.get("description")),
+            "image_url": _text(record.get("image_url")),
+        }
+
+    def _product_row(self, conn: Connection, record: Dict[str, Any]) -> Dict[str, Any]:
+        _require_object(record)
+        name = _text(record.get("name"))
+        if not name:
+            raise ValueError("missing name")
+        category_id = record.get("category_id")
+        if category_id not in (None, ""):
+            category_id = int(category_id)
+            if category_id not in self.known_category_ids:
+                raise ValueError(f"unknown category_id {category_id}")
+        else:
+            category_name = _text(record.get("category"))
+            if not category_name:
+                raise ValueError("missing category")
+            category_id = self.category_ids.get(category_name)
+            if category_id is None:
+                category_id = self._create_category(conn, {"name": category_name})
+        stock = record.get("stock_quantity")
+        return {
+            "name": name,
+            "description": _text(record.get("description")),
+            "price": float(record["price"]),
+            "image_url": _text(record.get("image_url")),
+            "stock_quantity": int(stock) if stock not in (None, "") else 0,
+            "category_id": category_id,
+        }
+
+    def _create_category(self, conn: Connection, row: Dict[str, Any]) -> int:
+        category_id = insert_rows(conn, Category.__table__, [row], return_ids=True)[0]
+        self.category_ids[row["name"]] = category_id
+        self.known_category_ids.add(category_id)
+        self.throughput.record("categories", 1, 0.0)
+        return category_id
+
+    def import_categories(self, records: Iterator[Dict[str, Any]]) -> int:
+        """Insert categories whose names do not exist yet; return how many were added."""
+        added = 0
+        with self.engine.begin() as conn:
+            self._load_categories(conn)
+        for batch in batched(records, self.batch_size):
+            rows = []
+            for record in batch:
+                try:
+                    row = self._category_row(record)
+                except (KeyError, TypeError, ValueError) as e:
+                    self.skip(record, e)
+                    continue
+                if row["name"] not in self.category_ids:
+                    self.category_ids[row["name"]] = -1  # reserved until the batch is written
+                    rows.append(row)
+            start = time.perf_counter()
+            with self.engine.begin() as conn:
+                ids = insert_rows(conn, Category.__table__, rows, return_ids=True)
+            self.throughput.record("categories", len(rows), time.perf_counter() - start)
+            for row, category_id in zip(rows, ids):
+                self.category_ids[row["name"]] = category_id
+                self.known_category_ids.add(category_id)
+            added += len(rows)
+        return added
+
+    def import_products(self, records: Iterator[Dict[str, Any]]) -> int:
+        """Insert products batch by batch; return how many were added."""
+        added = 0
+        with self.engine.begin() as conn:
+            self._load_categories(conn)
+        for batch in batched(records, self.batch_size):
+            start = time.perf_counter()
+            with self.engine.begin() as conn:
+                rows = []
+                for record in batch:
+                    try:
+                        rows.append(self._product_row(conn, record))
+                    except (KeyError, TypeError, ValueError) as e:
+                        self.skip(record, e)
+                insert_rows(conn, Product.__table__, rows)
+            self.throughput.record("products", len(rows), time.perf_counter() - start)
+            added += len(rows)
+            logger.info(f"Imported {added} products")
+        return added
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("products", type=Path, nargs="?", help="Products file (.csv or .jsonl)")
+    parser.add_argument("--categories", type=Path, help="Categories file (.csv or .jsonl)")
+    parser.add_argument("--format", choices=["csv", "jsonl"], help="Override format detection by extension")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args()
+    if not args.products and not args.categories:
+        parser.error("nothing to import")
+
+    from app.core.startup import init_database
+    init_database()
+
+    importer = CatalogImporter(default_engine, batch_size=args.batch_size)
+    if args.categories:
+        importer.import_categories(read_records(args.categories, args.format, on_error=importer.skip))
+    if args.products:
+        importer.import_products(read_records(args.products, args.format, on_error=importer.skip))
+
+    logger.info(f"Import finished, {importer.skipped} records skipped")
+    importer.throughput.report()
+
+    if settings.catalog_snapshot_enabled:
+        from app.services.catalog_snapshot import build_snapshot
+        build_snapshot(default_engine, settings.catalog_snapshot_path)
+
+__all__ = ["CatalogImporter", "read_records"]
+
+if __name__ == "__main__":
+    main()
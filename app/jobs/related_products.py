@@ -0,0 +1,157 @@
+"""Build "frequently bought together" recommendations from order history.
+
+Counts how often two products appear in the same order and keeps the top
+``k`` co-purchased products for each product. The counts are cumulative and
+saved with the ID of the last order they include, so each run only reads
+the orders placed since the previous one:
+
+    python -m app.jobs.related_products --top-k 10 --chunk-orders 5000
+
+``order_items`` is read in ranges of order IDs. Pairs within each chunk are
+expanded and counted with NumPy array operations, then merged into the
+stored counts. Two files are written to ``RELATED_PRODUCTS_DIRECTORY``, each
+to a temporary file first and then moved into place:
+
+- ``pairs.npz``: pair keys, counts and the order watermark;
+- ``related.npy``: an ``(max product id + 1, 2, k)`` array of neighbour IDs
+  and counts. The API memory-maps it and reads one row per lookup.
+"""
+
+import argparse
+import os
+import time
+from pathlib import Path
+from typing import Tuple
+
+import numpy as np
+from sqlalchemy import func, select
+from sqlalchemy.engine import Engine
+
+from app.core.config import settings
+from app.core.database import engine as default_engine
+from app.core.logging import get_logger
+from app.models import OrderItem, Product
+
+logger = get_logger("jobs.related_products")
+
+PAIRS_FILE = "pairs.npz"
+RELATED_FILE = "related.npy"
+MAX_ITEMS_PER_ORDER = 100  # larger orders are bulk purchases and would add size^2 pairs
+
+def load_pairs(directory: Path) -> Tuple[np.ndarray, np.ndarray, int]:
+    """Stored pair keys, their counts and the last order ID they include."""
+    path = directory / PAIRS_FILE
+    if not path.exists():
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64), 0
+    with np.load(path) as data:
+        return data["keys"], data["counts"], int(data["watermark"])
+
+def order_pairs(order_ids: np.ndarray, product_ids: np.ndarray) -> np.ndarray:
+    """Pair keys ``low << 32 | high`` for every two distinct products sharing an order."""
+    # One entry per (order, product), sorted by order and then product
+    entries = np.unique((order_ids.astype(np.int64) << 32) | product_ids.astype(np.int64))
+    orders, products = entries >> 32, entries & 0xFFFFFFFF
+    _, sizes = np.unique(orders, return_counts=True)
+    keep = np.repeat(sizes <= MAX_ITEMS_PER_ORDER, sizes)
+    orders, products = orders[keep], products[keep]
+    if len(products) < 2:
+        return np.empty(0, dtype=np.int64)
+    _, starts, sizes = np.unique(orders, return_index=True, return_counts=True)
+
+    # Pair each entry with every later entry of the same order
+    positions = np.arange(len(products))
+    later = np.repeat(starts + sizes, sizes) - positions - 1
+    left = np.repeat(positions, later)
+    offsets = np.arange(len(left)) - np.repeat(np.cumsum(later) - later, later)
+    right = left + 1 + offsets
+    return (products[left] << 32) | products[right]
+
+def merge_counts(keys: np.ndarray, counts: np.ndarray, new_keys: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Add one occurrence per new key to the sorted cumulative counts."""
+    if len(new_keys) == 0:
+        return keys, counts
+    new_keys, new_counts = np.unique(new_keys, return_counts=True)
+    merged, inverse = np.unique(np.concatenate([keys, new_keys]), return_inverse=True)
+    totals = np.bincount(inverse, weights=np.concatenate([counts, new_counts]), minlength=len(merged))
+    return merged, totals.astype(np.int64)
+
+def top_neighbours(keys: np.ndarray, counts: np.ndarray, size: int, k: int) -> np.ndarray:
+    """A ``(size, 2, k)`` array of each product's top ``k`` neighbour IDs and counts; 0 pads."""
+    low, high = keys >> 32, keys & 0xFFFFFFFF
+    source = np.concatenate([low, high])
+    target = np.concatenate([high, low])
+    weight = np.concatenate([counts, counts])
+    order = np.lexsort((target, -weight, source))  # by source, then highest count, then lowest ID
+    source, target, weight = source[order], target[order], weight[order]
+    _, starts, sizes = np.unique(source, return_index=True, return_counts=True)
+    rank = np.arange(len(source)) - np.repeat(starts, sizes)
+    keep = rank < k
+
+    related = np.zeros((size, 2, k), dtype=np.int32)
+    related[source[keep], 0, rank[keep]] = target[keep]
+    related[source[keep], 1, rank[keep]] = np.minimum(weight[keep], np.iinfo(np.int32).max)
+    return related
+
+def _replace(path: Path, write) -> None:
+    temporary = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    with open(temporary, "wb") as f:
+        write(f)
+    os.replace(temporary, path)
+
+def run(
+    engine: Engine,
+    directory: Path,
+    top_k: int = 10,
+    chunk_orders: int = 5000,
+    full: bool = False
+) -> int:
+    """Count pairs in orders placed since the last run and rewrite the neighbour file; return order IDs read."""
+    directory.mkdir(parents=True, exist_ok=True)
+    started = time.perf_counter()
+    if full:
+        keys, counts, watermark = np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64), 0
+    else:
+        keys, counts, watermark = load_pairs(directory)
+
+    with engine.connect() as conn:
+        last_order = conn.execute(select(func.max(OrderItem.order_id))).scalar() or 0
+        max_product = conn.execute(select(func.max(Product.id))).scalar() or 0
+        start = watermark
+        while start < last_order:
+            end = min(start + chunk_orders, last_order)
+            rows = conn.execute(
+                select(OrderItem.order_id, OrderItem.product_id)
+                .where(OrderItem.order_id > start, OrderItem.order_id <= end)
+            ).all()
+            if rows:
+                items = np.array(rows, dtype=np.int64)
+                keys, counts = merge_counts(keys, counts, order_pairs(items[:, 0], items[:, 1]))
+            logger.info(f"Counted orders up to {end} ({len(keys)} product pairs)")
+            start = end
+
+    size = max(max_product, int((keys & 0xFFFFFFFF).max()) if len(keys) else 0) + 1
+    related = top_neighbours(keys, counts, size, top_k)
+    _replace(directory / RELATED_FILE, lambda f: np.save(f, related))
+    # Saved last: a crash before this point only repeats the counting next time
+    _replace(directory / PAIRS_FILE, lambda f: np.savez(f, keys=keys, counts=counts, watermark=last_order))
+
+    logger.info(
+        f"Related products: {last_order - watermark} order IDs read, {len(keys)} pairs, "
+        f"{int((related[:, 0, 0] > 0).sum())} products with neighbours in {time.perf_counter() - started:.1f}s"
+    )
+    return last_order - watermark
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--top-k", type=int, default=10, help="Neighbours kept per product")
+    parser.add_argument("--chunk-orders", type=int, default=5000, help="Order IDs read per query")
+    parser.add_argument("--directory", type=Path, default=Path(settings.related_products_directory))
+    parser.add_argument("--full", action="store_true", help="Discard stored counts and rescan all orders")
+    args = parser.parse_args()
+
+    run(default_engine, args.directory, top_k=args.top_k, chunk_orders=args.chunk_orders, full=args.full)
+
+__all__ = ["load_pairs", "merge_counts", "order_pairs", "run", "top_neighbours"]
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""Print the slowest traces from a JSON Lines trace file as span trees.
+
+Each trace is shown with its spans nested under their parents, their
+durations, and the share of the root span's time spent in SQL:
+
+    python -m app.jobs.trace_report logs/traces.jsonl --slowest 5 --match "POST /api/orders"
+"""
+
+import argparse
+import json
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Dict, List
+
+def load_traces(path: Path) -> Dict[str, List[Dict[str, Any]]]:
+    """Spans grouped by trace ID."""
+    traces: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                span = json.loads(line)
+                traces[span["trace_id"]].append(span)
+    return traces
+
+def print_trace(spans: List[Dict[str, Any]]) -> None:
+    ids = {span["span_id"] for span in spans}
+    children: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+    for span in spans:
+        children[span["parent_id"] if span["parent_id"] in ids else None].append(span)
+    start = min(span["start_ns"] for span in spans)
+
+    def show(span: Dict[str, Any], depth: int) -> None:
+        offset = (span["start_ns"] - start) / 1e6
+        error = "  ERROR" if span.get("error") else ""
+        print(f"  {offset:8.2f} ms {'  ' * depth}{span['name']}  {span['duration_ms']:.2f} ms{error}")
+        for child in sorted(children[span["span_id"]], key=lambda s: s["start_ns"]):
+            show(child, depth + 1)
+
+    for root in sorted(children[None], key=lambda s: s["start_ns"]):
+        show(root, 0)
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("file", type=Path, nargs="?", default=Path("logs/traces.jsonl"))
+    parser.add_argument("--slowest", type=int, default=5, help="Number of traces to print")
+    parser.add_argument("--match", help="Only traces whose root span name contains this text")
+    args = parser.parse_args()
+
+    summaries = []
+    for trace_id, spans in load_traces(args.file).items():
+        ids = {span["span_id"] for span in spans}
+        roots = [span for span in spans if span["parent_id"] not in ids]
+        root = max(roots, key=lambda span: span["duration_ms"])
+        if args.match and args.match not in root["name"]:
+            continue
+        sql = sum(span["duration_ms"] for span in spans if span["name"].startswith("SQL "))
+        summaries.append((root["duration_ms"], sql, trace_id, root["name"], spans))
+
+    summaries.sort(reverse=True)
+    print(f"{len(summaries)} traces")
+    for duration, sql, trace_id, name, spans in summaries[:args.slowest]:
+        share = sql / duration * 100 if duration else 0.0
+        print(f"\n{name}  {duration:.2f} ms, {len(spans)} spans, SQL {sql:.2f} ms ({share:.0f}%)  trace {trace_id}")
+        print_trace(spans)
+
+__all__ = ["load_traces", "print_trace"]
+
+if __name__ == "__main__":
+    main()
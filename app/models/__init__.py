@@ -2,7 +2,8 @@
 
 from app.models.user import User
 from app.models.product import Product, Category
+from app.models.product_stats import ProductStats
 from app.models.cart import CartItem
 from app.models.order import Order, OrderItem
 
-__all__ = ["User", "Product", "Category", "CartItem", "Order", "OrderItem"]
\ No newline at end of file
+__all__ = ["User", "Product", "Category", "ProductStats", "CartItem", "Order", "OrderItem"]
\ No newline at end of file
@@ -3,7 +3,7 @@
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy import String, Integer, Float, ForeignKey, DateTime, func
 from datetime import datetime
-from typing import List
+from typing import Any, Dict, List, Optional
 from app.core.database import Base
 
 class Order(Base):
@@ -11,7 +11,7 @@ class Order(Base):
     __tablename__ = "orders"
     
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
-    user_id: Mapped[int] = mapped_column(Integer, ForeignKey("users.id"))
+    user_id: Mapped[int] = mapped_column(Integer, ForeignKey("users.id"), index=True)
     total_amount: Mapped[float] = mapped_column(Float)
     status: Mapped[str] = mapped_column(String(50), default="pending")  # pending, confirmed, shipped, delivered
     
@@ -30,17 +30,39 @@ class OrderItem(Base):
     __tablename__ = "order_items"
     
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
-    order_id: Mapped[int] = mapped_column(Integer, ForeignKey("orders.id"))
+    order_id: Mapped[int] = mapped_column(Integer, ForeignKey("orders.id"), index=True)
     product_id: Mapped[int] = mapped_column(Integer, ForeignKey("products.id"))
     quantity: Mapped[int] = mapped_column(Integer)
     price: Mapped[float] = mapped_column(Float)  # Price at time of purchase
     
+    # Product snapshot at time of purchase, so history never joins the live catalog
+    product_name: Mapped[Optional[str]] = mapped_column(String(200), nullable=True)
+    product_image_url: Mapped[Optional[str]] = mapped_column(String(500), nullable=True)
+    category_name: Mapped[Optional[str]] = mapped_column(String(100), nullable=True)
+    
     created_at: Mapped[datetime] = mapped_column(DateTime, default=func.now())
     
     # Relationships
     order: Mapped[Order] = relationship("Order", back_populates="order_items")
     product: Mapped["Product"] = relationship("Product", back_populates="order_items")
     
+    @property
+    def product_snapshot(self) -> Dict[str, Any]:
+        """Product as it was at checkout; falls back to the live product for rows not yet backfilled."""
+        if self.product_name is None and self.product is not None:
+            return {
+                "id": self.product_id,
+                "name": self.product.name,
+                "image_url": self.product.image_url,
+                "category_name": self.product.category.name if self.product.category else None,
+            }
+        return {
+            "id": self.product_id,
+            "name": self.product_name,
+            "image_url": self.product_image_url,
+            "category_name": self.category_name,
+        }
+    
     def __repr__(self) -> str:
         return f"<OrderItem(id={self.id}, order_id={self.order_id}, product_id={self.product_id}, quantity={self.quantity})>"
 
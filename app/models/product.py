@@ -1,7 +1,7 @@
 """Product and Category models for the store catalog."""
 
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from sqlalchemy import String, Text, Integer, Float, ForeignKey, DateTime, func
+from sqlalchemy import String, Text, Integer, Float, ForeignKey, DateTime, Index, func
 from datetime import datetime
 from typing import List, Optional
 from app.core.database import Base
@@ -26,16 +26,21 @@ class Category(Base):
 class Product(Base):
     """Product model for store items."""
     __tablename__ = "products"
+    __table_args__ = (
+        # Category pages sorted by price or newest first; id makes the order total
+        Index("ix_products_category_price", "category_id", "price", "id"),
+        Index("ix_products_category_created", "category_id", "created_at", "id"),
+    )
     
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     name: Mapped[str] = mapped_column(String(200), index=True)
     description: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
-    price: Mapped[float] = mapped_column(Float)
+    price: Mapped[float] = mapped_column(Float, index=True)
     image_url: Mapped[Optional[str]] = mapped_column(String(500), nullable=True)
     stock_quantity: Mapped[int] = mapped_column(Integer, default=0)
-    category_id: Mapped[int] = mapped_column(Integer, ForeignKey("categories.id"))
+    category_id: Mapped[int] = mapped_column(Integer, ForeignKey("categories.id"), index=True)
     
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=func.now())
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=func.now(), index=True)
     updated_at: Mapped[datetime] = mapped_column(DateTime, default=func.now(), onupdate=func.now())
     
     # Relationships
@@ -0,0 +1,24 @@
+"""Per-product popularity counters."""
+
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy import Integer, ForeignKey, DateTime, Index, func
+from datetime import datetime
+from app.core.database import Base
+
+class ProductStats(Base):
+    """Units sold and add-to-cart count per product, kept up to date in batches."""
+    __tablename__ = "product_stats"
+    __table_args__ = (
+        Index("ix_product_stats_sales", "sales_count", "product_id"),
+    )
+    
+    product_id: Mapped[int] = mapped_column(Integer, ForeignKey("products.id"), primary_key=True)
+    sales_count: Mapped[int] = mapped_column(Integer, default=0)
+    cart_add_count: Mapped[int] = mapped_column(Integer, default=0)
+    
+    updated_at: Mapped[datetime] = mapped_column(DateTime, default=func.now(), onupdate=func.now())
+    
+    def __repr__(self) -> str:
+        return f"<ProductStats(product_id={self.product_id}, sales={self.sales_count}, cart_adds={self.cart_add_count})>"
+
+__all__ = ["ProductStats"]
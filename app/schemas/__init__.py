@@ -1,13 +1,13 @@
 """Pydantic schemas for API request/response validation."""
 
 from app.schemas.user import UserCreate, UserResponse, UserLogin
-from app.schemas.product import ProductResponse, CategoryResponse
+from app.schemas.product import ProductResponse, ProductSummary, CategoryResponse
 from app.schemas.cart import CartItemCreate, CartItemResponse, CartResponse
-from app.schemas.order import OrderCreate, OrderResponse
+from app.schemas.order import OrderCreate, OrderResponse, OrderProductSummary
 
 __all__ = [
     "UserCreate", "UserResponse", "UserLogin",
-    "ProductResponse", "CategoryResponse", 
+    "ProductResponse", "ProductSummary", "CategoryResponse",
     "CartItemCreate", "CartItemResponse", "CartResponse",
-    "OrderCreate", "OrderResponse"
+    "OrderCreate", "OrderResponse", "OrderProductSummary"
 ]
\ No newline at end of file
@@ -1,9 +1,17 @@
 """Order schemas for API validation."""
 
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, Field
 from datetime import datetime
-from typing import List
-from app.schemas.product import ProductResponse
+from typing import List, Optional
+
+class OrderProductSummary(BaseModel):
+    """Product as it was when the order was placed."""
+    model_config = ConfigDict(from_attributes=True)
+    
+    id: int
+    name: Optional[str] = None
+    image_url: Optional[str] = None
+    category_name: Optional[str] = None
 
 class OrderItemResponse(BaseModel):
     """Schema for order item responses."""
@@ -13,7 +21,7 @@ class OrderItemResponse(BaseModel):
     product_id: int
     quantity: int
     price: float
-    product: ProductResponse
+    product: OrderProductSummary = Field(validation_alias="product_snapshot")
 
 class OrderCreate(BaseModel):
     """Schema for creating orders."""
@@ -29,4 +37,4 @@ class OrderResponse(BaseModel):
     created_at: datetime
     order_items: List[OrderItemResponse]
 
-__all__ = ["OrderCreate", "OrderResponse"]
\ No newline at end of file
+__all__ = ["OrderCreate", "OrderResponse", "OrderItemResponse", "OrderProductSummary"]
\ No newline at end of file
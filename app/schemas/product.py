@@ -27,4 +27,15 @@ class ProductResponse(BaseModel):
     category: Optional[CategoryResponse] = None
     created_at: datetime
 
-__all__ = ["ProductResponse", "CategoryResponse"]
\ No newline at end of file
+class ProductSummary(BaseModel):
+    """Compact schema for product lists and grids."""
+    model_config = ConfigDict(from_attributes=True)
+    
+    id: int
+    name: str
+    price: float
+    image_url: Optional[str] = None
+    stock_quantity: int
+    snippet: Optional[str] = Field(default=None, description="First 100 characters of the description")
+
+__all__ = ["ProductResponse", "ProductSummary", "CategoryResponse"]
\ No newline at end of file
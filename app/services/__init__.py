@@ -4,5 +4,6 @@ from app.services.user_service import UserService
 from app.services.product_service import ProductService
 from app.services.cart_service import CartService
 from app.services.order_service import OrderService
+from app.services.image_service import ImageService
 
-__all__ = ["UserService", "ProductService", "CartService", "OrderService"]
\ No newline at end of file
+__all__ = ["UserService", "ProductService", "CartService", "OrderService", "ImageService"]
\ No newline at end of file
@@ -3,10 +3,13 @@
 from sqlalchemy.orm import Session, joinedload
 from sqlalchemy import select, delete
 from typing import List, Optional
+from app.core.events import event_bus, CART_TOPIC
 from app.models.cart import CartItem
 from app.models.product import Product
-from app.schemas.cart import CartItemCreate
+from app.schemas.cart import CartItemCreate, CartItemResponse
+from app.core.tracing import traced
 
+@traced
 class CartService:
     """Service for cart operations."""
     
@@ -33,6 +36,7 @@ class CartService:
             existing_item.quantity += cart_item.quantity
             self.db.commit()
             self.db.refresh(existing_item)
+            self._publish_upsert(existing_item, added=cart_item.quantity)
             return existing_item
         else:
             db_cart_item = CartItem(
@@ -43,6 +47,7 @@ class CartService:
             self.db.add(db_cart_item)
             self.db.commit()
             self.db.refresh(db_cart_item)
+            self._publish_upsert(db_cart_item, added=cart_item.quantity)
             return db_cart_item
     
     def update_cart_item(self, user_id: int, cart_item_id: int, quantity: int) -> Optional[CartItem]:
@@ -56,9 +61,12 @@ class CartService:
         if cart_item:
             if quantity <= 0:
                 self.db.delete(cart_item)
+                self.db.commit()
+                self._publish(user_id, "remove", cart_item_id=cart_item_id)
             else:
                 cart_item.quantity = quantity
-            self.db.commit()
+                self.db.commit()
+                self._publish_upsert(cart_item)
             return cart_item
         return None
     
@@ -70,6 +78,8 @@ class CartService:
         )
         result = self.db.execute(stmt)
         self.db.commit()
+        if result.rowcount > 0:
+            self._publish(user_id, "remove", cart_item_id=cart_item_id)
         return result.rowcount > 0
     
     def clear_cart(self, user_id: int) -> bool:
@@ -77,11 +87,24 @@ class CartService:
         stmt = delete(CartItem).where(CartItem.user_id == user_id)
         result = self.db.execute(stmt)
         self.db.commit()
+        if result.rowcount > 0:
+            self._publish(user_id, "clear")
         return result.rowcount > 0
     
     def get_cart_total(self, user_id: int) -> float:
         """Calculate total cart value."""
         cart_items = self.get_cart_items(user_id)
         return sum(item.product.price * item.quantity for item in cart_items)
+    
+    def _publish_upsert(self, cart_item: CartItem, added: int = 0) -> None:
+        """Publish the committed state of a cart line and how many units were just added."""
+        if event_bus.has_subscribers(CART_TOPIC):
+            item = CartItemResponse.model_validate(cart_item).model_dump(mode="json")
+            self._publish(cart_item.user_id, "upsert", item=item, added=added)
+    
+    def _publish(self, user_id: int, action: str, **data) -> None:
+        """Publish a cart change for a user."""
+        if event_bus.has_subscribers(CART_TOPIC):
+            event_bus.publish(CART_TOPIC, {"user_id": user_id, "action": action, **data})
 
 __all__ = ["CartService"]
\ No newline at end of file
@@ -0,0 +1,297 @@
+"""Read-only catalog snapshot shared between worker processes through a memory-mapped file.
+
+The snapshot holds the product list as fixed-width columns (id, price, stock,
+category, creation time), offsets into one UTF-8 string table for names,
+descriptions and image URLs, and a small category table. It is built once,
+written to a temporary file and moved into place with ``os.replace``, so a
+reader always sees a complete snapshot. Every worker maps the same file
+read-only and reads columns through ``memoryview`` casts, so the page cache
+holds one copy no matter how many workers attach.
+
+Readers check the file's identity at most once per ``CHECK_INTERVAL`` and
+re-attach when it has been swapped. Rows from a previous mapping stay valid
+because the old inode lives on until its last mapping is dropped.
+"""
+
+import json
+import mmap
+import os
+import struct
+import threading
+import time
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.engine import Engine
+
+from app.core.config import settings
+from app.core.events import event_bus, CATALOG_TOPIC, STOCK_TOPIC
+from app.core.logging import get_logger
+from app.models.product import Category, Product
+
+logger = get_logger("catalog_snapshot")
+
+MAGIC = b"CATSNAP1"
+HEADER = struct.Struct("<8sI")  # magic, length of the JSON section table that follows
+ALIGNMENT = 8
+CHECK_INTERVAL = 1.0  # seconds between checks for a swapped file
+SNIPPET_LENGTH = 100
+EPOCH = datetime(1970, 1, 1)
+
+# Product fields a snapshot can serve; search still goes to the database
+SNAPSHOT_FIELDS = (
+    "id", "name", "description", "snippet", "price", "image_url",
+    "stock_quantity", "category_id", "category", "created_at"
+)
+
+def _to_micros(value: Optional[datetime]) -> int:
+    return (value - EPOCH) // timedelta(microseconds=1) if value else 0
+
+def _strings(values: Sequence[Optional[str]], blob: bytearray) -> array:
+    """Append strings to the string table and return their n + 1 end offsets."""
+    offsets = array("Q", [len(blob)])
+    for value in values:
+        if value:
+            blob += value.encode("utf-8")
+        offsets.append(len(blob))
+    return offsets
+
+def build_snapshot(engine: Engine, path: Optional[str] = None) -> int:
+    """Write a snapshot of the current catalog and atomically swap it in; return its version."""
+    path = Path(path or settings.catalog_snapshot_path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    started = time.perf_counter()
+
+    with engine.connect() as conn:
+        products = conn.execute(select(
+            Product.id, Product.name, Product.description, Product.price, Product.image_url,
+            Product.stock_quantity, Product.category_id, Product.created_at
+        ).order_by(Product.id)).all()
+        categories = conn.execute(select(
+            Category.id, Category.name, Category.description, Category.image_url
+        ).order_by(Category.id)).all()
+
+    blob = bytearray()
+    columns: Dict[str, array] = {
+        "id": array("q", (row.id for row in products)),
+        "price": array("d", (row.price for row in products)),
+        "stock": array("q", (row.stock_quantity for row in products)),
+        "category_id": array("q", (row.category_id or 0 for row in products)),
+        "created_at": array("q", (_to_micros(row.created_at) for row in products)),
+        "name": _strings([row.name for row in products], blob),
+        "description": _strings([row.description for row in products], blob),
+        "image_url": _strings([row.image_url for row in products], blob),
+        # Positions ordered by (category_id, id), for category pages without a scan
+        "by_category": array("q", sorted(range(len(products)), key=lambda i: (products[i].category_id or 0, i))),
+        "category.id": array("q", (row.id for row in categories)),
+        "category.name": _strings([row.name for row in categories], blob),
+        "category.description": _strings([row.description for row in categories], blob),
+        "category.image_url": _strings([row.image_url for row in categories], blob),
+    }
+    columns["strings"] = array("B", bytes(blob))
+
+    version = time.time_ns()
+    sections: Dict[str, Tuple[int, int, str]] = {}
+    offset = 0
+    for name, column in columns.items():
+        sections[name] = (offset, len(column), column.typecode)
+        offset += -(-column.itemsize * len(column) // ALIGNMENT) * ALIGNMENT
+    table = json.dumps({"version": version, "products": len(products), "sections": sections}).encode("utf-8")
+    data_start = -(-(HEADER.size + len(table)) // ALIGNMENT) * ALIGNMENT
+
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    with open(tmp, "wb") as f:
+        f.write(HEADER.pack(MAGIC, len(table)) + table)
+        for name, column in columns.items():
+            f.seek(data_start + sections[name][0])
+            column.tofile(f)
+        f.truncate(data_start + offset)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+    elapsed = (time.perf_counter() - started) * 1000
+    logger.info(f"Catalog snapshot {version} written: {len(products)} products, "
+                f"{(data_start + offset) / 1024:.0f} KiB in {elapsed:.0f} ms")
+    return version
+
+class _MappedSnapshot:
+    """One attached snapshot file; columns are zero-copy views into the mapping."""
+
+    def __init__(self, path: Path):
+        with open(path, "rb") as f:
+            self.mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, table_size = HEADER.unpack_from(self.mmap)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a catalog snapshot")
+        table = json.loads(bytes(self.mmap[HEADER.size:HEADER.size + table_size]))
+        data_start = -(-(HEADER.size + table_size) // ALIGNMENT) * ALIGNMENT
+
+        self.version: int = table["version"]
+        self.count: int = table["products"]
+        view = memoryview(self.mmap)
+        self.columns: Dict[str, memoryview] = {}
+        for name, (offset, length, typecode) in table["sections"].items():
+            start = data_start + offset
+            size = length * array(typecode).itemsize
+            self.columns[name] = view[start:start + size].cast(typecode)
+
+        self.ids = self.columns["id"]
+        self.strings = self.columns["strings"]
+        self.categories = {
+            category_id: {
+                "id": category_id,
+                "name": self._string("category.name", i),
+                "description": self._string("category.description", i),
+                "image_url": self._string("category.image_url", i),
+            }
+            for i, category_id in enumerate(self.columns["category.id"])
+        }
+
+    def _string(self, column: str, i: int) -> Optional[str]:
+        offsets = self.columns[column]
+        start, end = offsets[i], offsets[i + 1]
+        return self.strings[start:end].tobytes().decode("utf-8") if end > start else None
+
+    def positions(self, category_id: Optional[int], cursor: Optional[int]) -> range:
+        """Positions of matching products in ID order, as a range over ``ids`` or ``by_category``."""
+        if not category_id:
+            return range(bisect_right(self.ids, cursor) if cursor is not None else 0, self.count)
+        order = self.columns["by_category"]
+        category = self.columns["category_id"]
+        key = lambda i: (category[i], self.ids[i])
+        start = bisect_right(order, (category_id, cursor), key=key) if cursor is not None else \
+            bisect_left(order, (category_id, float("-inf")), key=key)
+        end = bisect_left(order, (category_id + 1, float("-inf")), key=key)
+        return range(start, end)
+
+    def row(self, i: int, fields: Sequence[str]) -> Dict[str, Any]:
+        """Build one product dict with the requested fields, in ``list_products`` order."""
+        columns = self.columns
+        product: Dict[str, Any] = {}
+        for name in fields:
+            if name == "id":
+                product["id"] = self.ids[i]
+            elif name == "name":
+                product["name"] = self._string("name", i)
+            elif name == "description":
+                product["description"] = self._string("description", i)
+            elif name == "snippet":
+                description = self._string("description", i)
+                if description and len(description) > SNIPPET_LENGTH:
+                    description = description[:SNIPPET_LENGTH] + "..."
+                product["snippet"] = description
+            elif name == "price":
+                product["price"] = columns["price"][i]
+            elif name == "image_url":
+                product["image_url"] = self._string("image_url", i)
+            elif name == "stock_quantity":
+                product["stock_quantity"] = columns["stock"][i]
+            elif name == "category_id":
+                product["category_id"] = columns["category_id"][i]
+            elif name == "created_at":
+                micros = columns["created_at"][i]
+                product["created_at"] = EPOCH + timedelta(microseconds=micros) if micros else None
+            elif name == "category":
+                category = self.categories.get(columns["category_id"][i])
+                product["category"] = dict(category) if category else None
+        return product
+
+class CatalogSnapshot:
+    """Process-wide handle on the snapshot file that re-attaches when it is swapped."""
+
+    def __init__(self, path: str):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._mapped: Optional[_MappedSnapshot] = None
+        self._identity: Optional[Tuple[int, int, int]] = None
+        self._checked_at = 0.0
+
+    def _current(self) -> Optional[_MappedSnapshot]:
+        now = time.monotonic()
+        if self._mapped is not None and now - self._checked_at < CHECK_INTERVAL:
+            return self._mapped
+        with self._lock:
+            self._checked_at = now
+            try:
+                stat = self.path.stat()
+            except FileNotFoundError:
+                self._mapped, self._identity = None, None
+                return None
+            identity = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+            if identity != self._identity:
+                try:
+                    self._mapped = _MappedSnapshot(self.path)
+                    self._identity = identity
+                    logger.info(f"Attached catalog snapshot {self._mapped.version} ({self._mapped.count} products)")
+                except (OSError, ValueError) as e:
+                    logger.error(f"Failed to attach catalog snapshot: {e}")
+                    self._mapped, self._identity = None, None
+            return self._mapped
+
+    @property
+    def version(self) -> Optional[int]:
+        """Version of the attached snapshot, or None when there is none."""
+        mapped = self._current()
+        return mapped.version if mapped else None
+
+    def list_products(
+        self,
+        category_id: Optional[int] = None,
+        skip: int = 0,
+        limit: int = 100,
+        cursor: Optional[int] = None,
+        fields: Sequence[str] = SNAPSHOT_FIELDS
+    ) -> Optional[List[Dict[str, Any]]]:
+        """Serve a product page from the snapshot, or None if no snapshot is attached."""
+        mapped = self._current()
+        if mapped is None:
+            return None
+        names = [name for name in SNAPSHOT_FIELDS if name in fields and name != "category"]
+        if "category" in fields:
+            names.append("category")
+        positions = mapped.positions(category_id, cursor)[skip:skip + limit]
+        if category_id:
+            order = mapped.columns["by_category"]
+            return [mapped.row(order[i], names) for i in positions]
+        return [mapped.row(i, names) for i in positions]
+
+class SnapshotRefresher:
+    """Rebuilds the snapshot shortly after the catalog changes, coalescing bursts of changes."""
+
+    def __init__(self, engine: Engine, path: str, delay: float):
+        self.engine = engine
+        self.path = path
+        self.delay = delay
+        self._timer: Optional[threading.Timer] = None
+        self._lock = threading.Lock()
+
+    def subscribe(self) -> None:
+        """Rebuild after stock or product changes published in this process."""
+        event_bus.subscribe(STOCK_TOPIC, self.schedule)
+        event_bus.subscribe(CATALOG_TOPIC, self.schedule)
+
+    def schedule(self, payload: Optional[Dict[str, Any]] = None) -> None:
+        """Rebuild after ``delay`` seconds unless a rebuild is already pending."""
+        with self._lock:
+            if self._timer is not None:
+                return
+            self._timer = threading.Timer(self.delay, self._rebuild)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def _rebuild(self) -> None:
+        with self._lock:
+            self._timer = None
+        try:
+            build_snapshot(self.engine, self.path)
+        except Exception as e:
+            logger.error(f"Catalog snapshot rebuild failed: {e}")
+
+catalog_snapshot = CatalogSnapshot(settings.catalog_snapshot_path)
+
+__all__ = ["CatalogSnapshot", "SnapshotRefresher", "build_snapshot", "catalog_snapshot", "SNAPSHOT_FIELDS"]
@@ -0,0 +1,108 @@
+"""Facet counts for the product sidebar: per category, per price bucket and in stock.
+
+All facets come from one grouped aggregate, a "cube" with one count per
+(category, price bucket, in stock) cell. Each facet sums the cells that match
+the other facets' selections but ignores its own, so the category counts show
+what picking another category would return. The cube for the unfiltered
+catalog is cached for ``FACET_CACHE_SECONDS``; only text search and price
+range filters need a fresh aggregate.
+"""
+
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import case, func, select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.events import event_bus, CATALOG_TOPIC
+from app.models.product import Category, Product
+
+# Lower bounds of the price buckets; the last bucket is open-ended
+PRICE_BUCKETS = (0, 100, 250, 500, 1000, 2000)
+
+# (category_id, price bucket index, in stock, count)
+Cell = Tuple[Optional[int], int, bool, int]
+
+PRICE_BUCKET = case(
+    *((Product.price < upper, index) for index, upper in enumerate(PRICE_BUCKETS[1:])),
+    else_=len(PRICE_BUCKETS) - 1
+).label("price_bucket")
+IN_STOCK = case((Product.stock_quantity > 0, 1), else_=0).label("in_stock")
+
+def load_cube(db: Session, filters: Optional[List[Any]] = None) -> List[Cell]:
+    """Count products per (category, price bucket, in stock) cell in one grouped query."""
+    stmt = select(Product.category_id, PRICE_BUCKET, IN_STOCK, func.count()).group_by(
+        Product.category_id, PRICE_BUCKET, IN_STOCK
+    )
+    if filters:
+        stmt = stmt.where(*filters)
+    return [(category_id, bucket, bool(in_stock), count) for category_id, bucket, in_stock, count in db.execute(stmt)]
+
+def facet_counts(
+    cube: List[Cell],
+    categories: List[Tuple[int, str]],
+    category_id: Optional[int] = None,
+    in_stock: bool = False
+) -> Dict[str, Any]:
+    """Category, price and stock facets plus the total for the given selections."""
+    by_category: Dict[Optional[int], int] = {}
+    by_bucket = [0] * len(PRICE_BUCKETS)
+    by_stock = {"in_stock": 0, "out_of_stock": 0}
+    total = 0
+    for cell_category, bucket, cell_in_stock, count in cube:
+        category_matches = not category_id or cell_category == category_id
+        stock_matches = not in_stock or cell_in_stock
+        if stock_matches:
+            by_category[cell_category] = by_category.get(cell_category, 0) + count
+        if category_matches:
+            by_stock["in_stock" if cell_in_stock else "out_of_stock"] += count
+            if stock_matches:
+                by_bucket[bucket] += count
+                total += count
+
+    bounds = PRICE_BUCKETS + (None,)
+    return {
+        "total": total,
+        "categories": [
+            {"id": category, "name": name, "count": by_category.get(category, 0)} for category, name in categories
+        ],
+        "price": [
+            {"min": bounds[i], "max": bounds[i + 1], "count": count} for i, count in enumerate(by_bucket)
+        ],
+        "stock": by_stock,
+    }
+
+class FacetIndex:
+    """The facet cube of the unfiltered catalog, cached for a short time."""
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._cube: Optional[List[Cell]] = None
+        self._categories: List[Tuple[int, str]] = []
+        self._loaded_at = 0.0
+        self._lock = threading.Lock()
+
+    def get(self, db: Session) -> Tuple[List[Cell], List[Tuple[int, str]]]:
+        """The cached cube and (id, name) categories, reloaded once older than the TTL."""
+        with self._lock:
+            if self._cube is None or time.monotonic() - self._loaded_at >= self.ttl:
+                self._categories = [tuple(row) for row in db.execute(
+                    select(Category.id, Category.name).order_by(Category.id)
+                )]
+                self._cube = load_cube(db)
+                self._loaded_at = time.monotonic()
+            return self._cube, self._categories
+
+    def invalidate(self, payload: Optional[Dict[str, Any]] = None) -> None:
+        """Drop the cached cube so the next read reloads it."""
+        self._cube = None
+
+    def subscribe(self) -> None:
+        """Reload after product details change in this process; stock changes wait for the TTL."""
+        event_bus.subscribe(CATALOG_TOPIC, self.invalidate)
+
+facet_index = FacetIndex(settings.facet_cache_seconds)
+
+__all__ = ["FacetIndex", "PRICE_BUCKETS", "facet_counts", "facet_index", "load_cube"]
@@ -0,0 +1,187 @@
+"""Image service for product uploads and pre-rendered thumbnails."""
+
+import hashlib
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+from urllib.parse import quote
+from app.core.config import settings
+from app.core.logging import get_logger
+from app.core.static_assets import asset_source
+from app.core.utils import get_app_dir
+from app.core.tracing import traced
+
+logger = get_logger("images")
+
+STATIC_URL_PREFIX = "/static/"
+FORMATS = {"webp": ("WEBP", "webp"), "jpeg": ("JPEG", "jpg")}
+EXTENSIONS = {ext: fmt for fmt, (_, ext) in FORMATS.items()}
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+# (path, mtime_ns, size) -> sha256 of the file, so unchanged sources are hashed once
+_digest_cache: Dict[Tuple[str, int, int], str] = {}
+
+def thumbnail_name(digest: str, width: int, fmt: str) -> str:
+    """File name of a thumbnail; it only depends on the source content and the variant."""
+    return f"{digest}-{width}.{FORMATS[fmt][1]}"
+
+def parse_thumbnail_name(name: str) -> Optional[Tuple[str, int, str]]:
+    """Split a thumbnail file name into digest, width and format."""
+    stem, _, ext = name.rpartition(".")
+    digest, _, width = stem.rpartition("-")
+    if ext not in EXTENSIONS or not width.isdigit() or len(digest) != 64:
+        return None
+    try:
+        int(digest, 16)
+    except ValueError:
+        return None
+    return digest, int(width), EXTENSIONS[ext]
+
+def thumbnail_url(image_url: str, width: int, fmt: str = "webp") -> str:
+    """URL that serves a thumbnail of a local image, rendering it on first request."""
+    return f"{settings.api_prefix}/images/thumbnail?src={quote(image_url)}&w={width}&format={fmt}"
+
+def thumbnail_srcset(image_url: str, fmt: str = "webp") -> str:
+    """``srcset`` attribute covering all configured thumbnail widths."""
+    return ", ".join(f"{thumbnail_url(image_url, width, fmt)} {width}w" for width in settings.thumbnail_widths)
+
+def render_thumbnails(source: str, digest: str, widths: List[int], formats: List[str], target_dir: str) -> int:
+    """Render all thumbnail variants of one source image.
+
+    Module-level so it can run in a worker process. Files are written to a
+    temporary name and renamed, so readers never see partial thumbnails.
+    Returns the number of thumbnails written.
+    """
+    from PIL import Image
+
+    directory = Path(target_dir) / digest[:2]
+    directory.mkdir(parents=True, exist_ok=True)
+    written = 0
+    with Image.open(source) as image:
+        image.load()
+        for fmt in formats:
+            pil_format, _ = FORMATS[fmt]
+            base = image.convert("RGB") if fmt == "jpeg" else image.convert("RGBA")
+            for width in widths:
+                target = directory / thumbnail_name(digest, width, fmt)
+                if target.exists():
+                    continue
+                height = max(1, round(base.height * width / base.width))
+                resized = base if width >= base.width else base.resize((width, height), Image.LANCZOS)
+                tmp = target.with_suffix(target.suffix + f".{os.getpid()}.tmp")
+                resized.save(tmp, pil_format, quality=82, optimize=True)
+                os.replace(tmp, target)
+                written += 1
+    return written
+
+@traced
+class ImageService:
+    """Service for product images and their thumbnails."""
+
+    def __init__(self, thumbnail_dir: Optional[str] = None, widths: Optional[List[int]] = None):
+        self.thumbnail_dir = Path(thumbnail_dir or settings.thumbnail_directory)
+        self.widths = list(widths or settings.thumbnail_widths)
+        self.static_dir = get_app_dir() / "static"
+
+    def resolve_source(self, image_url: str) -> Optional[Path]:
+        """Map a ``/static/...`` image URL to a file on disk, refusing paths outside static."""
+        if not image_url or not image_url.startswith(STATIC_URL_PREFIX):
+            return None
+        path = (self.static_dir / asset_source(image_url[len(STATIC_URL_PREFIX):])).resolve()
+        if self.static_dir.resolve() not in path.parents or not path.is_file():
+            return None
+        return path
+
+    def digest(self, path: Path) -> str:
+        """Content hash of a source image."""
+        stat = path.stat()
+        key = (str(path), stat.st_mtime_ns, stat.st_size)
+        digest = _digest_cache.get(key)
+        if digest is None:
+            digest = hashlib.sha256(path.read_bytes()).hexdigest()
+            _digest_cache[key] = digest
+        return digest
+
+    def thumbnail_path(self, digest: str, width: int, fmt: str) -> Path:
+        """Location of a thumbnail in the content-addressed cache."""
+        return self.thumbnail_dir / digest[:2] / thumbnail_name(digest, width, fmt)
+
+    def get_thumbnail(self, image_url: str, width: int, fmt: str = "webp") -> Optional[str]:
+        """Get the thumbnail file name for an image, rendering it if missing.
+
+        The width is snapped to the nearest configured width that is not
+        smaller, so arbitrary requests cannot fill the cache.
+        """
+        source = self.resolve_source(image_url)
+        if source is None or fmt not in FORMATS:
+            return None
+        width = min((w for w in self.widths if w >= width), default=max(self.widths))
+        digest = self.digest(source)
+        if not self.thumbnail_path(digest, width, fmt).exists():
+            render_thumbnails(str(source), digest, [width], [fmt], str(self.thumbnail_dir))
+        return thumbnail_name(digest, width, fmt)
+
+    def generate_all(self, image_url: str) -> int:
+        """Render every configured variant of one image, e.g. right after upload."""
+        source = self.resolve_source(image_url)
+        if source is None:
+            return 0
+        return render_thumbnails(str(source), self.digest(source), self.widths, list(FORMATS), str(self.thumbnail_dir))
+
+    def generate_batch(self, image_urls: Iterable[str], max_workers: Optional[int] = None) -> int:
+        """Render all thumbnail variants for many images in a process pool."""
+        jobs = {}
+        for image_url in image_urls:
+            source = self.resolve_source(image_url)
+            if source is not None:
+                jobs[self.digest(source)] = str(source)
+        if not jobs:
+            return 0
+
+        formats = list(FORMATS)
+        written = 0
+        with ProcessPoolExecutor(max_workers=max_workers or settings.thumbnail_workers) as pool:
+            futures = [
+                pool.submit(render_thumbnails, source, digest, self.widths, formats, str(self.thumbnail_dir))
+                for digest, source in jobs.items()
+            ]
+            for future in futures:
+                try:
+                    written += future.result()
+                except Exception as e:
+                    logger.error(f"Thumbnail rendering failed: {e}")
+        logger.info(f"Rendered {written} thumbnails for {len(jobs)} images")
+        return written
+
+    def store_upload(self, data: bytes) -> str:
+        """Validate and store an uploaded image under its content hash; return its URL."""
+        from io import BytesIO
+        from PIL import Image
+
+        with Image.open(BytesIO(data)) as image:
+            image.verify()
+            fmt = (image.format or "").lower()
+        extension = {"jpeg": "jpg"}.get(fmt, fmt)
+        if extension not in ("jpg", "png", "webp", "gif"):
+            raise ValueError(f"Unsupported image format: {fmt or 'unknown'}")
+
+        upload_dir = Path(settings.upload_directory)
+        upload_dir.mkdir(parents=True, exist_ok=True)
+        digest = hashlib.sha256(data).hexdigest()
+        path = upload_dir / f"{digest}.{extension}"
+        if not path.exists():
+            tmp = path.with_suffix(f".{os.getpid()}.tmp")
+            tmp.write_bytes(data)
+            os.replace(tmp, path)
+
+        try:
+            relative = path.resolve().relative_to(self.static_dir.resolve())
+        except ValueError:
+            raise ValueError("Upload directory must be inside app/static") from None
+        return f"{STATIC_URL_PREFIX}{relative.as_posix()}"
+
+__all__ = [
+    "ImageService", "IMMUTABLE_CACHE_CONTROL", "render_thumbnails",
+    "thumbnail_url", "thumbnail_srcset", "parse_thumbnail_name"
+]
@@ -1,11 +1,23 @@
 """Order service for purchase processing."""
 
-from sqlalchemy.orm import Session
-from typing import Optional
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session, selectinload
+from typing import Any, Dict, Iterator, List, Optional
+from app.core.events import event_bus, ORDER_TOPIC, STOCK_TOPIC
 from app.models.order import Order, OrderItem
 from app.models.cart import CartItem
+from app.models.product import Product
 from app.services.cart_service import CartService
+from app.core.tracing import traced
 
+class InsufficientStockError(ValueError):
+    """Raised when a cart line asks for more units than are in stock."""
+    
+    def __init__(self, product_ids: List[int]):
+        self.product_ids = product_ids
+        super().__init__(f"Not enough stock for products: {', '.join(map(str, product_ids))}")
+
+@traced
 class OrderService:
     """Service for order operations."""
     
@@ -14,12 +26,32 @@ class OrderService:
         self.cart_service = CartService(db)
     
     def create_order_from_cart(self, user_id: int) -> Optional[Order]:
-        """Create order from current cart items."""
+        """Create order from current cart items.
+        
+        Stock is taken with one conditional ``UPDATE`` per product, so
+        concurrent checkouts cannot oversell. If any line exceeds the stock
+        left, nothing is committed and ``InsufficientStockError`` is raised.
+        """
         cart_items = self.cart_service.get_cart_items(user_id)
         
         if not cart_items:
             return None
         
+        # Take the items out of stock first, in product order so concurrent checkouts lock rows alike
+        short = []
+        for cart_item in sorted(cart_items, key=lambda item: item.product_id):
+            result = self.db.execute(
+                update(Product)
+                .where(Product.id == cart_item.product_id, Product.stock_quantity >= cart_item.quantity)
+                .values(stock_quantity=Product.stock_quantity - cart_item.quantity)
+                .execution_options(synchronize_session="fetch")
+            )
+            if result.rowcount == 0:
+                short.append(cart_item.product_id)
+        if short:
+            self.db.rollback()
+            raise InsufficientStockError(short)
+        
         # Calculate total
         total_amount = sum(item.product.price * item.quantity for item in cart_items)
         
@@ -33,31 +65,81 @@ class OrderService:
         self.db.flush()  # Get order ID
         
         # Create order items
+        lines = []
+        stock = {}
         for cart_item in cart_items:
             order_item = OrderItem(
                 order_id=order.id,
                 product_id=cart_item.product_id,
                 quantity=cart_item.quantity,
-                price=cart_item.product.price
+                price=cart_item.product.price,
+                product_name=cart_item.product.name,
+                product_image_url=cart_item.product.image_url,
+                category_name=cart_item.product.category.name if cart_item.product.category else None
             )
             self.db.add(order_item)
+            lines.append({"product_id": cart_item.product_id, "quantity": cart_item.quantity, "price": cart_item.product.price})
+            stock[cart_item.product_id] = cart_item.product.stock_quantity
         
         # Clear cart
         self.cart_service.clear_cart(user_id)
         
         self.db.commit()
         self.db.refresh(order)
+        self._publish_order(order, lines, stock)
         return order
     
-    def get_user_orders(self, user_id: int) -> list[Order]:
-        """Get all orders for a user."""
-        from sqlalchemy import select
-        from sqlalchemy.orm import joinedload
+    def _publish_order(self, order: Order, lines: list, stock: dict) -> None:
+        """Publish the stock changes and the order after checkout commits."""
+        if event_bus.has_subscribers(STOCK_TOPIC):
+            event_bus.publish(STOCK_TOPIC, {"stock": stock})
+        if event_bus.has_subscribers(ORDER_TOPIC):
+            event_bus.publish(ORDER_TOPIC, {"user_id": order.user_id, "order_id": order.id, "items": lines})
+    
+    def get_user_orders(
+        self,
+        user_id: int,
+        skip: int = 0,
+        limit: int = 20,
+        cursor: Optional[int] = None
+    ) -> list[Order]:
+        """Get a page of a user's orders, newest first.
         
+        Order items are loaded with one extra ``IN`` query per page instead of
+        being joined onto every order row, and carry their own product
+        snapshot, so the catalog is not read at all. Pass the last seen order
+        ID as ``cursor`` to fetch the next page without an OFFSET scan.
+        """
         stmt = select(Order).options(
-            joinedload(Order.order_items).joinedload(OrderItem.product)
-        ).where(Order.user_id == user_id).order_by(Order.created_at.desc())
+            selectinload(Order.order_items)
+        ).where(Order.user_id == user_id)
+        if cursor is not None:
+            stmt = stmt.where(Order.id < cursor)
+        stmt = stmt.order_by(Order.id.desc()).offset(skip).limit(limit)
         
         return list(self.db.execute(stmt).scalars().all())
+    
+    def iter_order_rows(self, user_id: int, batch_size: int = 1000) -> Iterator[Dict[str, Any]]:
+        """Iterate over a user's order history as one flat row per order item.
+        
+        Rows are fetched ``batch_size`` at a time through a server-side cursor
+        where the database supports one, so history size does not affect memory.
+        """
+        stmt = select(
+            Order.id, Order.created_at, Order.status, Order.total_amount,
+            OrderItem.product_id, OrderItem.product_name, OrderItem.category_name,
+            OrderItem.quantity, OrderItem.price
+        ).join(OrderItem, OrderItem.order_id == Order.id).where(
+            Order.user_id == user_id
+        ).order_by(Order.id, OrderItem.id)
+        
+        names = (
+            "order_id", "created_at", "status", "total_amount",
+            "product_id", "product_name", "category_name", "quantity", "price"
+        )
+        result = self.db.execute(stmt.execution_options(yield_per=batch_size))
+        for partition in result.partitions():
+            for row in partition:
+                yield dict(zip(names, row))
 
-__all__ = ["OrderService"]
\ No newline at end of file
+__all__ = ["OrderService", "InsufficientStockError"]
\ No newline at end of file
@@ -0,0 +1,209 @@
+"""Incrementally maintained popularity counters: units sold and add-to-cart counts.
+
+Checkouts (``ORDER_TOPIC``) and cart additions (``CART_TOPIC``) only bump
+in-memory deltas. A background thread flushes the deltas every
+``POPULARITY_FLUSH_SECONDS`` as one batched upsert that adds them to the
+``product_stats`` rows, so every worker can flush into the same rows. The
+same thread re-reads the top sellers through the sales index on every tick,
+even with nothing pending, so other workers' flushes show up and serving
+them is a slice of the cached list.
+"""
+
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import func, select, update
+from sqlalchemy.engine import Connection, Engine
+
+from app.core.config import settings
+from app.core.database import engine as default_engine
+from app.core.events import event_bus, CART_TOPIC, ORDER_TOPIC
+from app.core.health import register_queue
+from app.core.logging import get_logger
+from app.models.product import Product
+from app.models.product_stats import ProductStats
+
+logger = get_logger("popularity")
+
+TOP_SELLERS_CACHED = 50
+MAX_PENDING = 10_000  # products with unflushed deltas before readiness reports the backlog
+
+def upsert_deltas(conn: Connection, deltas: Dict[int, Tuple[int, int]]) -> None:
+    """Add (sales, cart adds) deltas to the product_stats rows, creating missing rows."""
+    rows = [
+        {"product_id": product_id, "sales_count": sales, "cart_add_count": cart_adds}
+        for product_id, (sales, cart_adds) in sorted(deltas.items())
+    ]
+    dialect = conn.dialect.name
+    if dialect in ("sqlite", "postgresql"):
+        if dialect == "sqlite":
+            from sqlalchemy.dialects.sqlite import insert
+        else:
+            from sqlalchemy.dialects.postgresql import insert
+        stmt = insert(ProductStats)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[ProductStats.product_id],
+            set_={
+                "sales_count": ProductStats.sales_count + stmt.excluded.sales_count,
+                "cart_add_count": ProductStats.cart_add_count + stmt.excluded.cart_add_count,
+                "updated_at": func.now(),
+            },
+        )
+        conn.execute(stmt, rows)
+    elif dialect in ("mysql", "mariadb"):
+        from sqlalchemy.dialects.mysql import insert
+        stmt = insert(ProductStats)
+        stmt = stmt.on_duplicate_key_update(
+            sales_count=ProductStats.sales_count + stmt.inserted.sales_count,
+            cart_add_count=ProductStats.cart_add_count + stmt.inserted.cart_add_count,
+            updated_at=func.now(),
+        )
+        conn.execute(stmt, rows)
+    else:
+        for row in rows:
+            result = conn.execute(update(ProductStats).where(ProductStats.product_id == row["product_id"]).values(
+                sales_count=ProductStats.sales_count + row["sales_count"],
+                cart_add_count=ProductStats.cart_add_count + row["cart_add_count"],
+            ))
+            if result.rowcount == 0:
+                conn.execute(ProductStats.__table__.insert(), row)
+
+class PopularityTracker:
+    """Accumulates popularity deltas in memory and flushes them in batches."""
+
+    def __init__(self, engine: Optional[Engine] = None, flush_seconds: Optional[float] = None):
+        self.engine = engine or default_engine
+        self.flush_seconds = settings.popularity_flush_seconds if flush_seconds is None else flush_seconds
+        self._pending: Dict[int, List[int]] = {}  # product_id -> [sales, cart adds]
+        self._top: List[Dict[str, Any]] = []
+        self._top_loaded_at: Optional[float] = None
+        self._lock = threading.Lock()
+        self._load_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self.flushed = 0
+        self.failed = 0
+
+    # Recording
+
+    def record(self, product_id: int, sales: int = 0, cart_adds: int = 0) -> None:
+        """Add to a product's pending counters."""
+        if self._thread is None:
+            self._start()
+        with self._lock:
+            counters = self._pending.setdefault(product_id, [0, 0])
+            counters[0] += sales
+            counters[1] += cart_adds
+
+    def subscribe(self) -> None:
+        """Count checkouts and cart additions published in this process."""
+        event_bus.subscribe(ORDER_TOPIC, self._on_order)
+        event_bus.subscribe(CART_TOPIC, self._on_cart)
+        register_queue("popularity", self.pending, MAX_PENDING)
+        self._start()
+
+    def _on_order(self, payload: Dict[str, Any]) -> None:
+        for line in payload.get("items", []):
+            self.record(line["product_id"], sales=line["quantity"])
+
+    def _on_cart(self, payload: Dict[str, Any]) -> None:
+        if payload.get("action") == "upsert" and payload.get("added"):
+            self.record(payload["item"]["product_id"], cart_adds=payload["added"])
+
+    def pending(self) -> int:
+        """Products with deltas not yet written."""
+        return len(self._pending)
+
+    # Flushing
+
+    def flush(self) -> int:
+        """Write the pending deltas in one batch and refresh the cached top sellers; return the batch size."""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        if not pending:
+            return 0
+        deltas = {product_id: (sales, cart_adds) for product_id, (sales, cart_adds) in pending.items()}
+        try:
+            with self.engine.begin() as conn:
+                upsert_deltas(conn, deltas)
+        except Exception as e:
+            self.failed += 1
+            logger.warning(f"Popularity flush of {len(deltas)} products failed, retrying later: {e}")
+            with self._lock:
+                for product_id, (sales, cart_adds) in deltas.items():
+                    counters = self._pending.setdefault(product_id, [0, 0])
+                    counters[0] += sales
+                    counters[1] += cart_adds
+            return 0
+        self.flushed += len(deltas)
+        self._update_suggest_scores(list(deltas))
+        self._load_top()
+        return len(pending)
+
+    def _update_suggest_scores(self, product_ids: Optional[List[int]] = None) -> None:
+        """Rank search suggestions by units sold."""
+        from app.services.suggest_index import suggest_index
+
+        stmt = select(ProductStats.product_id, ProductStats.sales_count).where(ProductStats.sales_count > 0)
+        if product_ids is not None:
+            stmt = stmt.where(ProductStats.product_id.in_(product_ids))
+        with self.engine.connect() as conn:
+            suggest_index.update_scores({product_id: float(sales) for product_id, sales in conn.execute(stmt)})
+
+    def _load_top(self) -> None:
+        stmt = select(
+            Product.id, Product.name, Product.price, Product.image_url, Product.stock_quantity,
+            ProductStats.sales_count, ProductStats.cart_add_count
+        ).join(Product, Product.id == ProductStats.product_id).where(ProductStats.sales_count > 0).order_by(
+            ProductStats.sales_count.desc(), ProductStats.product_id.desc()
+        ).limit(TOP_SELLERS_CACHED)
+        with self.engine.connect() as conn:
+            self._top = [dict(row._mapping) for row in conn.execute(stmt)]
+        self._top_loaded_at = time.monotonic()
+
+    def _load_initial(self) -> None:
+        """Load suggest scores and the top sellers once, however many callers arrive together."""
+        with self._load_lock:
+            if self._top_loaded_at is None:
+                self._update_suggest_scores()
+                self._load_top()
+
+    def top_sellers(self, limit: int = 10) -> List[Dict[str, Any]]:
+        """Best-selling products from the cache the flush thread keeps current."""
+        if self._top_loaded_at is None:
+            self._load_initial()
+        return self._top[:limit]
+
+    def _start(self) -> None:
+        with self._lock:
+            if self._thread is None:
+                self._stop.clear()
+                self._thread = threading.Thread(target=self._run, name="popularity-flush", daemon=True)
+                self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            try:
+                if self._top_loaded_at is None:
+                    self._load_initial()
+                elif not self.flush():
+                    self._load_top()  # picks up other workers' flushes
+            except Exception as e:
+                logger.error(f"Popularity flush failed: {e}")
+            if self._stop.wait(self.flush_seconds):
+                break
+
+    def shutdown(self, timeout: float = 5.0) -> None:
+        """Stop the flush thread and write what is pending."""
+        thread = self._thread
+        if thread is None:
+            return
+        self._stop.set()
+        thread.join(timeout)
+        self._thread = None
+        self.flush()
+
+popularity_tracker = PopularityTracker()
+
+__all__ = ["PopularityTracker", "popularity_tracker", "upsert_deltas"]
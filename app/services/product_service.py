@@ -1,41 +1,318 @@
 """Product service for catalog management."""
 
 from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import select
-from typing import List, Optional
+from sqlalchemy import Row, Select, case, func, select, tuple_
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+from app.core.config import settings
+from app.core.events import event_bus, CATALOG_TOPIC
 from app.models.product import Product, Category
+from app.models.product_stats import ProductStats
+from app.services.catalog_snapshot import catalog_snapshot
+from app.services.facet_index import facet_counts, facet_index, load_cube
+from app.services.related_products import related_products
+from app.core.tracing import traced
 
+SNIPPET_LENGTH = 100
+
+# Projectable product fields for the list fast path, in response order
+PRODUCT_FIELD_COLUMNS = {
+    "id": Product.id,
+    "name": Product.name,
+    "description": Product.description,
+    "snippet": case(
+        (func.length(Product.description) > SNIPPET_LENGTH,
+         func.substr(Product.description, 1, SNIPPET_LENGTH) + "..."),
+        else_=Product.description
+    ).label("snippet"),
+    "price": Product.price,
+    "image_url": Product.image_url,
+    "stock_quantity": Product.stock_quantity,
+    "category_id": Product.category_id,
+    "created_at": Product.created_at,
+}
+CATEGORY_FIELD_COLUMNS = {
+    "id": Category.id,
+    "name": Category.name,
+    "description": Category.description,
+    "image_url": Category.image_url,
+}
+PRODUCT_FIELDS = tuple(PRODUCT_FIELD_COLUMNS) + ("category",)
+
+POPULARITY = func.coalesce(ProductStats.sales_count, 0)
+
+# Sort orders: (sort column, descending); ties are broken by ID in the same direction
+SORT_ORDERS = {
+    "id": (None, False),
+    "price": (Product.price, False),
+    "newest": (Product.created_at, True),
+    "popularity": (POPULARITY, True),
+}
+FULL_FIELDS = ("id", "name", "description", "price", "image_url", "stock_quantity", "category_id", "category", "created_at")
+SUMMARY_FIELDS = ("id", "name", "price", "image_url", "stock_quantity", "snippet")
+
+def validate_fields(fields: Sequence[str]) -> None:
+    """Raise ``ValueError`` unless ``fields`` is a non-empty list of known product fields."""
+    unknown = set(fields) - set(PRODUCT_FIELDS)
+    if unknown:
+        raise ValueError(f"Unknown product fields: {', '.join(sorted(unknown))}")
+    if not fields:
+        raise ValueError("No product fields requested")
+
+@traced
 class ProductService:
     """Service for product operations."""
     
     def __init__(self, db: Session):
         self.db = db
     
-    def get_products(self, category_id: Optional[int] = None, skip: int = 0, limit: int = 100) -> List[Product]:
-        """Get products with optional category filtering."""
+    def get_products(
+        self,
+        category_id: Optional[int] = None,
+        skip: int = 0,
+        limit: int = 100,
+        cursor: Optional[int] = None,
+        sort: str = "id",
+        min_price: Optional[float] = None,
+        max_price: Optional[float] = None,
+        in_stock: bool = False
+    ) -> List[Product]:
+        """Get products with optional category, price and stock filtering.
+
+        Products are ordered by ``sort`` (see ``SORT_ORDERS``); pass the last
+        seen ID as ``cursor`` to fetch the next page without an OFFSET scan.
+        """
         stmt = select(Product).options(joinedload(Product.category))
+        stmt = self._filter(
+            stmt, category_id=category_id, cursor=cursor, sort=sort,
+            min_price=min_price, max_price=max_price, in_stock=in_stock
+        )
+        stmt = stmt.offset(skip).limit(limit)
+        return list(self.db.execute(stmt).scalars().all())
+    
+    def list_products(
+        self,
+        category_id: Optional[int] = None,
+        search: Optional[str] = None,
+        skip: int = 0,
+        limit: int = 100,
+        cursor: Optional[int] = None,
+        fields: Sequence[str] = FULL_FIELDS,
+        sort: str = "id",
+        min_price: Optional[float] = None,
+        max_price: Optional[float] = None,
+        in_stock: bool = False
+    ) -> List[Dict[str, Any]]:
+        """List products as plain dicts holding only the requested fields.
         
-        if category_id:
-            stmt = stmt.where(Product.category_id == category_id)
+        Selects just the matching columns as Core rows, so no ORM instances are
+        created and no Pydantic validation is needed before encoding. The
+        category join is only added when ``category`` is requested. With the
+        default fields the dicts are shaped like ``ProductResponse``.
         
+        When the catalog snapshot is enabled, ID-ordered pages without a
+        search or price and stock filters are served from it and the
+        database is not queried.
+        """
+        plain = not search and sort == "id" and min_price is None and max_price is None and not in_stock
+        if settings.catalog_snapshot_enabled and plain:
+            validate_fields(fields)
+            products = catalog_snapshot.list_products(category_id, skip, limit, cursor, fields)
+            if products is not None:
+                return products
+        
+        stmt, to_dict = self._select_fields(fields)
+        stmt = self._filter(
+            stmt, category_id=category_id, search=search, cursor=cursor, sort=sort,
+            min_price=min_price, max_price=max_price, in_stock=in_stock
+        )
         stmt = stmt.offset(skip).limit(limit)
-        return list(self.db.execute(stmt).scalars().all())
+        return [to_dict(row) for row in self.db.execute(stmt)]
+    
+    def faceted_search(
+        self,
+        category_id: Optional[int] = None,
+        search: Optional[str] = None,
+        skip: int = 0,
+        limit: int = 100,
+        cursor: Optional[int] = None,
+        fields: Sequence[str] = FULL_FIELDS,
+        sort: str = "id",
+        min_price: Optional[float] = None,
+        max_price: Optional[float] = None,
+        in_stock: bool = False
+    ) -> Dict[str, Any]:
+        """A product page plus category, price and stock facet counts for the same filters.
+        
+        The facets come from one grouped aggregate, which is cached for the
+        unfiltered catalog; a search or price range computes a fresh one.
+        """
+        items = self.list_products(
+            category_id, search, skip, limit, cursor, fields,
+            sort=sort, min_price=min_price, max_price=max_price, in_stock=in_stock
+        ) if limit else []
+        cube, categories = facet_index.get(self.db)
+        filters = self._conditions(search=search, min_price=min_price, max_price=max_price)
+        if filters:
+            cube = load_cube(self.db, filters)
+        return {"items": items, "facets": facet_counts(cube, categories, category_id, in_stock)}
+    
+    def get_related_products(
+        self,
+        product_id: int,
+        limit: int = 8,
+        fields: Sequence[str] = SUMMARY_FIELDS
+    ) -> List[Dict[str, Any]]:
+        """Products most often bought together with ``product_id``, most frequent first.
+        
+        Neighbours are looked up in the precomputed co-purchase index, then
+        loaded by primary key; products without orders have none.
+        """
+        related_ids = related_products.related_ids(product_id, limit)
+        if not related_ids:
+            return []
+        stmt, to_dict = self._select_fields(("id",) + tuple(field for field in fields if field != "id"))
+        rows = self.db.execute(stmt.where(Product.id.in_(related_ids)))
+        by_id = {product["id"]: product for product in map(to_dict, rows)}
+        return [by_id[related_id] for related_id in related_ids if related_id in by_id]
+    
+    def iter_products(
+        self,
+        category_id: Optional[int] = None,
+        fields: Sequence[str] = FULL_FIELDS,
+        batch_size: int = 1000
+    ) -> Iterator[Dict[str, Any]]:
+        """Iterate over the whole catalog without holding it in memory.
+        
+        Rows are fetched ``batch_size`` at a time through a server-side cursor
+        where the database supports one.
+        """
+        stmt, to_dict = self._select_fields(fields)
+        stmt = self._filter(stmt, category_id=category_id)
+        result = self.db.execute(stmt.execution_options(yield_per=batch_size))
+        for partition in result.partitions():
+            for row in partition:
+                yield to_dict(row)
     
     def get_product(self, product_id: int) -> Optional[Product]:
         """Get product by ID with category."""
         stmt = select(Product).options(joinedload(Product.category)).where(Product.id == product_id)
         return self.db.execute(stmt).scalar_one_or_none()
     
+    def set_product_image(self, product_id: int, image_url: str) -> Optional[Product]:
+        """Point a product at a new image."""
+        product = self.get_product(product_id)
+        if product:
+            product.image_url = image_url
+            self.db.commit()
+            self.db.refresh(product)
+            if event_bus.has_subscribers(CATALOG_TOPIC):
+                event_bus.publish(CATALOG_TOPIC, {"product_ids": [product_id]})
+        return product
+    
     def get_categories(self) -> List[Category]:
         """Get all categories."""
         stmt = select(Category)
         return list(self.db.execute(stmt).scalars().all())
     
-    def search_products(self, query: str, skip: int = 0, limit: int = 100) -> List[Product]:
+    def search_products(
+        self,
+        query: str,
+        skip: int = 0,
+        limit: int = 100,
+        cursor: Optional[int] = None
+    ) -> List[Product]:
         """Search products by name or description."""
-        stmt = select(Product).options(joinedload(Product.category)).where(
-            Product.name.ilike(f"%{query}%") | Product.description.ilike(f"%{query}%")
-        ).offset(skip).limit(limit)
+        stmt = select(Product).options(joinedload(Product.category))
+        stmt = self._filter(stmt, search=query, cursor=cursor)
+        stmt = stmt.offset(skip).limit(limit)
         return list(self.db.execute(stmt).scalars().all())
+    
+    @staticmethod
+    def _select_fields(fields: Sequence[str]) -> Tuple[Select, Callable[[Row], Dict[str, Any]]]:
+        """Build a product query for the given fields and a function turning its rows into dicts."""
+        validate_fields(fields)
+        names = [name for name in PRODUCT_FIELD_COLUMNS if name in fields]
+        stmt = select(*(PRODUCT_FIELD_COLUMNS[name] for name in names)).select_from(Product)
+        if "category" not in fields:
+            return stmt, lambda row: dict(zip(names, row))
+        
+        stmt = stmt.add_columns(*CATEGORY_FIELD_COLUMNS.values())
+        stmt = stmt.outerjoin(Category, Product.category_id == Category.id)
+        n = len(names)
+        category_names = tuple(CATEGORY_FIELD_COLUMNS)
+        
+        def to_dict(row: Row) -> Dict[str, Any]:
+            product = dict(zip(names, row[:n]))
+            product["category"] = dict(zip(category_names, row[n:])) if row[n] is not None else None
+            return product
+        
+        return stmt, to_dict
+    
+    @staticmethod
+    def _conditions(
+        category_id: Optional[int] = None,
+        search: Optional[str] = None,
+        min_price: Optional[float] = None,
+        max_price: Optional[float] = None,
+        in_stock: bool = False
+    ) -> List[Any]:
+        """WHERE conditions for the shared catalog filters."""
+        conditions = []
+        if category_id:
+            conditions.append(Product.category_id == category_id)
+        if search:
+            conditions.append(Product.name.ilike(f"%{search}%") | Product.description.ilike(f"%{search}%"))
+        if min_price is not None:
+            conditions.append(Product.price >= min_price)
+        if max_price is not None:
+            conditions.append(Product.price <= max_price)
+        if in_stock:
+            conditions.append(Product.stock_quantity > 0)
+        return conditions
+    
+    @staticmethod
+    def _filter(
+        stmt: Select,
+        category_id: Optional[int] = None,
+        search: Optional[str] = None,
+        cursor: Optional[int] = None,
+        sort: str = "id",
+        min_price: Optional[float] = None,
+        max_price: Optional[float] = None,
+        in_stock: bool = False
+    ) -> Select:
+        """Apply the shared catalog filters and ordering to a product query.
+        
+        A category with a price or newest sort walks the
+        ``(category_id, price)`` or ``(category_id, created_at)`` index in
+        order. Popularity is units sold from ``product_stats``. The cursor is
+        the last seen product ID; for other sorts the next page starts after
+        that product's ``(sort key, id)``.
+        """
+        if sort not in SORT_ORDERS:
+            raise ValueError(f"Unknown sort: {sort}")
+        column, descending = SORT_ORDERS[sort]
+        if sort == "popularity":
+            stmt = stmt.outerjoin(ProductStats, ProductStats.product_id == Product.id)
+        
+        conditions = ProductService._conditions(category_id, search, min_price, max_price, in_stock)
+        if conditions:
+            stmt = stmt.where(*conditions)
+        
+        if column is None:
+            if cursor is not None:
+                stmt = stmt.where(Product.id > cursor)
+            return stmt.order_by(Product.id)
+        
+        if cursor is not None:
+            last_key = select(column, Product.id).select_from(Product).where(Product.id == cursor)
+            if sort == "popularity":
+                last_key = last_key.outerjoin(ProductStats, ProductStats.product_id == Product.id)
+            last_key = last_key.correlate(None).scalar_subquery()
+            key = tuple_(column, Product.id)
+            stmt = stmt.where(key < last_key if descending else key > last_key)
+        if descending:
+            return stmt.order_by(column.desc(), Product.id.desc())
+        return stmt.order_by(column, Product.id)
 
-__all__ = ["ProductService"]
\ No newline at end of file
+__all__ = ["ProductService", "PRODUCT_FIELDS", "FULL_FIELDS", "SUMMARY_FIELDS", "SORT_ORDERS", "validate_fields"]
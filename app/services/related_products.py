@@ -0,0 +1,63 @@
+"""Serves "frequently bought together" neighbours from the file built by ``app.jobs.related_products``.
+
+The neighbour array is memory-mapped read-only, so a lookup reads one row
+and every worker shares the same pages. The file's identity is checked at
+most once per ``CHECK_INTERVAL`` and re-mapped when the job has replaced it.
+"""
+
+import threading
+import time
+from pathlib import Path
+from typing import Any, List, Optional, Tuple
+
+from app.core.config import settings
+from app.core.logging import get_logger
+
+logger = get_logger("related_products")
+
+RELATED_FILE = "related.npy"
+CHECK_INTERVAL = 5.0  # seconds between checks for a replaced file
+
+class RelatedProducts:
+    """Process-wide handle on the memory-mapped neighbour array."""
+
+    def __init__(self, directory: str):
+        self.path = Path(directory) / RELATED_FILE
+        self._lock = threading.Lock()
+        self._related: Optional[Any] = None
+        self._identity: Optional[Tuple[int, int]] = None
+        self._checked_at = 0.0
+
+    def _current(self) -> Optional[Any]:
+        now = time.monotonic()
+        if now - self._checked_at < CHECK_INTERVAL:
+            return self._related
+        with self._lock:
+            self._checked_at = now
+            try:
+                stat = self.path.stat()
+            except FileNotFoundError:
+                self._related, self._identity = None, None
+                return None
+            identity = (stat.st_ino, stat.st_mtime_ns)
+            if identity != self._identity:
+                try:
+                    import numpy as np  # only needed once the job has written a file
+                    self._related = np.load(self.path, mmap_mode="r")
+                    self._identity = identity
+                    logger.info(f"Attached related products for {self._related.shape[0] - 1} product IDs")
+                except (ImportError, OSError, ValueError) as e:
+                    logger.error(f"Failed to attach related products: {e}")
+                    self._related, self._identity = None, None
+            return self._related
+
+    def related_ids(self, product_id: int, limit: int = 10) -> List[int]:
+        """IDs of the products most often bought with ``product_id``, most frequent first."""
+        related = self._current()
+        if related is None or not 0 < product_id < related.shape[0]:
+            return []
+        return [int(i) for i in related[product_id, 0, :limit] if i]
+
+related_products = RelatedProducts(settings.related_products_directory)
+
+__all__ = ["RelatedProducts", "related_products"]
@@ -0,0 +1,208 @@
+"""In-memory prefix index for search-as-you-type suggestions.
+
+Product and category names are indexed at every word start, as one sorted
+list of ``(term, key)`` pairs. "pro" therefore matches "iPhone 15 Pro", and
+"iphone 1" matches it too. A lookup is two binary searches plus a scan of
+the matching range. Matches are ranked by a score (product popularity, fed
+in through ``update_scores``), then by shorter name. Products and
+categories are ranked and cut separately.
+
+Short or common prefixes match large ranges, so the top results of any
+prefix matching more than ``MEMO_MIN_TERMS`` terms are memoised until a
+matching name changes.
+
+The index is built from the database on first use. Products changed in
+this process (``CATALOG_TOPIC``) are re-read and re-indexed one by one. A
+full rebuild runs in the background once the index is older than
+``SUGGEST_REFRESH_SECONDS``, which picks up bulk imports made by other
+processes.
+"""
+
+import heapq
+import re
+import threading
+import time
+from bisect import bisect_left, insort
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.engine import Engine
+
+from app.core.config import settings
+from app.core.database import engine as default_engine
+from app.core.events import event_bus, CATALOG_TOPIC
+from app.core.logging import get_logger
+from app.models.product import Category, Product
+
+logger = get_logger("suggest_index")
+
+WORD = re.compile(r"\w+")
+MEMO_MIN_TERMS = 256  # prefixes matching more terms keep their top results
+MAX_LIMIT = 20
+MAX_CATEGORIES = 3
+
+def normalize(text: str) -> str:
+    """Case-fold and collapse whitespace."""
+    return " ".join(text.casefold().split())
+
+def _terms(name: str) -> List[str]:
+    """The normalized name from each word start to its end."""
+    name = normalize(name)
+    return [name[match.start():] for match in WORD.finditer(name)]
+
+class SuggestIndex:
+    """Sorted-array prefix index over product and category names.
+
+    Products are keyed by their ID and categories by their negated ID, so
+    both share one term list.
+    """
+
+    def __init__(self, engine: Optional[Engine] = None, refresh_seconds: Optional[float] = None):
+        self.engine = engine or default_engine
+        self.refresh_seconds = settings.suggest_refresh_seconds if refresh_seconds is None else refresh_seconds
+        self._terms: List[Tuple[str, int]] = []
+        self._entries: Dict[int, Dict[str, Any]] = {}
+        self._scores: Dict[int, float] = {}
+        self._memo: Dict[str, Tuple[List[int], List[int]]] = {}  # prefix -> (product keys, category keys)
+        self._built_at: Optional[float] = None
+        self._lock = threading.Lock()
+        self._rebuilding = False
+
+    # Building
+
+    def build(self, products: Iterable[Tuple[int, str, Optional[int]]],
+              categories: Iterable[Tuple[int, str]]) -> None:
+        """Replace the index with the given (id, name, category_id) products and (id, name) categories."""
+        entries: Dict[int, Dict[str, Any]] = {}
+        terms: List[Tuple[str, int]] = []
+        for product_id, name, category_id in products:
+            entries[product_id] = {"type": "product", "id": product_id, "name": name, "category_id": category_id}
+            terms.extend((term, product_id) for term in _terms(name))
+        for category_id, name in categories:
+            entries[-category_id] = {"type": "category", "id": category_id, "name": name}
+            terms.extend((term, -category_id) for term in _terms(name))
+        terms.sort()
+        with self._lock:
+            self._terms, self._entries, self._memo = terms, entries, {}
+            self._built_at = time.monotonic()
+
+    def load(self) -> None:
+        """Build the index from the database."""
+        started = time.perf_counter()
+        with self.engine.connect() as conn:
+            products = conn.execute(select(Product.id, Product.name, Product.category_id)).all()
+            categories = conn.execute(select(Category.id, Category.name)).all()
+        self.build(products, categories)
+        logger.info(f"Suggest index built: {len(products)} products, {len(categories)} categories, "
+                    f"{len(self._terms)} terms in {(time.perf_counter() - started) * 1000:.0f} ms")
+
+    def upsert_product(self, product_id: int, name: Optional[str], category_id: Optional[int] = None) -> None:
+        """Re-index one product; a ``None`` name removes it."""
+        with self._lock:
+            changed = []
+            old = self._entries.pop(product_id, None)
+            if old is not None:
+                for term in _terms(old["name"]):
+                    position = bisect_left(self._terms, (term, product_id))
+                    if position < len(self._terms) and self._terms[position] == (term, product_id):
+                        del self._terms[position]
+                        changed.append(term)
+            if name is not None:
+                self._entries[product_id] = {"type": "product", "id": product_id, "name": name, "category_id": category_id}
+                for term in _terms(name):
+                    insort(self._terms, (term, product_id))
+                    changed.append(term)
+            # Only memoised prefixes of the changed terms can rank differently
+            for prefix in [prefix for prefix in self._memo if any(term.startswith(prefix) for term in changed)]:
+                del self._memo[prefix]
+
+    def refresh_products(self, product_ids: Iterable[int]) -> None:
+        """Re-read the given products from the database and re-index them."""
+        product_ids = list(product_ids)
+        with self.engine.connect() as conn:
+            rows = {row.id: row for row in conn.execute(
+                select(Product.id, Product.name, Product.category_id).where(Product.id.in_(product_ids))
+            )}
+        for product_id in product_ids:
+            row = rows.get(product_id)
+            self.upsert_product(product_id, row.name if row else None, row.category_id if row else None)
+
+    def update_scores(self, scores: Dict[int, float]) -> None:
+        """Merge product popularity scores used for ranking."""
+        with self._lock:
+            self._scores.update(scores)
+            self._memo = {}
+
+    def subscribe(self) -> None:
+        """Re-index products whose details change in this process."""
+        event_bus.subscribe(CATALOG_TOPIC, self._on_catalog_change)
+
+    def _on_catalog_change(self, payload: Dict[str, Any]) -> None:
+        if self._built_at is not None and payload.get("product_ids"):
+            self.refresh_products(payload["product_ids"])
+
+    def _ensure_fresh(self) -> None:
+        if self._built_at is None:
+            with self._lock:
+                needs_build = self._built_at is None
+            if needs_build:
+                self.load()
+        elif self.refresh_seconds and time.monotonic() - self._built_at > self.refresh_seconds and not self._rebuilding:
+            self._rebuilding = True
+            threading.Thread(target=self._rebuild, name="suggest-rebuild", daemon=True).start()
+
+    def _rebuild(self) -> None:
+        try:
+            self.load()
+        except Exception as e:
+            logger.error(f"Suggest index rebuild failed: {e}")
+        finally:
+            self._rebuilding = False
+
+    # Lookup
+
+    def _rank(self, key: int) -> Tuple[float, int, int]:
+        return (-self._scores.get(key, 0.0), len(self._entries[key]["name"]), key)
+
+    def _top(self, keys: List[int], count: int) -> List[int]:
+        if len(keys) > count:
+            return heapq.nsmallest(count, keys, key=self._rank)
+        return sorted(keys, key=self._rank)
+
+    def _range(self, prefix: str) -> Tuple[int, int]:
+        """Slice of the term list starting with ``prefix``."""
+        start = bisect_left(self._terms, (prefix,))
+        return start, bisect_left(self._terms, (prefix + "\U0010ffff",), lo=start)
+
+    def suggest(self, query: str, limit: int = 8) -> Dict[str, Any]:
+        """Top products and categories whose names have a word starting with ``query``."""
+        self._ensure_fresh()
+        prefix = normalize(query)
+        limit = max(1, min(limit, MAX_LIMIT))
+        if not prefix:
+            return {"query": query, "products": [], "categories": []}
+
+        with self._lock:
+            ranked = self._memo.get(prefix)
+            if ranked is None:
+                start, end = self._range(prefix)
+                matches = {key for _, key in self._terms[start:end]}
+                # Ranked and cut separately: unscored categories must not be crowded out by products
+                ranked = (
+                    self._top([key for key in matches if key > 0], MAX_LIMIT),
+                    self._top([key for key in matches if key < 0], MAX_CATEGORIES),
+                )
+                if end - start > MEMO_MIN_TERMS:
+                    self._memo[prefix] = ranked
+            entries = self._entries
+            products = [entries[key] for key in ranked[0][:limit]]
+            categories = [entries[key] for key in ranked[1]]
+        return {"query": query, "products": products, "categories": categories}
+
+    @property
+    def size(self) -> int:
+        return len(self._entries)
+
+suggest_index = SuggestIndex()
+
+__all__ = ["SuggestIndex", "suggest_index", "normalize"]
@@ -6,7 +6,9 @@ from typing import Optional
 from app.models.user import User
 from app.schemas.user import UserCreate
 from app.core.security import get_password_hash, verify_password
+from app.core.tracing import traced
 
+@traced
 class UserService:
     """Service for user operations."""
     
@@ -0,0 +1,6 @@
+"""Benchmarks for the Apple Store application.
+
+Run a benchmark module from the project root, e.g.:
+
+    python -m benchmarks.serialization --products 10000
+"""
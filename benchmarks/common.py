@@ -0,0 +1,43 @@
+"""Shared helpers for benchmarks."""
+
+import statistics
+import time
+from typing import Any, Callable, Dict, Optional
+
+from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import StaticPool
+
+from app.core.database import Base
+import app.models  # noqa: F401 - registers all tables on Base.metadata
+
+def create_benchmark_engine(url: str = "sqlite://") -> Engine:
+    """Create an engine with all tables, in memory unless a URL is given."""
+    if url == "sqlite://":
+        engine = create_engine(url, connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    else:
+        engine = create_engine(url)
+    Base.metadata.create_all(engine)
+    return engine
+
+def measure(func: Callable[[], Any], repeat: int = 5, warmup: int = 1,
+            setup: Optional[Callable[[], Any]] = None) -> Dict[str, float]:
+    """Time a function and return min/median/mean in milliseconds; ``setup`` runs untimed before each call."""
+    for _ in range(warmup):
+        if setup:
+            setup()
+        func()
+    timings = []
+    for _ in range(repeat):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000)
+    return {
+        "min_ms": min(timings),
+        "median_ms": statistics.median(timings),
+        "mean_ms": statistics.fmean(timings),
+    }
+
+__all__ = ["create_benchmark_engine", "measure"]
@@ -0,0 +1,256 @@
+"""End-to-end load test replaying a realistic shopping mix.
+
+Virtual users browse the catalog, search, add to their cart, view it and
+check out, with the weights in ``MIX``. By default the API runs in-process
+(httpx over ASGI) against a freshly generated SQLite database; pass ``--url``
+to load a running server instead (start it with ``EXPOSE_QUERY_COUNT=true``
+to get statement counts). Reports throughput, p50/p95/p99 latency, error
+rate and DB statements per request for each endpoint, and writes the
+results as JSON for comparison between runs:
+
+    python -m benchmarks.load_test --users 20 --duration 30 --out results/load.json
+    python -m benchmarks.load_test --url http://localhost:8000 --users 50
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import httpx
+
+# (name, weight)
+MIX = [
+    ("browse", 40),
+    ("browse_category", 15),
+    ("search", 12),
+    ("product_detail", 8),
+    ("add_to_cart", 12),
+    ("view_cart", 9),
+    ("checkout", 2),
+    ("order_history", 2),
+]
+SEARCH_TERMS = ["Pro", "Air", "Max", "Mini", "Phone", "Watch", "Book", "Buds", "Case", "Ultra"]
+
+def percentile(values: List[float], q: float) -> float:
+    """Nearest-rank percentile of a list of numbers."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(q / 100 * len(ordered)) - 1)]
+
+class Recorder:
+    """Collects one sample per request."""
+
+    def __init__(self):
+        self.samples: Dict[str, List[Tuple[float, bool, Optional[int]]]] = {}
+
+    def add(self, name: str, seconds: float, error: bool, statements: Optional[int]) -> None:
+        self.samples.setdefault(name, []).append((seconds * 1000, error, statements))
+
+    def summary(self, elapsed: float) -> Dict[str, Any]:
+        """Per-endpoint and total statistics."""
+        def stats(samples: List[Tuple[float, bool, Optional[int]]]) -> Dict[str, Any]:
+            latencies = [ms for ms, _, _ in samples]
+            errors = sum(1 for _, error, _ in samples if error)
+            statements = [count for _, _, count in samples if count is not None]
+            return {
+                "requests": len(samples),
+                "rps": len(samples) / elapsed if elapsed else 0.0,
+                "errors": errors,
+                "error_rate": errors / len(samples) if samples else 0.0,
+                "p50_ms": percentile(latencies, 50),
+                "p95_ms": percentile(latencies, 95),
+                "p99_ms": percentile(latencies, 99),
+                "mean_ms": statistics.fmean(latencies) if latencies else 0.0,
+                "db_statements": statistics.fmean(statements) if statements else None,
+            }
+
+        endpoints = {name: stats(samples) for name, samples in sorted(self.samples.items())}
+        everything = [sample for samples in self.samples.values() for sample in samples]
+        return {"endpoints": endpoints, "total": stats(everything)}
+
+class VirtualUser:
+    """One shopper issuing requests back to back."""
+
+    def __init__(self, client: httpx.AsyncClient, recorder: Recorder, user_id: int,
+                 categories: List[int], prefix: str, rng: random.Random):
+        self.client = client
+        self.recorder = recorder
+        self.user_id = user_id
+        self.categories = categories
+        self.prefix = prefix
+        self.rng = rng
+        self.seen: List[int] = []
+        self.cursor: Optional[int] = None
+        self.names, self.weights = zip(*MIX)
+
+    async def request(self, name: str, method: str, path: str, expected: Tuple[int, ...] = (), **kwargs) -> Optional[httpx.Response]:
+        """Send one request and record its latency, outcome and statement count."""
+        start = time.perf_counter()
+        try:
+            response = await self.client.request(method, self.prefix + path, **kwargs)
+        except httpx.HTTPError:
+            self.recorder.add(name, time.perf_counter() - start, True, None)
+            return None
+        elapsed = time.perf_counter() - start
+        statements = response.headers.get("x-db-statements")
+        error = response.status_code >= 400 and response.status_code not in expected
+        self.recorder.add(name, elapsed, error, int(statements) if statements else None)
+        return response
+
+    def _remember(self, response: Optional[httpx.Response]) -> None:
+        if response is not None and response.status_code == 200:
+            products = response.json()
+            if products:
+                self.seen = [p["id"] for p in products][:50]
+                self.cursor = products[-1]["id"] if self.rng.random() < 0.5 else None
+
+    async def step(self) -> None:
+        action = self.rng.choices(self.names, weights=self.weights)[0]
+        if action == "browse":
+            params = {"limit": 24, "view": "summary"}
+            if self.cursor is not None:
+                params["cursor"] = self.cursor
+            self._remember(await self.request(action, "GET", "/products", params=params))
+        elif action == "browse_category":
+            params = {"limit": 24, "view": "summary", "category_id": self.rng.choice(self.categories)}
+            self._remember(await self.request(action, "GET", "/products", params=params))
+        elif action == "search":
+            params = {"limit": 24, "view": "summary", "search": self.rng.choice(SEARCH_TERMS)}
+            self._remember(await self.request(action, "GET", "/products", params=params))
+        elif action == "product_detail" and self.seen:
+            await self.request(action, "GET", f"/products/{self.rng.choice(self.seen)}")
+        elif action == "add_to_cart" and self.seen:
+            await self.request(action, "POST", "/cart/add", params={"user_id": self.user_id},
+                               json={"product_id": self.rng.choice(self.seen), "quantity": 1})
+        elif action == "view_cart":
+            await self.request(action, "GET", "/cart", params={"user_id": self.user_id})
+        elif action == "checkout":
+            # An empty cart (400) or a sold-out item (409) is expected here
+            await self.request(action, "POST", "/orders", expected=(400, 409), params={"user_id": self.user_id})
+        elif action == "order_history":
+            await self.request(action, "GET", "/orders", params={"user_id": self.user_id, "limit": 20})
+        else:
+            self._remember(await self.request("browse", "GET", "/products", params={"limit": 24, "view": "summary"}))
+
+async def run_load(client: httpx.AsyncClient, prefix: str, user_ids: List[int], categories: List[int],
+                   users: int, duration: float, seed: int) -> Tuple[Recorder, float]:
+    """Run ``users`` virtual users for ``duration`` seconds."""
+    recorder = Recorder()
+    deadline = time.perf_counter() + duration
+    rng = random.Random(seed)
+
+    async def shopper(index: int) -> None:
+        user = VirtualUser(client, recorder, rng.choice(user_ids), categories, prefix, random.Random(seed + index))
+        while time.perf_counter() < deadline:
+            await user.step()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(shopper(i) for i in range(users)))
+    return recorder, time.perf_counter() - start
+
+def prepare_in_process(args: argparse.Namespace) -> Tuple[Any, List[int], List[int]]:
+    """Create a seeded SQLite database and the API app in this process."""
+    directory = Path(tempfile.mkdtemp(prefix="apple-store-load-"))
+    os.environ["DATABASE_URL"] = f"sqlite:///{directory / 'load.db'}"
+    os.environ["SEED_SAMPLE_DATA"] = "false"
+    os.environ["EXPOSE_QUERY_COUNT"] = "true"
+    os.environ["DEBUG"] = "false"
+    os.environ["CATALOG_SNAPSHOT_PATH"] = str(directory / "catalog.snapshot")
+
+    from app.core.app_factory import create_api_app
+    from app.core.database import engine
+    from app.core.startup import run_startup
+    from app.jobs.generate_data import DataGenerator
+
+    run_startup()
+    generator = DataGenerator(engine, seed=args.seed)
+    user_ids = generator.users(args.shoppers, hashed_password="!")  # never logs in
+    categories = generator.categories(args.categories)
+    products = generator.products(args.products, categories)
+    if args.orders:
+        generator.orders(args.orders, user_ids, products)
+    if os.getenv("CATALOG_SNAPSHOT_ENABLED", "").lower() == "true":
+        from app.core.config import settings
+        from app.services.catalog_snapshot import build_snapshot
+        build_snapshot(engine, settings.catalog_snapshot_path)
+    return create_api_app(), user_ids, [category["id"] for category in categories]
+
+async def main_async(args: argparse.Namespace) -> Dict[str, Any]:
+    if args.url:
+        client = httpx.AsyncClient(base_url=args.url, timeout=args.timeout)
+        prefix = args.api_prefix
+        async with client:
+            categories = [c["id"] for c in (await client.get(f"{prefix}/categories")).json()] or [1]
+            user_ids = list(range(1, args.shoppers + 1))
+            recorder, elapsed = await run_load(client, prefix, user_ids, categories, args.users, args.duration, args.seed)
+    else:
+        app, user_ids, categories = prepare_in_process(args)
+        from app.core.config import settings
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://load-test", timeout=args.timeout) as client:
+            recorder, elapsed = await run_load(
+                client, settings.api_prefix, user_ids, categories, args.users, args.duration, args.seed
+            )
+
+    return {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "target": args.url or "in-process",
+            "users": args.users,
+            "duration_s": elapsed,
+            "products": None if args.url else args.products,
+            "seed": args.seed,
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "label": args.label,
+        },
+        **recorder.summary(elapsed),
+    }
+
+def print_report(results: Dict[str, Any]) -> None:
+    meta = results["meta"]
+    print(f"Load test against {meta['target']}: {meta['users']} users for {meta['duration_s']:.1f}s")
+    print(f"  {'endpoint':<16} {'reqs':>7} {'rps':>8} {'err%':>6} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'stmts':>6}")
+    rows = list(results["endpoints"].items()) + [("TOTAL", results["total"])]
+    for name, row in rows:
+        statements = f"{row['db_statements']:.1f}" if row["db_statements"] is not None else "-"
+        print(f"  {name:<16} {row['requests']:>7} {row['rps']:>8.1f} {row['error_rate'] * 100:>6.2f} "
+              f"{row['p50_ms']:>8.1f} {row['p95_ms']:>8.1f} {row['p99_ms']:>8.1f} {statements:>6}")
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", help="Base URL of a running server; in-process when omitted")
+    parser.add_argument("--api-prefix", default="/api")
+    parser.add_argument("--users", type=int, default=20, help="Concurrent virtual users")
+    parser.add_argument("--duration", type=float, default=20.0, help="Seconds to run")
+    parser.add_argument("--shoppers", type=int, default=500, help="Distinct user accounts to shop as")
+    parser.add_argument("--products", type=int, default=5000)
+    parser.add_argument("--categories", type=int, default=8)
+    parser.add_argument("--orders", type=int, default=2000, help="Existing orders to seed")
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--label", default=None, help="Free-form label stored with the results")
+    parser.add_argument("--out", type=Path, help="Write the results as JSON")
+    args = parser.parse_args()
+
+    results = asyncio.run(main_async(args))
+    print_report(results)
+    if args.out:
+        args.out.parent.mkdir(parents=True, exist_ok=True)
+        args.out.write_text(json.dumps(results, indent=2))
+        print(f"Results written to {args.out}")
+
+if __name__ == "__main__":
+    main()
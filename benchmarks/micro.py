@@ -0,0 +1,247 @@
+"""Microbenchmarks for the hot service paths, with a regression gate.
+
+Times ``ProductService.get_products``/``search_products``,
+``CartService.add_to_cart``/``get_cart_items``/``get_cart_total``,
+``OrderService.create_order_from_cart`` and ``ProductResponse``/
+``OrderResponse`` building against catalogs of several sizes, each in its own
+in-memory database. ``run`` prints the timings and can save them as JSON;
+``compare`` checks a result file against a stored baseline and exits with
+status 1 when any benchmark is slower by more than ``--threshold`` percent:
+
+    python -m benchmarks.micro run --sizes 100 1000 10000 --out results/micro.json
+    python -m benchmarks.micro compare results/baseline.json results/micro.json --threshold 10
+    python -m benchmarks.micro run --baseline results/baseline.json   # run and compare in one go
+
+``compare`` also accepts ``load_test`` results and then compares per-endpoint
+p95 latency.
+"""
+
+import argparse
+import json
+import platform
+import random
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from pydantic import TypeAdapter
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session, joinedload, selectinload
+
+from app.models import CartItem, Order, OrderItem, Product, User
+from app.schemas import CartItemCreate, OrderResponse, ProductResponse
+from app.services import CartService, OrderService, ProductService
+from benchmarks.common import create_benchmark_engine, measure
+from benchmarks.serialization import seed as seed_catalog
+
+CART_ITEMS = 10
+PAGE_SIZE = 100
+ITEMS_PER_ORDER = 3
+# Metric compared by default for each kind of result file
+DEFAULT_METRICS = {"micro": "median_ms", "load": "p95_ms"}
+
+def seed(engine: Engine, products: int) -> Tuple[int, int]:
+    """Create a catalog, a shopper with a full cart and a buyer with ``products // 10`` orders."""
+    with Session(engine) as session:
+        seed_catalog(session, products)
+        # Repeated checkouts of the same cart must never run out of stock
+        session.execute(update(Product).values(stock_quantity=10_000_000))
+        shopper = User(email="shopper@example.com", username="shopper", hashed_password="x")
+        buyer = User(email="buyer@example.com", username="buyer", hashed_password="x")
+        session.add_all([shopper, buyer])
+        session.flush()
+        fill_cart(session, shopper.id, products)
+
+        rng = random.Random(products)
+        order_ids = session.execute(insert(Order).returning(Order.id, sort_by_parameter_order=True), [
+            {"user_id": buyer.id, "total_amount": 0.0, "status": "confirmed"} for _ in range(max(1, products // 10))
+        ]).scalars().all()
+        items = []
+        for order_id in order_ids:
+            for _ in range(ITEMS_PER_ORDER):
+                product_id = rng.randint(1, products)
+                items.append({
+                    "order_id": order_id, "product_id": product_id, "quantity": rng.randint(1, 3),
+                    "price": round(rng.uniform(19, 3999), 2), "product_name": f"Product {product_id - 1}",
+                    "product_image_url": None, "category_name": "Category 0",
+                })
+        session.execute(insert(OrderItem), items)
+        session.commit()
+        return shopper.id, buyer.id
+
+def fill_cart(session: Session, user_id: int, products: int) -> None:
+    """Put ``CART_ITEMS`` distinct products in a user's cart."""
+    step = max(1, products // CART_ITEMS)
+    session.execute(insert(CartItem), [
+        {"user_id": user_id, "product_id": 1 + i * step, "quantity": 1} for i in range(min(CART_ITEMS, products))
+    ])
+
+def suite(engine: Engine, products: int) -> Dict[str, Tuple[Callable[[], Any], Optional[Callable[[], Any]]]]:
+    """Benchmarks for one catalog size, as name -> (timed function, untimed setup)."""
+    shopper, buyer = seed(engine, products)
+    product_adapter = TypeAdapter(List[ProductResponse])
+    order_adapter = TypeAdapter(List[OrderResponse])
+
+    with Session(engine) as session:
+        catalog = session.execute(
+            select(Product).options(joinedload(Product.category)).order_by(Product.id)
+        ).scalars().all()
+        orders = session.execute(
+            select(Order).options(selectinload(Order.order_items)).where(Order.user_id == buyer)
+        ).scalars().all()
+        session.expunge_all()
+
+    def get_products() -> None:
+        with Session(engine) as session:
+            ProductService(session).get_products(limit=PAGE_SIZE)
+
+    def get_products_by_category() -> None:
+        with Session(engine) as session:
+            ProductService(session).get_products(category_id=2, limit=PAGE_SIZE)
+
+    def search_products() -> None:
+        with Session(engine) as session:
+            ProductService(session).search_products("Product 1", limit=PAGE_SIZE)
+
+    def add_to_cart() -> None:
+        with Session(engine) as session:
+            CartService(session).add_to_cart(shopper, CartItemCreate(product_id=products, quantity=1))
+
+    def remove_added() -> None:
+        with Session(engine) as session:
+            session.execute(delete(CartItem).where(CartItem.user_id == shopper, CartItem.product_id == products))
+            session.commit()
+
+    def get_cart_items() -> None:
+        with Session(engine) as session:
+            CartService(session).get_cart_items(shopper)
+
+    def get_cart_total() -> None:
+        with Session(engine) as session:
+            CartService(session).get_cart_total(shopper)
+
+    def create_order() -> None:
+        with Session(engine) as session:
+            OrderService(session).create_order_from_cart(buyer)
+
+    def refill_cart() -> None:
+        with Session(engine) as session:
+            session.execute(delete(CartItem).where(CartItem.user_id == buyer))
+            fill_cart(session, buyer, products)
+            session.commit()
+
+    return {
+        "ProductService.get_products": (get_products, None),
+        "ProductService.get_products[category]": (get_products_by_category, None),
+        "ProductService.search_products": (search_products, None),
+        "CartService.add_to_cart": (add_to_cart, remove_added),
+        "CartService.get_cart_items": (get_cart_items, None),
+        "CartService.get_cart_total": (get_cart_total, None),
+        "OrderService.create_order_from_cart": (create_order, refill_cart),
+        "ProductResponse[catalog]": (
+            lambda: product_adapter.dump_python(product_adapter.validate_python(catalog), mode="json"), None
+        ),
+        "OrderResponse[history]": (
+            lambda: order_adapter.dump_python(order_adapter.validate_python(orders), mode="json"), None
+        ),
+    }
+
+def run(sizes: List[int], repeat: int, only: Optional[str] = None) -> Dict[str, Any]:
+    """Run the suite at every size and return the results keyed ``name@size``."""
+    benchmarks: Dict[str, Dict[str, float]] = {}
+    for size in sizes:
+        engine = create_benchmark_engine()
+        for name, (func, setup) in suite(engine, size).items():
+            if only and only not in name:
+                continue
+            benchmarks[f"{name}@{size}"] = measure(func, repeat, setup=setup)
+        engine.dispose()
+    return {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "sizes": sizes,
+            "repeat": repeat,
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+        },
+        "benchmarks": benchmarks,
+    }
+
+def flatten(results: Dict[str, Any], metric: Optional[str] = None) -> Dict[str, float]:
+    """One number per benchmark from a ``micro`` or ``load_test`` result file."""
+    if "benchmarks" in results:
+        metric = metric or DEFAULT_METRICS["micro"]
+        return {name: row[metric] for name, row in results["benchmarks"].items()}
+    if "endpoints" in results:
+        metric = metric or DEFAULT_METRICS["load"]
+        rows = {**results["endpoints"], "TOTAL": results["total"]}
+        return {name: row[metric] for name, row in rows.items() if row.get("requests")}
+    raise ValueError("not a micro or load_test result file")
+
+def compare(baseline: Dict[str, Any], current: Dict[str, Any], threshold: float,
+            metric: Optional[str] = None) -> List[str]:
+    """Print a comparison table and return the names that regressed beyond ``threshold`` percent."""
+    before, after = flatten(baseline, metric), flatten(current, metric)
+    regressions = []
+    print(f"  {'benchmark':<48} {'baseline':>10} {'current':>10} {'change':>8}")
+    for name in sorted(before.keys() | after.keys()):
+        if name not in before or name not in after:
+            print(f"  {name:<48} {before.get(name, float('nan')):>10.3f} {after.get(name, float('nan')):>10.3f}"
+                  f" {'new' if name not in before else 'gone':>8}")
+            continue
+        change = (after[name] - before[name]) / before[name] * 100 if before[name] else 0.0
+        flag = ""
+        if change > threshold:
+            regressions.append(name)
+            flag = "  REGRESSED"
+        print(f"  {name:<48} {before[name]:>10.3f} {after[name]:>10.3f} {change:>+7.1f}%{flag}")
+    return regressions
+
+def print_report(results: Dict[str, Any]) -> None:
+    print(f"Microbenchmarks, {results['meta']['repeat']} rounds each")
+    for name, timing in results["benchmarks"].items():
+        print(f"  {name:<48} median {timing['median_ms']:9.3f} ms   min {timing['min_ms']:9.3f} ms")
+
+def gate(baseline_path: Path, current: Dict[str, Any], threshold: float, metric: Optional[str]) -> None:
+    regressions = compare(json.loads(baseline_path.read_text()), current, threshold, metric)
+    if regressions:
+        print(f"{len(regressions)} benchmark(s) regressed by more than {threshold:g}%")
+        sys.exit(1)
+    print(f"No regressions beyond {threshold:g}%")
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="Run the suite")
+    run_parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1_000, 10_000], help="Catalog sizes")
+    run_parser.add_argument("--repeat", type=int, default=20)
+    run_parser.add_argument("--only", help="Run benchmarks whose name contains this text")
+    run_parser.add_argument("--out", type=Path, help="Write the results as JSON")
+    run_parser.add_argument("--baseline", type=Path, help="Compare against this result file afterwards")
+    run_parser.add_argument("--threshold", type=float, default=10.0, help="Allowed slowdown in percent")
+
+    compare_parser = commands.add_parser("compare", help="Compare a result file against a baseline")
+    compare_parser.add_argument("baseline", type=Path)
+    compare_parser.add_argument("current", type=Path)
+    compare_parser.add_argument("--threshold", type=float, default=10.0, help="Allowed slowdown in percent")
+    compare_parser.add_argument("--metric", help="Metric to compare (median_ms/min_ms, or p50_ms/p95_ms/p99_ms for load tests)")
+    args = parser.parse_args()
+
+    if args.command == "compare":
+        gate(args.baseline, json.loads(args.current.read_text()), args.threshold, args.metric)
+        return
+
+    results = run(args.sizes, args.repeat, args.only)
+    print_report(results)
+    if args.out:
+        args.out.parent.mkdir(parents=True, exist_ok=True)
+        args.out.write_text(json.dumps(results, indent=2))
+        print(f"Results written to {args.out}")
+    if args.baseline:
+        gate(args.baseline, results, args.threshold, None)
+
+if __name__ == "__main__":
+    main()
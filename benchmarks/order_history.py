@@ -0,0 +1,119 @@
+"""Order history benchmark for ``GET /orders``.
+
+Compares the old single query that joined items and full products onto every
+order row with the paginated ``selectinload`` path over product snapshots,
+for buyers with 10, 1k and 10k orders:
+
+    python -m benchmarks.order_history --items-per-order 3
+"""
+
+import argparse
+import random
+from typing import List
+
+from pydantic import TypeAdapter
+from sqlalchemy import insert, select
+from sqlalchemy.orm import Session, joinedload
+
+from app.core.responses import FastJSONResponse
+from app.models import Category, Order, OrderItem, Product, User
+from app.schemas import OrderResponse, ProductResponse
+from app.schemas.order import OrderItemResponse
+from app.services import OrderService
+from benchmarks.common import create_benchmark_engine, measure
+from benchmarks.serialization import seed as seed_catalog
+
+PRODUCTS = 500
+
+class LegacyOrderItemResponse(OrderItemResponse):
+    """Order item shape before history was trimmed, with the full product nested."""
+    product: ProductResponse
+
+class LegacyOrderResponse(OrderResponse):
+    order_items: List[LegacyOrderItemResponse]
+
+def seed(session: Session, orders: int, items_per_order: int) -> int:
+    """Insert one buyer with the given number of orders and return their ID."""
+    user = User(email=f"buyer{orders}@example.com", username=f"buyer{orders}", hashed_password="x")
+    session.add(user)
+    session.flush()
+    first = session.execute(insert(Order).returning(Order.id), [
+        {"user_id": user.id, "total_amount": 0.0, "status": "confirmed"} for _ in range(orders)
+    ]).scalars().all()
+    rng = random.Random(orders)
+    items = []
+    for order_id in first:
+        for _ in range(items_per_order):
+            product_id = rng.randint(1, PRODUCTS)
+            items.append({
+                "order_id": order_id,
+                "product_id": product_id,
+                "quantity": rng.randint(1, 3),
+                "price": round(rng.uniform(19, 3999), 2),
+                "product_name": f"Product {product_id - 1}",
+                "product_image_url": f"/static/uploads/product-{product_id - 1}.jpg",
+                "category_name": "Category 0",
+            })
+    session.execute(insert(OrderItem), items)
+    session.commit()
+    return user.id
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 1_000, 10_000])
+    parser.add_argument("--items-per-order", type=int, default=3)
+    parser.add_argument("--page-size", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    engine = create_benchmark_engine()
+    with Session(engine) as session:
+        seed_catalog(session, PRODUCTS)
+        buyers = {size: seed(session, size, args.items_per_order) for size in args.sizes}
+
+    adapter = TypeAdapter(List[OrderResponse])
+    legacy_adapter = TypeAdapter(List[LegacyOrderResponse])
+
+    def joined_path(user_id: int) -> bytes:
+        with Session(engine) as session:
+            stmt = select(Order).options(
+                joinedload(Order.order_items).joinedload(OrderItem.product).joinedload(Product.category)
+            ).where(Order.user_id == user_id).order_by(Order.created_at.desc())
+            orders = session.execute(stmt).unique().scalars().all()
+            return FastJSONResponse(legacy_adapter.dump_python(legacy_adapter.validate_python(orders), mode="json")).body
+
+    def paged_path(user_id: int) -> bytes:
+        with Session(engine) as session:
+            orders = OrderService(session).get_user_orders(user_id, limit=args.page_size)
+            return FastJSONResponse(adapter.dump_python(adapter.validate_python(orders), mode="json")).body
+
+    def walk_all(user_id: int) -> int:
+        with Session(engine) as session:
+            service, cursor, total = OrderService(session), None, 0
+            while True:
+                page = service.get_user_orders(user_id, limit=args.page_size, cursor=cursor)
+                if not page:
+                    return total
+                total += len(FastJSONResponse(adapter.dump_python(adapter.validate_python(page), mode="json")).body)
+                cursor = page[-1].id
+                session.expunge_all()
+
+    print(f"Order history with {args.items_per_order} items per order, pages of {args.page_size}")
+    for size, user_id in buyers.items():
+        with engine.connect() as conn:
+            wide = conn.execute(
+                select(Order.id).join(OrderItem).join(Product).join(Category).where(Order.user_id == user_id)
+            ).all()
+        results = {
+            "joinedload, all orders": measure(lambda: joined_path(user_id), args.repeat),
+            "selectinload, first page": measure(lambda: paged_path(user_id), args.repeat),
+            "selectinload, every page": measure(lambda: walk_all(user_id), max(1, args.repeat // 2)),
+        }
+        print(f"  {size} orders ({len(wide)} joined rows, "
+              f"{len(joined_path(user_id)) / 1024:.0f} KiB all at once vs "
+              f"{len(paged_path(user_id)) / 1024:.1f} KiB per page)")
+        for name, timing in results.items():
+            print(f"    {name:<26} median {timing['median_ms']:8.1f} ms   min {timing['min_ms']:8.1f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""Query plan check for the sorted and filtered /products queries.
+
+Runs ``ProductService.list_products`` for each sort and filter combination
+against a seeded catalog, captures the SQL it sends, and prints the
+database's plan for it. Exits with status 1 if any plan reads the whole
+products table, so it can gate a change to the queries or indexes:
+
+    python -m benchmarks.query_plans --products 20000
+    python -m benchmarks.query_plans --url postgresql://localhost/store_bench
+
+Text search (``search=``) matches anywhere in the name and description and
+always scans, so it is not checked here. Neither is ``sort=popularity``
+without a category: it orders the whole catalog by a joined counter, and
+the best sellers are served from memory by ``/products/top-sellers``.
+"""
+
+import argparse
+import re
+import sys
+from typing import Any, Dict, List, Tuple
+
+from sqlalchemy import event, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from app.services import ProductService
+from benchmarks.common import create_benchmark_engine
+from benchmarks.serialization import seed
+
+# name -> list_products arguments
+CASES: Dict[str, Dict[str, Any]] = {
+    "category": {"category_id": 2},
+    "category, sort=price": {"category_id": 2, "sort": "price"},
+    "category, sort=price, next page": {"category_id": 2, "sort": "price", "cursor": 100},
+    "category, sort=price, price range": {"category_id": 2, "sort": "price", "min_price": 500, "max_price": 900},
+    "category, sort=newest": {"category_id": 2, "sort": "newest"},
+    "category, sort=newest, next page": {"category_id": 2, "sort": "newest", "cursor": 100},
+    "category, sort=newest, in stock": {"category_id": 2, "sort": "newest", "in_stock": True},
+    "category, sort=popularity": {"category_id": 2, "sort": "popularity"},
+    "category, sort=popularity, next page": {"category_id": 2, "sort": "popularity", "cursor": 100},
+    "category, price range, in stock": {"category_id": 2, "min_price": 500, "max_price": 900, "in_stock": True},
+    "sort=price": {"sort": "price"},
+    "sort=price, next page": {"sort": "price", "cursor": 100},
+    "sort=newest": {"sort": "newest"},
+    "price range": {"min_price": 500, "max_price": 900},
+}
+
+# A plan line that reads every row of the products table
+FULL_SCAN = {
+    "sqlite": re.compile(r"^SCAN products(?! USING)"),
+    "postgresql": re.compile(r"Seq Scan on products\b"),
+}
+
+def capture_statements(engine: Engine, func) -> List[Tuple[str, Any]]:
+    """Run ``func`` and return the SELECT statements it sent, with their parameters."""
+    statements: List[Tuple[str, Any]] = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        func()
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+    return statements
+
+def explain(engine: Engine, statement: str, parameters: Any) -> List[str]:
+    """The database's plan for a statement, one line per step."""
+    prefix = "EXPLAIN QUERY PLAN " if engine.dialect.name == "sqlite" else "EXPLAIN "
+    with engine.connect() as conn:
+        rows = conn.exec_driver_sql(prefix + statement, parameters).all()
+    if engine.dialect.name == "sqlite":
+        return [row[-1] for row in rows]
+    return [row[0] for row in rows]
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--products", type=int, default=20_000)
+    parser.add_argument("--url", default="sqlite://", help="Database to seed and check; in-memory SQLite by default")
+    args = parser.parse_args()
+
+    engine = create_benchmark_engine(args.url)
+    full_scan = FULL_SCAN.get(engine.dialect.name)
+    if full_scan is None:
+        parser.error(f"Unsupported database: {engine.dialect.name}")
+    with Session(engine) as session:
+        seed(session, args.products, categories=10)
+    with engine.begin() as conn:
+        conn.execute(text("ANALYZE"))
+
+    failures = []
+    for name, kwargs in CASES.items():
+        def run(kwargs=kwargs) -> None:
+            with Session(engine) as session:
+                ProductService(session).list_products(limit=50, fields=("id", "name", "price"), **kwargs)
+
+        print(f"\n{name}")
+        for statement, parameters in capture_statements(engine, run):
+            for line in explain(engine, statement, parameters):
+                scans = bool(full_scan.search(line.strip()))
+                print(f"  {'FULL SCAN ' if scans else ''}{line}")
+                if scans:
+                    failures.append(name)
+
+    if failures:
+        print(f"\n{len(failures)} queries scan the whole products table: {', '.join(failures)}")
+        sys.exit(1)
+    print(f"\nNo full scans in {len(CASES)} queries")
+
+__all__ = ["CASES", "capture_statements", "explain"]
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""Serialization benchmark for the /products list path.
+
+Compares the ORM + Pydantic + stdlib JSON path with the column-select +
+orjson fast path used by ``GET /products``, in full and summary shape:
+
+    python -m benchmarks.serialization --products 10000
+"""
+
+import argparse
+import random
+from typing import List
+
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from app.core.responses import FastJSONResponse
+from app.models import Category, Product
+from app.schemas import ProductResponse
+from app.services import ProductService
+from app.services.product_service import SUMMARY_FIELDS
+from benchmarks.common import create_benchmark_engine, measure
+
+def seed(session: Session, products: int, categories: int = 5) -> None:
+    """Insert a catalog of the given size."""
+    session.execute(insert(Category), [
+        {"name": f"Category {i}", "description": f"Category {i} description"} for i in range(categories)
+    ])
+    rng = random.Random(42)
+    session.execute(insert(Product), [
+        {
+            "name": f"Product {i}",
+            "description": "Lorem ipsum dolor sit amet, consectetur adipiscing elit. " * rng.randint(1, 6),
+            "price": round(rng.uniform(19, 3999), 2),
+            "image_url": f"/static/uploads/product-{i}.jpg",
+            "stock_quantity": rng.randint(0, 500),
+            "category_id": rng.randint(1, categories),
+        }
+        for i in range(products)
+    ])
+    session.commit()
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--products", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    engine = create_benchmark_engine()
+    with Session(engine) as session:
+        seed(session, args.products)
+
+    adapter = TypeAdapter(List[ProductResponse])
+
+    def orm_path() -> bytes:
+        with Session(engine) as session:
+            products = ProductService(session).get_products(limit=args.products)
+            return JSONResponse(adapter.dump_python(adapter.validate_python(products), mode="json")).body
+
+    def fast_path() -> bytes:
+        with Session(engine) as session:
+            return FastJSONResponse(ProductService(session).list_products(limit=args.products)).body
+
+    def summary_path() -> bytes:
+        with Session(engine) as session:
+            products = ProductService(session).list_products(limit=args.products, fields=SUMMARY_FIELDS)
+            return FastJSONResponse(products).body
+
+    with Session(engine) as session:
+        products = ProductService(session).get_products(limit=args.products)
+        rows = ProductService(session).list_products(limit=args.products)
+        results = {
+            "orm + pydantic + json (end to end)": measure(orm_path, args.repeat),
+            "rows + orjson (end to end)": measure(fast_path, args.repeat),
+            "summary rows + orjson (end to end)": measure(summary_path, args.repeat),
+            "pydantic + json (encode only)": measure(
+                lambda: JSONResponse(adapter.dump_python(adapter.validate_python(products), mode="json")).body,
+                args.repeat
+            ),
+            "orjson (encode only)": measure(lambda: FastJSONResponse(rows).body, args.repeat),
+        }
+
+    print(f"Serializing {args.products} products ({len(fast_path()) / 1024:.0f} KiB of JSON, "
+          f"{len(summary_path()) / 1024:.0f} KiB as summaries)")
+    for name, timing in results.items():
+        print(f"  {name:<38} median {timing['median_ms']:8.1f} ms   min {timing['min_ms']:8.1f} ms")
+    baseline = results["orm + pydantic + json (end to end)"]["median_ms"]
+    fast = results["rows + orjson (end to end)"]["median_ms"]
+    print(f"  speedup (end to end): {baseline / fast:.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+"""Gunicorn configuration for the API-only mode (``api_main:app``).
+
+    gunicorn api_main:app -c gunicorn.conf.py
+
+The app is imported once in the master and forked into uvicorn workers.
+Startup (tables, sample data) also runs once in the master, so workers do
+not race each other; each worker then opens its own database connections.
+On SIGTERM workers stop accepting, finish in-flight requests for up to
+``graceful_timeout`` seconds and close their connection pools.
+"""
+
+import multiprocessing
+import os
+
+from app.core.config import settings
+
+bind = f"{settings.host}:{settings.port}"
+workers = int(os.getenv("WEB_CONCURRENCY", multiprocessing.cpu_count()))
+worker_class = "uvicorn.workers.UvicornWorker"
+preload_app = True
+
+graceful_timeout = settings.graceful_timeout
+timeout = 60
+keepalive = 5
+max_requests = int(os.getenv("MAX_REQUESTS", "0"))  # recycle workers after N requests; 0 disables
+max_requests_jitter = max_requests // 10
+
+accesslog = "-"
+errorlog = "-"
+
+def when_ready(server):
+    """Run the one-time startup work in the master before any worker is forked."""
+    from app.core.database import engine
+    from app.core.startup import run_startup
+    run_startup()
+    # Connections opened during startup must not be inherited by the workers
+    engine.dispose()
+
+def post_fork(server, worker):
+    """Give each worker a fresh connection pool."""
+    from app.core.database import engine
+    engine.dispose(close=False)
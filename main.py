@@ -8,6 +8,11 @@ from pathlib import Path
 project_root = Path(__file__).parent
 sys.path.insert(0, str(project_root))
 
+# Report import and startup time per module without starting the server
+if __name__ == "__main__" and "--profile-startup" in sys.argv:
+    from app.core.startup import profile_startup
+    sys.exit(profile_startup())
+
 # Load environment variables
 try:
     from dotenv import load_dotenv
@@ -15,50 +20,46 @@ try:
 except ImportError:
     print("python-dotenv not installed, skipping .env loading")
 
+from app.core.startup import lifespan, phase, run_startup
+
 # Import NiceGUI and FastAPI
-from nicegui import ui
-from fastapi import FastAPI
+with phase("import nicegui"):
+    from nicegui import app as nicegui_app, ui
+    from fastapi import FastAPI
 
 # Import application components
 try:
-    import app.main  # This registers the NiceGUI pages
+    with phase("import pages"):
+        import app.main  # This registers the NiceGUI pages
     from app.core import (
-        settings, app_logger, setup_middleware, setup_routers,
-        setup_error_handlers, validate_environment, setup_database
+        settings, app_logger, setup_middleware, setup_routers, setup_error_handlers
     )
+    from app.core.static_assets import setup_static_assets
 except ImportError as e:
     print(f"Failed to import application modules: {e}")
     sys.exit(1)
 
-# Create FastAPI app
+# Create FastAPI app; database setup and seeding run in its lifespan, not at import
 app = FastAPI(
     title=settings.app_name,
     description=settings.app_description,
     version=settings.app_version,
     docs_url=f"{settings.api_prefix}/docs",
     redoc_url=f"{settings.api_prefix}/redoc",
+    lifespan=lifespan,
 )
 
 # Setup FastAPI components
-setup_error_handlers(app)
-setup_middleware(app)
-setup_routers(app, api_prefix=settings.api_prefix)
-
-# Validate environment
-errors = validate_environment()
-if errors:
-    for error in errors:
-        app_logger.error(f"Environment validation error: {error}")
-
-# Setup database
-try:
-    setup_database()
-    app_logger.info("Database setup completed")
-except Exception as e:
-    app_logger.error(f"Database setup failed: {e}")
+with phase("api routes"):
+    setup_error_handlers(app)
+    setup_middleware(app)
+    setup_routers(app, api_prefix=settings.api_prefix)
+with phase("static assets"):
+    setup_static_assets(app)
 
-# Mount FastAPI on NiceGUI
+# Mount FastAPI on NiceGUI; ui.run serves NiceGUI's own app, so start up from there too
 ui.run_with(app, mount_path='/api')
+nicegui_app.on_startup(run_startup)
 
 if __name__ in {"__main__", "__mp_main__"}:
     try: